@@ -23,17 +23,22 @@ import time
 import stanza
 from stanza.server import CoreNLPClient
 
+from script_corenlp_pool import get_corenlp_endpoints
+
 stanza.install_corenlp()
 
 
 def Main():
-    corenlp_client = CoreNLPClient(
-        annotators=['tokenize', 'ssplit', 'pos', 'lemma', 'ner', 'parse', 'depparse', 'coref'],
-        properties={'annotators': 'coref', 'coref.algorithm': 'neural'}, timeout=30000,
-        memory='4G', endpoint='http://localhost:9001')
+    corenlp_clients = []
+    for endpoint in get_corenlp_endpoints():
+        corenlp_clients.append(CoreNLPClient(
+            annotators=['tokenize', 'ssplit', 'pos', 'lemma', 'ner', 'parse', 'depparse', 'coref'],
+            properties={'annotators': 'coref', 'coref.algorithm': 'neural'}, timeout=30000,
+            memory='4G', endpoint=endpoint))
 
     while True:
-        corenlp_client.ensure_alive()
+        for corenlp_client in corenlp_clients:
+            corenlp_client.ensure_alive()
         time.sleep(300)
 
 if __name__ == '__main__':
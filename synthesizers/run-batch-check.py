@@ -0,0 +1,76 @@
+"""
+This is the public release of the code of our paper titled
+"Hermes: Unlocking Security Analysis of Cellular Network Protocols by Synthesizing Finite State Machines from Natural
+    Language Specifications" (USENIX Security '24)
+Author: Abdullah Al Ishtiaq
+Contact: abdullah.ishtiaq@psu.edu
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+      https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import copy
+import datetime
+from xml.etree import ElementTree as ET
+from xml.etree.ElementTree import ParseError
+
+from script_helpers import get_text, modify_section_numbers, extract_parenthesized
+import script_DepGraph
+
+DATA_FILENAMES = ["../data/4g-nas-rel16.txt", "../data/5g-nas-rel17.txt", "../data/5g-rrc-rel17.txt"]
+BATCH_SIZE = 32
+
+# every batched part is annotated again on its own with all annotators and the parses are compared; this needs a real
+# CoreNLP server, BATCH_ANNOTATION stays off until it reports no mismatches
+script_DepGraph.VERIFY_BATCH_ANNOTATION = True
+
+num_failed_batches = 0
+for data_filename in DATA_FILENAMES:
+    data_file = open(data_filename, 'r')
+    data_lines = data_file.readlines()
+    data_file.close()
+
+    parts = {}
+    for line in data_lines:
+        line = line.strip()
+        if line == "":
+            continue
+
+        line = "<root> " + line.replace("(e.g.", "that is") + " </root>"
+        line = modify_section_numbers(line.replace("<", " <").replace(">", "> ").strip())
+        try:
+            full_text = get_text(ET.fromstring(line))
+        except ParseError:
+            full_text = line
+
+        dep_text = " " + copy.deepcopy(full_text).strip() + " "
+        dep_text = dep_text.replace("i.e.", "that is").replace("e.g.", "for example,")
+        dep_text = dep_text.replace("/", " / ").replace(",", " , ").replace(".", " . ").replace(";", " ; "). \
+            replace("(", " ( ").replace(")", " ) ").replace("-", " - ").replace(":", " : ")
+        dep_text = " ".join(dep_text.split())
+
+        for part in extract_parenthesized(dep_text):
+            if script_DepGraph.BATCH_SEPARATOR not in part:
+                parts[part] = True
+
+    parts = list(parts)
+    num_mismatches = len(script_DepGraph.batch_mismatches)
+    for batch_start in range(0, len(parts), BATCH_SIZE):
+        if script_DepGraph.annotate_parts_batch(parts[batch_start: batch_start + BATCH_SIZE]) is None:
+            print("BATCH FAILED :", batch_start)
+            num_failed_batches += 1
+
+    num_mismatches = len(script_DepGraph.batch_mismatches) - num_mismatches
+    print(datetime.datetime.now(), ":", data_filename, ":", len(parts), "parts,", num_mismatches, "mismatches")
+
+print()
+print("*** FAILED BATCHES :", num_failed_batches, "***")
+print("*** TOTAL MISMATCHES :", len(script_DepGraph.batch_mismatches), "***")
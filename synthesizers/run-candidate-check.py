@@ -0,0 +1,99 @@
+"""
+This is the public release of the code of our paper titled
+"Hermes: Unlocking Security Analysis of Cellular Network Protocols by Synthesizing Finite State Machines from Natural
+    Language Specifications" (USENIX Security '24)
+Author: Abdullah Al Ishtiaq
+Contact: abdullah.ishtiaq@psu.edu
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+      https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+import copy
+import datetime
+from xml.etree import ElementTree as ET
+from xml.etree.ElementTree import ParseError
+
+from script_helpers import get_text, modify_section_numbers, get_candidate_spans
+from script_keyword_index import KeywordIndex
+import script_text2id
+import script_config
+from script_defs_compiler import load_compiled_defs
+
+DATA_FILENAMES = ["../data/4g-nas-rel16.txt", "../data/5g-nas-rel17.txt", "../data/5g-rrc-rel17.txt"]
+COMMON_DEFS_FILENAME = script_config.common_definitions
+CHECK_THRESHOLDS = [1, 2]
+
+defs_artifact = load_compiled_defs(script_config.nas_definitions, script_config.saved_nas_definitions)
+text2id = {"all2id": defs_artifact["keyword_all2id"]}
+
+common_defs_file = open(COMMON_DEFS_FILENAME, 'r')
+common_defs_dict = json.load(common_defs_file)
+common_defs_file.close()
+
+for item in common_defs_dict["ignore_list"]:
+    text2id["all2id"][item] = item
+
+# match against the keywords directly so the check does not depend on the contents of hermes.sqlite; an index
+# without the db only matches the texts its keywords were added with, so every line adds all of them. The rows of a
+# text leave its last span out, the space after the line keeps it in
+script_text2id.keyword_index = KeywordIndex()
+script_text2id.TOKEN_ALIGNED_CANDIDATES = True
+script_text2id.VERIFY_CANDIDATES = True
+
+max_len = script_text2id.max_key_len + script_text2id.DISTANCE_THR
+lengths = set(len(key) for key in text2id["all2id"])
+
+for data_filename in DATA_FILENAMES:
+    data_file = open(data_filename, 'r')
+    data_lines = data_file.readlines()
+    data_file.close()
+
+    num_checked = 0
+    num_exhaustive = 0
+    num_token = 0
+    num_mismatches = len(script_text2id.candidate_mismatches)
+
+    for line in data_lines:
+        line = line.strip()
+        if line == "":
+            continue
+
+        line = "<root> " + line.replace("(e.g.", "that is") + " </root>"
+        line = modify_section_numbers(line.replace("<", " <").replace(">", "> ").strip())
+        try:
+            full_text = get_text(ET.fromstring(line))
+        except ParseError:
+            full_text = line
+
+        dep_text = " " + copy.deepcopy(full_text).strip() + " "
+        dep_text = dep_text.replace("i.e.", "that is").replace("e.g.", "for example,")
+        dep_text = dep_text.replace("/", " / ").replace(",", " , ").replace(".", " . ").replace(";", " ; "). \
+            replace("(", " ( ").replace(")", " ) ").replace("-", " - ").replace(":", " : ")
+        dep_text = " ".join(dep_text.split())
+
+        script_text2id.keyword_index.clear_keywords()
+        script_text2id.keyword_index.add_keywords(text2id["all2id"], [dep_text + " "])
+
+        num_exhaustive += len(list(get_candidate_spans(dep_text.lower(), max_len, lengths, False)))
+        num_token += len(list(get_candidate_spans(dep_text.lower(), max_len, lengths, True)))
+        for threshold in CHECK_THRESHOLDS:
+            script_text2id.get_ids_from_text_db(dep_text, text2id["all2id"], threshold, common_defs_dict["ignore_list"])
+        num_checked += 1
+
+    num_mismatches = len(script_text2id.candidate_mismatches) - num_mismatches
+    print(datetime.datetime.now(), ":", data_filename, ":", num_checked, "lines,", num_mismatches, "mismatches,",
+          num_exhaustive, "exhaustive candidates,", num_token, "token candidates")
+
+print()
+print("*** TOTAL MISMATCHES :", len(script_text2id.candidate_mismatches), "***")
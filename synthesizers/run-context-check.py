@@ -0,0 +1,117 @@
+"""
+This is the public release of the code of our paper titled
+"Hermes: Unlocking Security Analysis of Cellular Network Protocols by Synthesizing Finite State Machines from Natural
+    Language Specifications" (USENIX Security '24)
+Author: Abdullah Al Ishtiaq
+Contact: abdullah.ishtiaq@psu.edu
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+      https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+import copy
+import datetime
+from xml.etree import ElementTree as ET
+from xml.etree.ElementTree import ParseError
+
+import script_context
+import script_context_config
+from script_context import LINE_BREAK, init_context, update_global_context_with_paragraph, get_line_part_context, \
+    get_context_copy
+from script_helpers import get_text
+from script_text2id import get_ids_from_text_db
+from script_pipeline import SynthesisPipeline, INPUT_FILENAME, DEFS_FILENAME, COMMON_DEFS_FILENAME, prepare_line
+
+# every paragraph context built incrementally is compared with a full scan of the paragraph
+script_context.VERIFY_PARAGRAPH_CONTEXT = True
+
+# the paragraphs of the input as the synthesizer builds them
+pipeline = SynthesisPipeline(INPUT_FILENAME, DEFS_FILENAME, COMMON_DEFS_FILENAME, os.devnull, os.devnull,
+                             use_cache_snapshot=False)
+pipeline.load()
+pipeline.run()
+num_run_mismatches = len(script_context.paragraph_context_mismatches)
+print(datetime.datetime.now(), ":", INPUT_FILENAME, ":", num_run_mismatches, "mismatches")
+
+# every line of the input split by a line break at the start, middle and end of each keyword it matches
+ignore_list = pipeline.common_defs_dict["ignore_list"]
+num_paragraphs = 0
+for line in pipeline.input_lines:
+    line = prepare_line(line)
+    if line == "":
+        continue
+    try:
+        full_text = get_text(ET.fromstring(line))
+    except ParseError:
+        continue
+
+    for item in get_ids_from_text_db(full_text, pipeline.text2id["all2id"], 2, ignore_list):
+        for split_idx in sorted({item[2], item[2] + item[3] // 2, item[4]}):
+            first_line = LINE_BREAK + full_text[:split_idx]
+            paragraph = first_line + LINE_BREAK + full_text[split_idx:]
+
+            init_context()
+            update_global_context_with_paragraph(first_line, pipeline.text2id, ignore_list)
+            update_global_context_with_paragraph(paragraph, pipeline.text2id, ignore_list)
+            get_line_part_context(paragraph[:len(first_line) + len(LINE_BREAK) + item[3]], pipeline.text2id,
+                                  ignore_list)
+            num_paragraphs += 1
+
+num_split_mismatches = len(script_context.paragraph_context_mismatches) - num_run_mismatches
+print(datetime.datetime.now(), ":", num_paragraphs, "split paragraphs,", num_split_mismatches, "mismatches")
+
+
+# every way of reading a context snapshot must hand out copies, so changing them leaves the global context alone
+def change_value(value):
+    if isinstance(value, (set, dict)):
+        value.clear()
+    elif isinstance(value, list):
+        value.append(None)
+
+
+def change_snapshot(snapshot_reader) -> int:
+    global_context = copy.deepcopy(script_context_config.global_context)
+    for value in snapshot_reader(get_context_copy()):
+        change_value(value)
+        if isinstance(value, list) and len(value) > 0:
+            change_value(value[0])
+    if script_context_config.global_context == global_context:
+        return 0
+    script_context_config.global_context = global_context
+    return 1
+
+
+snapshot_readers = {
+    "getitem": lambda snapshot: [snapshot[key] for key in list(snapshot)],
+    "get": lambda snapshot: [snapshot.get(key) for key in list(snapshot)],
+    "values": lambda snapshot: snapshot.values(),
+    "items": lambda snapshot: [value for key, value in snapshot.items()],
+    "pop": lambda snapshot: [snapshot.pop(key) for key in list(snapshot)],
+    "popitem": lambda snapshot: [snapshot.popitem()[1] for _ in range(len(snapshot))],
+    "setdefault": lambda snapshot: [snapshot.setdefault(key) for key in list(snapshot)],
+    "copy": lambda snapshot: snapshot.copy().values(),
+    "dict": lambda snapshot: dict(snapshot).values(),
+    "unpack": lambda snapshot: {**snapshot}.values(),
+    "shallow copy": lambda snapshot: copy.copy(snapshot).values(),
+}
+script_context_config.global_context["snapshot_check"] = [{"snapshot_check"}]
+num_snapshot_mismatches = 0
+for reader_name, snapshot_reader in snapshot_readers.items():
+    reader_mismatches = change_snapshot(snapshot_reader)
+    if reader_mismatches > 0:
+        print("SNAPSHOT", reader_name, "MISMATCH :", "the global context was changed through a snapshot")
+    num_snapshot_mismatches += reader_mismatches
+print(datetime.datetime.now(), ":", len(snapshot_readers), "snapshot readers,", num_snapshot_mismatches, "mismatches")
+
+print()
+print("*** TOTAL MISMATCHES :", len(script_context.paragraph_context_mismatches) + num_snapshot_mismatches, "***")
@@ -18,12 +18,14 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import os
 import json
 import math
 import copy
 import datetime
 import time
-from multiprocessing import Process, Manager
+from multiprocessing import Process, Queue
+from queue import Full
 from xml.etree import ElementTree as ET
 
 from script_helpers import get_text, modify_section_numbers, get_str_stem
@@ -34,42 +36,20 @@ import random
 random.seed(datetime.datetime.now().microsecond)
 
 import script_config
-from keywords_preprocess import preprocess_keywords
+from script_defs_compiler import load_compiled_defs
 
-NUM_PROCESSES = 4
+NUM_PROCESSES = max(1, (os.cpu_count() or 4) - 1)
+INSERT_QUEUE_SIZE = 256
+WRITER_CHECK_INTERVAL = 5.0
 UPDATE_EXISTING = False
 SKIP_EXISTING_SUBSTR = False
 SKIP_EXISTING_MATCHED_STR = False
+TOKEN_ALIGNED_CANDIDATES = False
 COMMON_DEFS_FILENAME = script_config.common_definitions
 INPUT_FILENAME = "input.txt"
 
-preprocess_keywords(script_config.saved_nas_definitions, script_config.nas_definitions)
-
-id2text_file = open(script_config.nas_definitions, 'r')
-id2text = json.load(id2text_file)
-id2text_file.close()
-
-
-if "id2field_val" not in id2text:
-    id2text["id2field_val"] = {}
-
-text2id = {}
-text2id["all2id"] = {}
-for key in list(id2text.keys()):
-    key_splits = key.strip().split("2")
-    new_key = key_splits[1] + "2" + key_splits[0]
-    text2id[new_key] = {}
-
-    id2def = id2text[key]
-    for lower_key in list(id2def.keys()):
-        text_list = id2def[lower_key]
-        for text_item in text_list:
-            text_item = (text_item.lower().replace("/", " / ").replace(",", " , ").replace(".", " . ").
-                         replace(";", " ; ").replace("-", " - ").replace(":", " : "))
-            if new_key == "verb2id":
-                text2id["all2id"][get_str_stem(text_item)[0]] = lower_key
-            else:
-                text2id["all2id"][text_item] = lower_key
+defs_artifact = load_compiled_defs(script_config.nas_definitions, script_config.saved_nas_definitions)
+text2id = {"all2id": defs_artifact["keyword_all2id"]}
 
 common_defs_file = open(COMMON_DEFS_FILENAME, 'r')
 common_defs_dict = json.load(common_defs_file)
@@ -81,14 +61,49 @@ for item in common_defs_dict["ignore_list"]:
 max([len(item) for item in text2id["all2id"]])
 
 
-def worker(worker_num, worker_lines, shared_searched_strings):
+def writer(insert_queue):
+    print(datetime.datetime.now(), ": Writer : Start\n")
+
+    from script_db_handler import get_new_conn_cursor, close_connection, insert_substring_keyword_distance_batch, \
+        check_best_match_ready, rebuild_best_match_table
+    db_conn, db_cursor = get_new_conn_cursor()
+
+    # the workers do not share their searched strings, so the first batch with rows for a substring wins
+    written_substrings = set()
+    num_rows = 0
+    while True:
+        insert_list = insert_queue.get()
+        if insert_list is None:
+            break
+
+        insert_list = [row for row in insert_list if row[0] not in written_substrings]
+        written_substrings.update(row[0] for row in insert_list)
+        if len(insert_list) == 0:
+            continue
+
+        insert_substring_keyword_distance_batch(db_conn, db_cursor, insert_list, UPDATE_EXISTING, thread_num="writer")
+        num_rows = num_rows + len(insert_list)
+
+    if not check_best_match_ready(db_cursor):
+        print(datetime.datetime.now(), ": Writer : Rebuilding best match table\n")
+        rebuild_best_match_table(db_conn, db_cursor)
+
+    close_connection(db_conn, db_cursor)
+    print(datetime.datetime.now(), ": Writer : Complete with", num_rows, "rows...\n")
+
+
+def worker(worker_num, worker_lines, insert_queue):
     num_lines = len(worker_lines)
     print(datetime.datetime.now(), ": Worker", worker_num, ": Start with :", num_lines, "lines\n")
 
     from script_db_handler import get_new_conn_cursor, close_connection
-    db_conn, db_cursor = get_new_conn_cursor()
 
-    # searched_strings = set()
+    # the connection is only read to skip existing strings, all rows go through the writer
+    db_conn, db_cursor = None, None
+    if SKIP_EXISTING_SUBSTR or SKIP_EXISTING_MATCHED_STR:
+        db_conn, db_cursor = get_new_conn_cursor()
+
+    searched_strings = {}
     for idx, line in enumerate(worker_lines):
         if idx > 0 and idx % 10 == 0:
             print(datetime.datetime.now(), ": Worker", worker_num, "Line", idx + 1, "of", num_lines, ": Running...\n")
@@ -105,15 +120,9 @@ def worker(worker_num, worker_lines, shared_searched_strings):
         # line = " ".join(line.split())
         line = modify_section_numbers(line)
 
-        temp_file = open("temp{}.txt".format(worker_num), 'w')
-        temp_file.write(line + "\n")
-        temp_file.close()
-        line_tree = None
-
         try:
             # print("\nWorker", worker_num, "Line", i+1, ":", line)
-            line_tree = ET.parse("temp{}.txt".format(worker_num))
-            full_text = get_text(line_tree.getroot())
+            full_text = get_text(ET.fromstring(line))
 
         except:
             print(datetime.datetime.now(), ": Worker", worker_num, ": Line", i + 1, ": Parsing error\n")
@@ -121,13 +130,15 @@ def worker(worker_num, worker_lines, shared_searched_strings):
 
         full_text = " ".join(full_text.split())
         build_string_distance(db_conn, db_cursor, full_text, text2id["all2id"], SKIP_EXISTING_SUBSTR,
-                              SKIP_EXISTING_MATCHED_STR, UPDATE_EXISTING, shared_searched_strings,
-                              thread_num=worker_num)
+                              SKIP_EXISTING_MATCHED_STR, UPDATE_EXISTING, searched_strings,
+                              thread_num=worker_num, token_aligned=TOKEN_ALIGNED_CANDIDATES,
+                              insert_queue=insert_queue)
 
         stemmed_text = " ".join(get_str_stem(full_text))
         build_string_distance(db_conn, db_cursor, stemmed_text, text2id["all2id"], SKIP_EXISTING_SUBSTR,
-                              SKIP_EXISTING_MATCHED_STR, UPDATE_EXISTING, shared_searched_strings,
-                              thread_num=worker_num)
+                              SKIP_EXISTING_MATCHED_STR, UPDATE_EXISTING, searched_strings,
+                              thread_num=worker_num, token_aligned=TOKEN_ALIGNED_CANDIDATES,
+                              insert_queue=insert_queue)
 
         dep_text = " " + copy.deepcopy(full_text).strip() + " "
         dep_text = dep_text.replace("i.e.", "that is").replace("e.g.", "for example,")
@@ -149,10 +160,12 @@ def worker(worker_num, worker_lines, shared_searched_strings):
         dep_text = " ".join(dep_text.split()).strip()
 
         build_string_distance(db_conn, db_cursor, dep_text, text2id["all2id"], SKIP_EXISTING_SUBSTR,
-                              SKIP_EXISTING_MATCHED_STR, UPDATE_EXISTING, shared_searched_strings,
-                              thread_num=worker_num)
+                              SKIP_EXISTING_MATCHED_STR, UPDATE_EXISTING, searched_strings,
+                              thread_num=worker_num, token_aligned=TOKEN_ALIGNED_CANDIDATES,
+                              insert_queue=insert_queue)
 
-    close_connection(db_conn, db_cursor)
+    if db_conn is not None:
+        close_connection(db_conn, db_cursor)
     print(datetime.datetime.now(), ": Worker", worker_num, ": Complete...\n")
 
 
@@ -161,8 +174,10 @@ input_lines = input_file.readlines()
 input_file.close()
 random.shuffle(input_lines)
 
-manager = Manager()
-shared_dict = manager.dict()
+shared_insert_queue = Queue(INSERT_QUEUE_SIZE)
+
+writer_process = Process(target=writer, args=(shared_insert_queue,))
+writer_process.start()
 
 process_list = []
 num_per_worker = math.ceil(len(input_lines) / NUM_PROCESSES)
@@ -172,13 +187,37 @@ for i in range(NUM_PROCESSES):
     else:
         p_lines_list = input_lines[i * num_per_worker:]
 
-    pr = Process(target=worker, args=(i, p_lines_list, shared_dict))
+    pr = Process(target=worker, args=(i, p_lines_list, shared_insert_queue))
     process_list.append(pr)
     pr.start()
     time.sleep(0.5)
 
+# workers block on the bounded queue once the writer is gone, so they are stopped as soon as it dies
+while any(pr.is_alive() for pr in process_list):
+    if not writer_process.is_alive():
+        for pr in process_list:
+            pr.terminate()
+        raise RuntimeError("Writer process exited with code {} before the workers finished"
+                           .format(writer_process.exitcode))
+    time.sleep(WRITER_CHECK_INTERVAL)
+
 for pr in process_list:
     pr.join()
 
+failed_workers = [i for i, pr in enumerate(process_list) if pr.exitcode != 0]
+
+while writer_process.is_alive():
+    try:
+        shared_insert_queue.put(None, timeout=WRITER_CHECK_INTERVAL)
+        break
+    except Full:
+        continue
+writer_process.join()
+
+if writer_process.exitcode != 0:
+    raise RuntimeError("Writer process exited with code {}".format(writer_process.exitcode))
+if len(failed_workers) > 0:
+    raise RuntimeError("Workers {} exited with errors".format(failed_workers))
+
 print()
 print("*** ALL PROCESSES COMPLETE ***")
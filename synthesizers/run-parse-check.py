@@ -0,0 +1,91 @@
+"""
+This is the public release of the code of our paper titled
+"Hermes: Unlocking Security Analysis of Cellular Network Protocols by Synthesizing Finite State Machines from Natural
+    Language Specifications" (USENIX Security '24)
+Author: Abdullah Al Ishtiaq
+Contact: abdullah.ishtiaq@psu.edu
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+      https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+import copy
+import pickle
+import datetime
+from xml.etree import ElementTree as ET
+from xml.etree.ElementTree import ParseError
+
+from stanza.protobuf import Document
+
+from script_helpers import get_text, modify_section_numbers, extract_parenthesized
+import script_DepGraph
+
+DATA_FILENAMES = ["../data/4g-nas-rel16.txt", "../data/5g-nas-rel17.txt", "../data/5g-rrc-rel17.txt"]
+RECORDED_PARSES_FILENAME = "recorded-parses.pickle"
+
+# the annotated documents are recorded, so the check can be repeated without a CoreNLP server
+recorded_parses = {}
+if os.path.exists(RECORDED_PARSES_FILENAME):
+    with open(RECORDED_PARSES_FILENAME, 'rb') as recorded_parses_file:
+        recorded_parses = pickle.load(recorded_parses_file)
+
+script_DepGraph.VERIFY_PROTO_CONVERSION = True
+
+for data_filename in DATA_FILENAMES:
+    data_file = open(data_filename, 'r')
+    data_lines = data_file.readlines()
+    data_file.close()
+
+    num_sentences = 0
+    num_mismatches = len(script_DepGraph.proto_mismatches)
+
+    for line in data_lines:
+        line = line.strip()
+        if line == "":
+            continue
+
+        line = "<root> " + line.replace("(e.g.", "that is") + " </root>"
+        line = modify_section_numbers(line.replace("<", " <").replace(">", "> ").strip())
+        try:
+            full_text = get_text(ET.fromstring(line))
+        except ParseError:
+            full_text = line
+
+        dep_text = " " + copy.deepcopy(full_text).strip() + " "
+        dep_text = dep_text.replace("i.e.", "that is").replace("e.g.", "for example,")
+        dep_text = dep_text.replace("/", " / ").replace(",", " , ").replace(".", " . ").replace(";", " ; "). \
+            replace("(", " ( ").replace(")", " ) ").replace("-", " - ").replace(":", " : ")
+        dep_text = " ".join(dep_text.split())
+
+        for part in extract_parenthesized(dep_text):
+            if part not in recorded_parses:
+                try:
+                    recorded_parses[part] = script_DepGraph.corenlp_client.annotate(part).SerializeToString()
+                except Exception as e:
+                    print("ANNOTATION FAILED :", part, ":", repr(e))
+                    continue
+
+            ann = Document()
+            ann.ParseFromString(recorded_parses[part])
+            for sent in ann.sentence:
+                script_DepGraph.get_sentence_parse(sent)
+                num_sentences += 1
+
+    num_mismatches = len(script_DepGraph.proto_mismatches) - num_mismatches
+    print(datetime.datetime.now(), ":", data_filename, ":", num_sentences, "sentences,", num_mismatches, "mismatches")
+
+with open(RECORDED_PARSES_FILENAME, 'wb') as recorded_parses_file:
+    pickle.dump(recorded_parses, recorded_parses_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+print()
+print("*** TOTAL MISMATCHES :", len(script_DepGraph.proto_mismatches), "***")
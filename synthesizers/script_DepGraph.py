@@ -19,33 +19,78 @@ limitations under the License.
 """
 
 import datetime
+import math
+from bisect import bisect_right
 from collections import defaultdict
 from nltk.tree import ParentedTree, MultiParentedTree
 from nltk.treeprettyprinter import TreePrettyPrinter
 from requests import ReadTimeout
+from stanza.server import TimeoutException, AnnotationException
 
 from script_helpers import *
 from script_text2id import *
+from script_parse_cache import set_parse_cache_config, get_parse_cache_config_key, load_sentence_parses, \
+    has_sentence_parses, save_sentence_parses
+import script_config
 
 import stanza
-from stanza.server import CoreNLPClient
+from stanza.protobuf import Token
+from google.protobuf.text_encoding import CEscape
+from script_corenlp_pool import CoreNLPPool, get_corenlp_endpoints
+from script_keyword_types import NOT_FOUND, KeywordTables
+
+CORENLP_ANNOTATORS = ['tokenize', 'ssplit', 'pos', 'lemma', 'ner', 'parse', 'depparse', 'coref']
+CORENLP_PROPERTIES = {'annotators': 'coref', 'coref.algorithm': 'neural'}
+
+USE_PARSE_CACHE = True
+
+TOKEN_FIELDS = ["word", "pos", "lemma", "ner"]
+VERIFY_PROTO_CONVERSION = False
+PROTO_STR_AS_UTF8 = "\\" not in str(Token(word="\u2019"))
+
+# off until VERIFY_BATCH_ANNOTATION has found no mismatches against a real CoreNLP server
+BATCH_ANNOTATION = False
+BATCH_MAX_CHARS = 20000
+BATCH_SEPARATOR = "\n\n"
+# coref is the only annotator that links sentences and its chains are never read, so batches leave it out and every
+# part gets the tokens and dependencies it would get alone; blank lines between the parts are forced sentence breaks,
+# so no sentence spans two parts
+BATCH_ANNOTATORS = [annotator for annotator in CORENLP_ANNOTATORS if annotator != "coref"]
+BATCH_PROPERTIES = {'ssplit.newlineIsSentenceBreak': 'two'}
+# texts with a batched part are stored apart, so a run without batches never reads a parse made without coref
+BATCH_PARSE_CACHE_KEY = get_parse_cache_config_key(BATCH_ANNOTATORS, BATCH_PROPERTIES)
+VERIFY_BATCH_ANNOTATION = False
 
 stanza.install_corenlp()
-corenlp_client = CoreNLPClient(annotators=['tokenize', 'ssplit', 'pos', 'lemma', 'ner', 'parse', 'depparse', 'coref'],
-                               properties={'annotators': 'coref', 'coref.algorithm': 'neural'}, timeout=30000,
-                               memory='4G', endpoint='http://localhost:9001', start_server='DONT_START')
+corenlp_client = CoreNLPPool(get_corenlp_endpoints(), CORENLP_ANNOTATORS, CORENLP_PROPERTIES, 30000)
+
+set_parse_cache_config(CORENLP_ANNOTATORS, CORENLP_PROPERTIES)
 
 dep_graph_cache_dict = {}
+keyword_snapshot = {"text2id": None, "all_tokens": None, "version": None, "tables": None}
+annotation_cache_dict = {}
+proto_mismatches = []
+batch_mismatches = []
+annotation_stats = {"requests": 0, "batch_requests": 0, "batched_parts": 0, "batch_failures": 0, "stored_texts": 0,
+                    "keyword_snapshots": 0}
 
 
+# nodes are parallel arrays indexed by node id - 1, child lists and the parent index by node id
 class DepGraph:
     def __init__(self, common_defs_dict, text2id_dict, all_tokens):
-        self.edges = defaultdict(list)
-        self.nodes = []
+        self.tokens = []
+        self.words = []
+        self.pos_tags = []
+        self.key_types = []
+        self.id_words = []
+        self.child_edges = [[]]
+        self.parent_ids = [[]]
         self.root = None
         self.nltk_tree = None
         self.nltk_tree_node_dict = {}
         self.children_copied = set()
+        self.verb_lookups = {}
+        self.arrays_shared = False
 
         self.common_defs_dict = common_defs_dict
         self.text2id = text2id_dict
@@ -53,58 +98,89 @@ class DepGraph:
 
         self.context = defaultdict(list)
 
-    def add_node(self, node_label: dict):
-        node_label["key_type"] = get_text_type(node_label["word"], self.text2id, self.common_defs_dict)
-        node_label["id_word"] = str(len(self.nodes) + 1) + "->" + node_label["word"]
-        self.nodes.append(node_label)
-
-    def get_nodes(self):
-        return self.nodes
-
-    def get_node_at(self, idx):
-        if idx > len(self.nodes):
-            print("ERROR IDX :", idx, ", length :", len(self.nodes))
-            return "IDX_OUT_OF_BOUND_ACCESSED"
-        return self.nodes[idx - 1]
+    # an overlay shares the node and edge arrays until one side writes; the lists inside them are replaced, never
+    # changed in place, so a cached graph stays as it was stored whatever its overlays do
+    def overlay(self):
+        graph = copy.copy(self)
+        graph.nltk_tree = copy.deepcopy(self.nltk_tree)
+        graph.nltk_tree_node_dict = copy.deepcopy(self.nltk_tree_node_dict)
+        graph.children_copied = set(self.children_copied)
+        graph.context = defaultdict(list)
+        self.arrays_shared = True
+        graph.arrays_shared = True
+        return graph
+
+    def own_arrays(self):
+        if not self.arrays_shared:
+            return
+        self.tokens = list(self.tokens)
+        self.words = list(self.words)
+        self.pos_tags = list(self.pos_tags)
+        self.key_types = list(self.key_types)
+        self.id_words = list(self.id_words)
+        self.child_edges = list(self.child_edges)
+        self.parent_ids = list(self.parent_ids)
+        self.arrays_shared = False
+
+    def reserve_node_id(self, idx):
+        self.own_arrays()
+        while len(self.child_edges) <= idx:
+            self.child_edges.append([])
+            self.parent_ids.append([])
 
-    def set_node_at(self, idx, new_node):
-        if idx > len(self.nodes):
-            print("ERROR IDX :", idx, ", length :", len(self.nodes))
-            return "IDX_OUT_OF_BOUND_ACCESSED"
-        self.nodes[idx - 1] = new_node
+    def add_node(self, node_label: dict):
+        word = node_label["word"]
+        self.own_arrays()
+        self.tokens.append(node_label)
+        self.words.append(word)
+        self.pos_tags.append(node_label.get("pos"))
+        self.key_types.append(get_text_type(word, self.text2id, self.common_defs_dict))
+        self.id_words.append(str(len(self.words)) + "->" + word)
+        self.reserve_node_id(len(self.words))
+
+    def copy_node(self, idx) -> int:
+        self.add_node(self.tokens[idx - 1])
+        return self.get_num_nodes()
 
     def get_num_nodes(self):
-        return len(self.nodes)
+        return len(self.words)
 
     def get_id_words(self):
-        return [tok["id_word"] for tok in self.nodes]
+        return list(self.id_words)
 
     def get_id_word_at(self, idx):
-        if idx > len(self.nodes):
-            print("ERROR IDX :", idx, ", length :", len(self.nodes))
+        if idx > len(self.words):
+            print("ERROR IDX :", idx, ", length :", len(self.words))
             return "IDX_OUT_OF_BOUND_ACCESSED"
-        return self.nodes[idx - 1]["id_word"]
+        return self.id_words[idx - 1]
 
     def get_words(self):
-        return [tok["word"] for tok in self.nodes]
+        return list(self.words)
 
     def get_word_at(self, idx):
-        if idx > len(self.nodes):
-            print("ERROR IDX :", idx, ", length :", len(self.nodes))
+        if idx > len(self.words):
+            print("ERROR IDX :", idx, ", length :", len(self.words))
             return "IDX_OUT_OF_BOUND_ACCESSED"
-        return self.nodes[idx - 1]["word"]
+        return self.words[idx - 1]
 
     def get_pos_at(self, idx):
-        if idx > len(self.nodes):
-            print("ERROR IDX :", idx, ", length :", len(self.nodes))
+        if idx > len(self.words):
+            print("ERROR IDX :", idx, ", length :", len(self.words))
             return "IDX_OUT_OF_BOUND_ACCESSED"
-        return self.nodes[idx - 1]["pos"]
+        return self.pos_tags[idx - 1]
 
     def get_types_at(self, idx) -> List[str]:
-        if idx > len(self.nodes):
-            print("ERROR IDX :", idx, ", length :", len(self.nodes))
+        if idx > len(self.words):
+            print("ERROR IDX :", idx, ", length :", len(self.words))
+            return "IDX_OUT_OF_BOUND_ACCESSED"
+        return self.key_types[idx - 1]
+
+    def add_type_at(self, idx, key_type: str):
+        if idx > len(self.words):
+            print("ERROR IDX :", idx, ", length :", len(self.words))
             return "IDX_OUT_OF_BOUND_ACCESSED"
-        return self.nodes[idx - 1]["key_type"]
+        self.own_arrays()
+        self.key_types[idx - 1] = self.key_types[idx - 1] + [key_type]
 
     def set_root(self, root):
         self.root = root
@@ -113,35 +189,23 @@ class DepGraph:
         return self.root
 
     def add_edge(self, u, v, edge_label):
-        self.edges[u].append((v, edge_label))
-
-    def get_edges(self):
-        return self.edges
+        self.reserve_node_id(max(u, v))
+        self.child_edges[u] = self.child_edges[u] + [(v, edge_label)]
+        if u not in self.parent_ids[v]:
+            self.parent_ids[v] = self.parent_ids[v] + [u]
 
     def get_edges_at(self, node_idx):
-        return self.get_edges()[node_idx]
+        if node_idx >= len(self.child_edges):
+            return []
+        return self.child_edges[node_idx]
 
     def get_parents(self, node_idx):
-        parent_list = []
-        all_edges = self.get_edges()
-        for start_node in all_edges:
-            for edge_item in all_edges[start_node]:
-                if edge_item[0] == node_idx:
-                    parent_list.append(start_node)
-                    break
-
-        return parent_list
+        if node_idx >= len(self.parent_ids):
+            return []
+        return self.parent_ids[node_idx]
 
     def get_children_ids(self, node_idx):
-        children = []
-        node_edges = self.get_edges_at(node_idx)
-        for edge_item in node_edges:
-            children.append(edge_item[0])
-
-        return children
-
-    def get_children_nodes(self, node_idx):
-        return [self.get_node_at(idx) for idx in self.get_children_ids(node_idx)]
+        return [edge_item[0] for edge_item in self.get_edges_at(node_idx)]
 
     def get_children_words(self, node_idx):
         return [self.get_word_at(idx) for idx in self.get_children_ids(node_idx)]
@@ -159,7 +223,7 @@ class DepGraph:
     def build_nltk_tree(self, node_idx):
         node_str = self.get_id_word_at(node_idx) + ":" + self.get_pos_at(node_idx) + ":" + str(
             self.get_types_at(node_idx))
-        node_edges = self.get_edges()[node_idx]
+        node_edges = self.get_edges_at(node_idx)
 
         if len(node_edges) == 0:
             return node_str
@@ -180,10 +244,10 @@ class DepGraph:
 
     def get_context(self) -> defaultdict:
         self.context = defaultdict(list)
-        for node in self.nodes:
-            for key_type in node["key_type"]:
-                if node["word"] not in self.context[key_type]:
-                    self.context[key_type].append(node["word"])
+        for word, key_type_list in zip(self.words, self.key_types):
+            for key_type in key_type_list:
+                if word not in self.context[key_type]:
+                    self.context[key_type].append(word)
 
         return self.context
 
@@ -207,8 +271,7 @@ class DepGraph:
         for edge in src_edges:
             edge_node_id = edge[0]
             edge_label = edge[1]
-            edge_node = self.get_node_at(edge_node_id)
-            edge_word = edge_node["word"]
+            edge_word = self.get_word_at(edge_node_id)
 
             if edge_word in dst_children_words:
                 continue
@@ -217,90 +280,94 @@ class DepGraph:
             if edge_node_id == dst_node_id:
                 continue
 
-            new_child_node = copy.deepcopy(edge_node)
-            self.add_node(new_child_node)
-            new_child_id = self.get_num_nodes()
+            new_child_id = self.copy_node(edge_node_id)
 
             self.copy_children(edge_node_id, new_child_id)
 
             self.add_edge(dst_node_id, new_child_id, edge_label)
 
-    def get_child_str(self, child_node_id, visited_set, keywords):
-        child_str = self.run_dfs(child_node_id, visited_set, keywords).strip()
+    def get_verb_ids(self, node_text: str) -> list:
+        if node_text not in self.verb_lookups:
+            self.verb_lookups[node_text] = get_ids_from_text_db(" ".join(get_str_stem(node_text)).strip(),
+                                                                self.text2id["verb2id"], 1,
+                                                                self.common_defs_dict["ignore_list"])
+        return self.verb_lookups[node_text]
 
-        while "()" in child_str or "( )" in child_str or "(," in child_str or ", )" in child_str or "  " in child_str \
-                or ", ," in child_str:
-            child_str = child_str.replace("()", "").replace("( )", "").replace("(,", "(").replace(", )", ")").replace(
-                "  ", " ").replace(", ,", ", ")
-        while child_str.startswith("("):
-            child_str = child_str[1:-1]
+    # explicit stack of node visits: each visit yields the id of a child it needs and is sent back the child's string
+    def run_dfs(self, node_id, visited_set, keywords, is_root=False):
+        visits = [self.visit_node(node_id, visited_set, keywords)]
+        child_str = None
+        while True:
+            try:
+                child_node_id = visits[-1].send(child_str)
+            except StopIteration as visit_end:
+                visits.pop()
+                if len(visits) == 0:
+                    return visit_end.value
+                child_str = strip_outer_parens(clean_dfs_str(visit_end.value.strip())).strip()
+                continue
 
-        return child_str.strip()
+            visits.append(self.visit_node(child_node_id, visited_set, keywords))
+            child_str = None
+
+    def visit_node(self, node_id, visited_set, keywords):
+        copied = True
+        while copied:
+            copied = False
+            for child_node_id, child_label in self.get_edges_at(node_id):
+                if child_label in self.common_defs_dict["conj_label"] and (
+                        node_id, child_node_id) not in self.children_copied and (
+                        child_node_id, node_id) not in self.children_copied:
+                    self.copy_children(node_id, child_node_id, [child_label])
+                    self.children_copied.add((node_id, child_node_id))
+                    self.children_copied.add((child_node_id, node_id))
+                    copied = True
+                    break
 
-    def run_dfs(self, node_id, visited_set, keywords, is_root=False):
-        this_node = self.get_node_at(node_id)
         node_text = str(self.get_word_at(node_id)).strip().lower()
         node_id_text = str(self.get_id_word_at(node_id)).strip().lower()
-        node_pos = self.get_pos_at(node_id).strip()
 
         edges = self.get_edges_at(node_id)
         children = [item[0] for item in edges]
         num_child = len(children)
         node_labels = [item[1] for item in edges]
 
-        for child_idx, child_node_id in enumerate(children):
-            child_label = node_labels[child_idx]
-            if child_label in self.common_defs_dict["conj_label"] and (
-                    node_id, child_node_id) not in self.children_copied and (
-                    child_node_id, node_id) not in self.children_copied:
-                self.copy_children(node_id, child_node_id, [child_label])
-                self.children_copied.add((node_id, child_node_id))
-                self.children_copied.add((child_node_id, node_id))
-                return self.run_dfs(node_id, visited_set, keywords)
-
         visited_set.add(node_id)
-        verbs_conv = get_ids_from_text_db(" ".join(get_str_stem(node_text)).strip(), self.text2id["verb2id"], 1,
-                                          self.common_defs_dict["ignore_list"])
+        verbs_conv = self.get_verb_ids(node_text)
         if node_text not in keywords and len(verbs_conv) > 0:
             node_text = verbs_conv[0][0]
             node_id_text = str(node_id) + "->" + node_text
-            this_node["key_type"].append("verb")
-            self.set_node_at(node_id, this_node)
+            self.add_type_at(node_id, "verb")
 
         elif isTimer(node_text):
             keywords.add(node_text)
-            this_node["key_type"].append("timer")
-            self.set_node_at(node_id, this_node)
+            self.add_type_at(node_id, "timer")
 
         elif node_text in self.common_defs_dict["directive"]:
             node_text = self.common_defs_dict["directive"][node_text]
             node_id_text = str(node_id) + "->" + node_text
-            this_node["key_type"].append("directive")
-            self.set_node_at(node_id, this_node)
+            self.add_type_at(node_id, "directive")
 
         elif node_text in self.common_defs_dict["preposition"]:
             node_text = self.common_defs_dict["preposition"][node_text]
             node_id_text = str(node_id) + "->" + node_text
             if num_child == 0:
                 node_id_text = ""
-            this_node["key_type"].append("preposition")
-            self.set_node_at(node_id, this_node)
+            self.add_type_at(node_id, "preposition")
 
         elif node_text in self.common_defs_dict["conjunction"]:
             node_text = self.common_defs_dict["conjunction"][node_text]
             node_id_text = str(node_id) + "->" + node_text
             if num_child == 0:
                 node_id_text = ""
-            this_node["key_type"].append("conjunction")
-            self.set_node_at(node_id, this_node)
+            self.add_type_at(node_id, "conjunction")
 
         elif node_text in self.common_defs_dict["special"]:
             node_text = self.common_defs_dict["special"][node_text]
             node_id_text = str(node_id) + "->" + node_text
             if num_child == 0:
                 node_id_text = ""
-            this_node["key_type"].append("special")
-            self.set_node_at(node_id, this_node)
+            self.add_type_at(node_id, "special")
 
         elif node_text not in self.all_tokens and node_text not in keywords and not isRef(node_text):
             node_text = ""
@@ -314,7 +381,6 @@ class DepGraph:
         add_extra_rparen = 0
 
         for child_idx, child_node_id in enumerate(children):
-            child_node = self.get_node_at(child_node_id)
             child_label = node_labels[child_idx]
             child_node_text = self.get_word_at(child_node_id).strip().lower()
             child_node_id_text = self.get_id_word_at(child_node_id).strip().lower()
@@ -328,7 +394,7 @@ class DepGraph:
 
             if ("nsubj" in child_label or "agent" in child_label) and child_node_text in self.text2id[
                 "agent2id"].values():
-                child_str = self.get_child_str(child_node_id, visited_set, keywords)
+                child_str = yield child_node_id
                 if child_str == "" or child_str.endswith("->") or "->)" in child_str:
                     continue
                 result_str = result_str + "_AGENT_(" + child_str + "), "
@@ -340,20 +406,20 @@ class DepGraph:
                 add_extra_rparen = add_extra_rparen + 1
 
             elif node_text.strip() == "other" and child_label == "obl:than":
-                child_str = self.get_child_str(child_node_id, visited_set, keywords)
+                child_str = yield child_node_id
                 if child_str == "" or child_str.endswith("->") or "->)" in child_str:
                     continue
                 result_str = result_str + "_NOT_(" + child_str + "), "
 
             elif "amod" in child_label and child_node_text.strip() != "other":
-                child_str = self.get_child_str(child_node_id, visited_set, keywords)
+                child_str = yield child_node_id
                 if child_str == "" or child_str.endswith("->") or "->)" in child_str:
                     continue
                 result_str = child_str + "(" + result_str
                 add_extra_rparen = add_extra_rparen + 1
 
             elif child_label in self.common_defs_dict["conj_label"]:
-                child_str = self.get_child_str(child_node_id, visited_set, keywords)
+                child_str = yield child_node_id
                 conj_ids = self.find_word_in_subtree(child_node_id, child_label.split(":")[-1])
                 conj_label = self.common_defs_dict["conj_label"][child_label]
                 if len(conj_ids) > 0:
@@ -362,7 +428,7 @@ class DepGraph:
                 result_str = conj_label + "(" + child_str + ", " + result_str
                 add_extra_rparen = add_extra_rparen + 1
             elif child_label in self.common_defs_dict["preposition_label"]:
-                child_str = self.get_child_str(child_node_id, visited_set, keywords)
+                child_str = yield child_node_id
                 if child_str == "" or child_str.endswith("->") or "->)" in child_str:
                     continue
                 prep_ids = self.find_word_in_subtree(child_node_id, child_label.split(":")[-1])
@@ -378,23 +444,22 @@ class DepGraph:
                     result_str = result_str.replace("_BEFORE_(_BEFORE_", "_BEFORE_")
 
             elif child_label == "mark" and child_node_text in self.common_defs_dict["mark"]:
-                child_str = self.get_child_str(child_node_id, visited_set, keywords)
+                child_str = yield child_node_id
                 result_str = str(child_node_id) + "->" + self.common_defs_dict["mark"][child_node_text] + "(" + result_str
                 add_extra_rparen = add_extra_rparen + 1
 
             elif child_label == "case" and child_node_text in self.common_defs_dict["case"]:
-                child_str = self.get_child_str(child_node_id, visited_set, keywords)
+                child_str = yield child_node_id
                 result_str = str(child_node_id) + "->" + self.common_defs_dict["case"][child_node_text] + "(" + result_str
                 add_extra_rparen = add_extra_rparen + 1
 
             elif self.get_root() in self.get_parents(child_node_id) and child_node_text in \
                     self.common_defs_dict["preposition"]:
-                child_str = self.get_child_str(child_node_id, visited_set, keywords)
+                child_str = yield child_node_id
                 result_str = str(child_node_id) + "->" + self.common_defs_dict["preposition"][
                     child_node_text] + "(" + result_str
                 add_extra_rparen = add_extra_rparen + 1
-                child_node["key_type"].append("preposition")
-                self.set_node_at(child_node_id, child_node)
+                self.add_type_at(child_node_id, "preposition")
 
             elif child_node_text == "any" and child_label == "det" and num_child > child_idx + 1 \
                     and self.get_word_at(children[child_idx + 1]).strip().lower() == "other" \
@@ -402,7 +467,7 @@ class DepGraph:
                 result_str = "_ANY_OTHER_" + "(" + result_str
                 add_extra_rparen = add_extra_rparen + 1
             else:
-                child_str = self.get_child_str(child_node_id, visited_set, keywords)
+                child_str = yield child_node_id
                 if child_str == "" or child_str.endswith("->") or "->)" in child_str:
                     continue
                 else:
@@ -426,80 +491,345 @@ class DepGraph:
     def DFS(self, keywords):
         tree_root = self.get_root()
         visited = set()
+        self.verb_lookups = {}
 
         result_str = self.run_dfs(tree_root, visited, keywords, True)
-        while "()" in result_str or "( )" in result_str or "(," in result_str or ", )" in result_str or "  " in result_str or ", ," in result_str:
-            result_str = result_str.replace("()", "").replace("( )", "").replace("(,", "(").replace(", )", ")").replace(
-                "  ", " ").replace(", ,", ", ")
-
-        while result_str.startswith("("):
-            result_str = result_str[1:-1]
+        return strip_outer_parens(clean_dfs_str(result_str)).strip()
+
+
+# drops empty groups and stray separators in one pass: "()", "( )", "(,", ", )", "  " and ", ," are reduced as they are
+# met, so no new one is left behind
+def clean_dfs_str(dfs_str: str) -> str:
+    if "()" not in dfs_str and "( )" not in dfs_str and "(," not in dfs_str and ", )" not in dfs_str and \
+            "  " not in dfs_str and ", ," not in dfs_str:
+        return dfs_str
+
+    out = []
+    for char in dfs_str:
+        if char == ")":
+            while len(out) > 1 and out[-1] == " " and out[-2] == ",":
+                del out[-2:]
+            if len(out) > 0 and out[-1] == "(":
+                out.pop()
+            elif len(out) > 1 and out[-1] == " " and out[-2] == "(":
+                del out[-2:]
+            else:
+                out.append(char)
+        elif char == ",":
+            if not (len(out) > 0 and out[-1] == "(") and not (len(out) > 1 and out[-1] == " " and out[-2] == ","):
+                out.append(char)
+        elif char != " " or len(out) == 0 or out[-1] != " ":
+            out.append(char)
+
+    return "".join(out)
+
+
+# same as dropping the first and last character while the string starts with "("
+def strip_outer_parens(dfs_str: str) -> str:
+    start = 0
+    while start < len(dfs_str) - start and dfs_str[start] == "(":
+        start = start + 1
+    return dfs_str[start: len(dfs_str) - start]
+
+
+def clear_dep_graph_cache():
+    dep_graph_cache_dict.clear()
+    annotation_cache_dict.clear()
+    keyword_snapshot["text2id"] = None
+    keyword_snapshot["all_tokens"] = None
+    keyword_snapshot["tables"] = None
+
+
+def print_annotation_stats():
+    print("CORENLP :", annotation_stats["requests"], "single requests,", annotation_stats["batch_requests"],
+          "batch requests for", annotation_stats["batched_parts"], "parts,", annotation_stats["batch_failures"],
+          "failed batches,", annotation_stats["stored_texts"], "texts from the parse cache")
+    print("DEP GRAPHS :", len(dep_graph_cache_dict), "cached texts,", annotation_stats["keyword_snapshots"],
+          "keyword snapshots")
+    corenlp_client.print_stats()
+
+
+# a batch that timed out or failed on the server gives None, its parts are then annotated one by one and raise as before
+def annotate_parts_batch(parts: list):
+    part_starts = []
+    document = ""
+    for part in parts:
+        if len(document) > 0:
+            document = document + BATCH_SEPARATOR
+        part_starts.append(len(document))
+        document = document + part
+
+    try:
+        ann = corenlp_client.annotate(document, annotators=BATCH_ANNOTATORS, properties=BATCH_PROPERTIES)
+    except (TimeoutException, AnnotationException, ReadTimeout):
+        return None
+
+    part_sentences = {part: [] for part in parts}
+    for sent in ann.sentence:
+        if len(sent.token) == 0:
+            continue
+        part_idx = bisect_right(part_starts, sent.token[0].beginChar) - 1
+        part_sentences[parts[part_idx]].append(sent)
+
+    if VERIFY_BATCH_ANNOTATION:
+        for part in parts:
+            batch_parse = [get_sentence_parse(sent) for sent in part_sentences[part]]
+            single_parse = [get_sentence_parse(sent) for sent in corenlp_client.annotate(part).sentence
+                            if len(sent.token) > 0]
+            if batch_parse != single_parse:
+                print("BATCH ANNOTATION MISMATCH :", part)
+                batch_mismatches.append((part, single_parse, batch_parse))
+
+    return part_sentences
+
+
+# annotates the parts of the texts a line is about to parse in as few requests as possible, one batch per server
+def prefetch_dependency_annotations(texts: list):
+    parts = {}
+    for text in texts:
+        if text in dep_graph_cache_dict or (USE_PARSE_CACHE and has_stored_sentence_parses(text)):
+            continue
+        for part in extract_parenthesized(text):
+            if BATCH_SEPARATOR not in part:
+                parts[part] = True
+
+    for part in list(annotation_cache_dict.keys()):
+        if part not in parts:
+            del annotation_cache_dict[part]
+
+    missing_parts = [part for part in parts if part not in annotation_cache_dict]
+    if len(missing_parts) < 2:
+        return
+
+    total_len = sum(len(part) + len(BATCH_SEPARATOR) for part in missing_parts)
+    batch_max_chars = min(BATCH_MAX_CHARS, math.ceil(total_len / len(corenlp_client.endpoints)))
+    batches = []
+    batch = []
+    batch_len = 0
+    for part in missing_parts:
+        if len(batch) > 0 and batch_len + len(part) > batch_max_chars:
+            batches.append(batch)
+            batch = []
+            batch_len = 0
+        batch.append(part)
+        batch_len = batch_len + len(part) + len(BATCH_SEPARATOR)
+    batches.append(batch)
+
+    for batch, part_sentences in zip(batches, corenlp_client.map_concurrently(annotate_parts_batch, batches)):
+        annotation_stats["batch_requests"] = annotation_stats["batch_requests"] + 1
+        if part_sentences is None:
+            annotation_stats["batch_failures"] = annotation_stats["batch_failures"] + 1
+            continue
+        annotation_stats["batched_parts"] = annotation_stats["batched_parts"] + len(batch)
+        annotation_cache_dict.update(part_sentences)
+
+
+# the values as the text path read them back from str(), which also escapes non-ASCII on older protobuf versions
+def get_proto_str_value(value: str, is_token=True) -> str:
+    if value.isalnum() and value.isascii():
+        return value
+    if not PROTO_STR_AS_UTF8:
+        value = value.encode("utf-8")
+    value = CEscape(value, PROTO_STR_AS_UTF8).replace("[", "").replace("]", "")
+    if is_token and value == ",":
+        value = "_COMMA_"
+    return ("\"" + value + "\"").split()[0].replace("\"", "")
+
+
+def get_sentence_parse(sent) -> dict:
+    sentence_parse = {"root": int(sent.collapsedCCProcessedDependencies.root[0]), "tokens": [], "edges": []}
+
+    for token in sent.token:
+        sentence_parse["tokens"].append({field: get_proto_str_value(getattr(token, field))
+                                         for field in TOKEN_FIELDS if token.HasField(field)})
+
+    for edge in sent.collapsedCCProcessedDependencies.edge:
+        if not edge.HasField("dep"):
+            continue
+        sentence_parse["edges"].append((edge.source, edge.target, get_proto_str_value(edge.dep, False)))
+
+    if VERIFY_PROTO_CONVERSION:
+        text_parse = get_sentence_parse_from_text(sent)
+        text_parse["tokens"] = [{field: token_dict[field] for field in TOKEN_FIELDS if field in token_dict}
+                                for token_dict in text_parse["tokens"]]
+        if text_parse != sentence_parse:
+            print("PROTO CONVERSION MISMATCH :", " ".join(token.word for token in sent.token))
+            proto_mismatches.append((sent, text_parse, sentence_parse))
+
+    return sentence_parse
+
+
+def get_sentence_parse_from_text(sent) -> dict:
+    sentence_parse = {"root": None, "tokens": [], "edges": []}
+
+    root_text = str(sent.collapsedCCProcessedDependencies.root).replace("[", "").replace("]", "").split(",")[0]
+    sentence_parse["root"] = int(root_text)
+
+    token_str_list = str(sent.token).replace("[", "").replace("]", "").replace(", ", ",\n") \
+        .replace("\",\"", "\"_COMMA_\"").split(",")
+    for token_str in token_str_list:
+        token_dict = {}
+        token_parts = token_str.split("\n")
+        for token_part in token_parts:
+            if ":" not in token_part:
+                continue
+            part_key = token_part.split()[0].replace(":", "").replace("\"", "")
+            part_val = token_part.split()[1].replace("\"", "")
+
+            token_dict[part_key] = part_val
+
+        sentence_parse["tokens"].append(token_dict)
+
+    edge_str_list = (str(sent.collapsedCCProcessedDependencies.edge).replace("[", "").
+                     replace("]", "").replace(", ", ",\n").split(","))
+    for edge_str in edge_str_list:
+        start_node = None
+        end_node = None
+        edge_label = None
+        edge_parts = edge_str.split("\n")
+        for edge_part in edge_parts:
+            if edge_part.startswith("source:"):
+                start_node = int(edge_part.split()[1])
+            elif edge_part.startswith("target:"):
+                end_node = int(edge_part.split()[1])
+            elif edge_part.startswith("dep:"):
+                edge_label = edge_part.split()[1].replace("\"", "")
+
+        if start_node is None or end_node is None or edge_label is None:
+            continue
+
+        sentence_parse["edges"].append((start_node, end_node, edge_label))
+
+    return sentence_parse
+
+
+def annotate_part(part: str):
+    try:
+        return corenlp_client.annotate(part), None
+    except Exception as e:
+        return None, e
+
+
+# the parses are returned with False when a part timed out, those are not stored, and with True when a part came from a
+# batch
+def annotate_sentence_parses(text: str) -> (list, bool, bool):
+    all_parts = extract_parenthesized(text)
+    missing_parts = list(dict.fromkeys(part for part in all_parts if part not in annotation_cache_dict))
+    annotation_stats["requests"] = annotation_stats["requests"] + len(missing_parts)
+    annotations = dict(zip(missing_parts, corenlp_client.map_concurrently(annotate_part, missing_parts)))
+
+    # the parts are annotated side by side, their results and errors are still taken in order
+    all_sentences = []
+    complete = True
+    batched = False
+    for part in all_parts:
+        if part in annotation_cache_dict:
+            all_sentences.extend(annotation_cache_dict[part])
+            batched = True
+            continue
+        ann, exception = annotations[part]
+        if isinstance(exception, ReadTimeout):
+            print("TIMEOUT ")
+            complete = False
+        elif exception is not None:
+            raise exception
+        else:
+            all_sentences.extend(ann.sentence)
+
+    return [get_sentence_parse(sent) for sent in all_sentences], complete, batched
+
+
+def has_stored_sentence_parses(text: str) -> bool:
+    if has_sentence_parses(script_config.parse_cache_file, text):
+        return True
+    return BATCH_ANNOTATION and has_sentence_parses(script_config.parse_cache_file, text, BATCH_PARSE_CACHE_KEY)
+
+
+def load_stored_sentence_parses(text: str):
+    sentence_parses = load_sentence_parses(script_config.parse_cache_file, text)
+    if sentence_parses is None and BATCH_ANNOTATION:
+        sentence_parses = load_sentence_parses(script_config.parse_cache_file, text, BATCH_PARSE_CACHE_KEY)
+    return sentence_parses
+
+
+# a cached parse keeps the keywords it was built with: parses stored while the keyword tables did not change share one
+# copy of them (the graphs never read all2id, so its writes are not counted), and the ignore keys the DFS writes into
+# that verb2id are put back before every reuse
+def get_keyword_snapshot(text2id_dict, all_tokens) -> (dict, set):
+    # all_tokens only ever grows
+    version = None
+    if isinstance(text2id_dict, KeywordTables):
+        version = (text2id_dict.version, len(all_tokens))
+
+    if version is None or keyword_snapshot["text2id"] is not text2id_dict or \
+            keyword_snapshot["all_tokens"] is not all_tokens or keyword_snapshot["version"] != version:
+        memo = {}
+        keyword_snapshot["text2id"] = text2id_dict
+        keyword_snapshot["all_tokens"] = all_tokens
+        keyword_snapshot["version"] = version
+        keyword_snapshot["tables"] = (copy.deepcopy(text2id_dict, memo), copy.deepcopy(all_tokens, memo))
+        annotation_stats["keyword_snapshots"] = annotation_stats["keyword_snapshots"] + 1
+
+    return keyword_snapshot["tables"]
+
+
+def store_dep_graphs(text: str, dep_graph_list: list):
+    cached_graphs = []
+    verb_ignore_state = {}
+    if len(dep_graph_list) > 0:
+        text2id_dict, all_tokens = get_keyword_snapshot(dep_graph_list[0].text2id, dep_graph_list[0].all_tokens)
+        for dep_graph in dep_graph_list:
+            cached_graph = dep_graph.overlay()
+            cached_graph.text2id = text2id_dict
+            cached_graph.all_tokens = all_tokens
+            cached_graphs.append(cached_graph)
+
+        verb2id = text2id_dict["verb2id"]
+        verb_ignore_state = {ignore_key: verb2id.get(ignore_key, NOT_FOUND)
+                             for ignore_key in dep_graph_list[0].common_defs_dict["ignore_list"]}
+    dep_graph_cache_dict[text] = (cached_graphs, verb_ignore_state)
+
+
+def get_cached_dep_graphs(text: str) -> list:
+    cached_graphs, verb_ignore_state = dep_graph_cache_dict[text]
+    if len(cached_graphs) > 0:
+        verb2id = cached_graphs[0].text2id["verb2id"]
+        for ignore_key, value in verb_ignore_state.items():
+            if value is NOT_FOUND:
+                verb2id.pop(ignore_key, None)
+            elif verb2id.get(ignore_key, NOT_FOUND) != value:
+                verb2id[ignore_key] = value
+
+    return [cached_graph.overlay() for cached_graph in cached_graphs]
 
-        return result_str.strip()
 
 def get_collapsed_dependency_graph(text: str, common_defs_dict, text2id_dict, all_tokens) -> list:
     if text in dep_graph_cache_dict:
-        return copy.deepcopy(dep_graph_cache_dict[text])
-
-    dep_graph_list = "NOT_FOUND"
-
-    if dep_graph_list == "NOT_FOUND":
-        dep_graph_list = []
-        all_sentences = []
-        all_parts = extract_parenthesized(text)
-        for part in all_parts:
-            try:
-                ann = corenlp_client.annotate(part)
-                all_sentences.extend(ann.sentence)
-            except ReadTimeout:
-                print("TIMEOUT ")
-
-        for sent in all_sentences:
-            sent_graph = DepGraph(common_defs_dict, text2id_dict, all_tokens)
-
-            root_text = str(sent.collapsedCCProcessedDependencies.root).replace("[", "").replace("]", "").split(",")[0]
-            sent_graph.set_root(int(root_text))
-
-            token_str_list = str(sent.token).replace("[", "").replace("]", "").replace(", ", ",\n") \
-                .replace("\",\"", "\"_COMMA_\"").split(",")
-            for token_str in token_str_list:
-                token_dict = {}
-                token_parts = token_str.split("\n")
-                for token_part in token_parts:
-                    if ":" not in token_part:
-                        continue
-                    part_key = token_part.split()[0].replace(":", "").replace("\"", "")
-                    part_val = token_part.split()[1].replace("\"", "")
-
-                    token_dict[part_key] = part_val
-
-                sent_graph.add_node(token_dict)
-
-            edge_str_list = (str(sent.collapsedCCProcessedDependencies.edge).replace("[", "").
-                             replace("]", "").replace(", ", ",\n").split(","))
-            for edge_str in edge_str_list:
-                start_node = None
-                end_node = None
-                edge_label = None
-                edge_parts = edge_str.split("\n")
-                for edge_part in edge_parts:
-                    if edge_part.startswith("source:"):
-                        start_node = int(edge_part.split()[1])
-                    elif edge_part.startswith("target:"):
-                        end_node = int(edge_part.split()[1])
-                    elif edge_part.startswith("dep:"):
-                        edge_label = edge_part.split()[1].replace("\"", "")
-
-                if start_node is None or end_node is None or edge_label is None:
-                    continue
+        return get_cached_dep_graphs(text)
 
-                sent_graph.add_edge(start_node, end_node, edge_label)
+    sentence_parses = None
+    if USE_PARSE_CACHE:
+        sentence_parses = load_stored_sentence_parses(text)
 
-            dep_graph_list.append(sent_graph)
+    if sentence_parses is None:
+        sentence_parses, complete, batched = annotate_sentence_parses(text)
+        if USE_PARSE_CACHE and complete:
+            save_sentence_parses(script_config.parse_cache_file, text, sentence_parses,
+                                 BATCH_PARSE_CACHE_KEY if batched else None)
+    else:
+        annotation_stats["stored_texts"] = annotation_stats["stored_texts"] + 1
 
-        dep_graph_cache_dict[text] = copy.deepcopy(dep_graph_list)
+    # key types come from the current keywords, only the CoreNLP output is stored
+    dep_graph_list = []
+    for sentence_parse in sentence_parses:
+        sent_graph = DepGraph(common_defs_dict, text2id_dict, all_tokens)
+        sent_graph.set_root(sentence_parse["root"])
+        for token_dict in sentence_parse["tokens"]:
+            sent_graph.add_node(token_dict)
+        for start_node, end_node, edge_label in sentence_parse["edges"]:
+            sent_graph.add_edge(start_node, end_node, edge_label)
 
-    else:
-        dep_graph_cache_dict[text] = copy.deepcopy(dep_graph_list)
+        dep_graph_list.append(sent_graph)
 
+    store_dep_graphs(text, dep_graph_list)
     return dep_graph_list
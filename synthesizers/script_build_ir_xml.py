@@ -399,14 +399,10 @@ def build_ir_xml(output_filename: str, transitions_list: list, add_probabilities
 
     ue_states, mme_states = get_all_states()
 
-    if "any" in ue_states:
-        ue_states.remove("any")
-    if "_UNK_" in ue_states:
-        ue_states.remove("_UNK_")
-    if "any" in mme_states:
-        mme_states.remove("any")
-    if "_UNK_" in mme_states:
-        mme_states.remove("_UNK_")
+    ue_states.pop("any", None)
+    ue_states.pop("_UNK_", None)
+    mme_states.pop("any", None)
+    mme_states.pop("_UNK_", None)
 
     outfile = open(output_filename, 'w')
     outfile.write("<system label=\"LTE\">\n\n")
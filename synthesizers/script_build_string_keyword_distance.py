@@ -19,76 +19,110 @@ limitations under the License.
 """
 
 import copy
+from collections import defaultdict
+from queue import Full
 from Levenshtein import distance as levenshtein_distance
+from rapidfuzz.distance import Levenshtein
+from rapidfuzz.process import cdist
+
+from script_helpers import get_candidate_spans
 
 LOCAL_DISTANCE_THR = 3
 LOCAL_SHORT_THR = 5
+INSERT_QUEUE_TIMEOUT = 600.0
 
 
-def build_string_distance(db_conn, db_cursor, text: str, keywords_dict: dict, skip_substr=False,
-                          skip_matched_string=False, update_existing=False, searched_strings=None,
-                          thread_num=0) -> None:
+def get_keyword_distance(substr: str, lookup_text: str) -> int:
+    if len(lookup_text) < LOCAL_SHORT_THR:
+        lookup_text = " " + lookup_text + " "
+        substr = " " + substr + " "
+
+    return levenshtein_distance(substr, lookup_text)
+
+
+def group_keywords_by_length(keywords_dict: dict) -> dict:
+    keywords_by_len = defaultdict(list)
+    for lookup_text in keywords_dict:
+        keywords_by_len[len(lookup_text)].append(lookup_text)
+    return keywords_by_len
+
+
+def score_length_bucket(substrs: list, lookup_texts: list) -> list:
+    if len(substrs) == 0 or len(lookup_texts) == 0:
+        return []
+
+    # padding short keywords with spaces on both sides never changes the levenshtein distance
+    lookup_len = len(lookup_texts[0])
+    max_dist = min(LOCAL_DISTANCE_THR, lookup_len - 1)
+    dist_matrix = cdist(substrs, lookup_texts, scorer=Levenshtein.distance, score_cutoff=max_dist)
+
+    results = []
+    for substr_idx, lookup_idx in zip(*(dist_matrix <= max_dist).nonzero()):
+        results.append((int(substr_idx), int(lookup_idx), int(dist_matrix[substr_idx, lookup_idx])))
+    return results
+
+
+# the (substring, matched string, keyword, distance) rows of the substrings of text within distance of a keyword of the
+# same length
+def get_string_distance_rows(text: str, keywords_dict: dict, token_aligned=False, searched_strings=None,
+                             skip_substr=None, skip_lookup_text=None) -> list:
     if searched_strings is None:
         searched_strings = {}
 
     if len(keywords_dict) == 0:
-        return
-
-    from script_db_handler import insert_substring_keyword_distance_batch, db_commit, substring_in_db, \
-        matched_string_in_db
+        return []
 
-    max_key_len = max([len(item) for item in keywords_dict])
+    keywords_by_len = group_keywords_by_length(keywords_dict)
+    max_key_len = max(keywords_by_len)
 
     text = copy.deepcopy(text.lower())
-    text_len = len(text)
 
-    for start_idx in range(text_len):
-        insert_list = []
-
-        if text[start_idx] == "<" or text[start_idx] == ">":
+    substrs_by_len = defaultdict(list)
+    for start_idx, end_idx in get_candidate_spans(text, max_key_len + LOCAL_DISTANCE_THR, keywords_by_len.keys(),
+                                                  token_aligned, include_last=False):
+        substr = text[start_idx: end_idx]
+        if substr.strip() == "":
             continue
-        for end_idx in range(start_idx, text_len):
-            if text[end_idx - 1] == "<" or text[end_idx - 1] == ">":
-                break
-            elif start_idx == end_idx:
-                continue
-            elif end_idx - start_idx > max_key_len + LOCAL_DISTANCE_THR:
-                break
-
-            substr = text[start_idx: end_idx]
-            if substr.strip() == "":
-                continue
-            elif substr in searched_strings:
-                continue
-            elif skip_substr and substring_in_db(db_cursor, substr):
-                searched_strings[substr] = 1
-                continue
-
+        elif substr in searched_strings:
+            continue
+        elif skip_substr is not None and skip_substr(substr):
             searched_strings[substr] = 1
+            continue
 
-            for lookup_text in keywords_dict:
-                lookup_len = len(lookup_text)
-                if lookup_len != len(substr):
-                    continue
-                elif skip_matched_string and matched_string_in_db(db_cursor, lookup_text):
-                    continue
-
-                keyword = keywords_dict[lookup_text]
+        searched_strings[substr] = 1
+        substrs_by_len[len(substr)].append(substr)
 
-                if lookup_len < LOCAL_SHORT_THR:
-                    lookup_text = " " + lookup_text + " "
-                    substr = " " + substr + " "
+    rows = []
+    for lookup_len in substrs_by_len:
+        lookup_texts = keywords_by_len[lookup_len]
+        if skip_lookup_text is not None:
+            lookup_texts = [item for item in lookup_texts if not skip_lookup_text(item)]
 
-                dist = levenshtein_distance(substr, lookup_text)
+        substrs = substrs_by_len[lookup_len]
+        for substr_idx, lookup_idx, dist in score_length_bucket(substrs, lookup_texts):
+            lookup_text = lookup_texts[lookup_idx]
+            rows.append((substrs[substr_idx], lookup_text.strip(), keywords_dict[lookup_text], dist))
 
-                lookup_text = lookup_text.strip()
-                if lookup_len < LOCAL_SHORT_THR:
-                    substr = substr[1:-1]
+    return rows
 
-                if dist > LOCAL_DISTANCE_THR or dist >= lookup_len:
-                    continue
 
-                insert_list.append((substr, lookup_text, keyword, dist))
+def build_string_distance(db_conn, db_cursor, text: str, keywords_dict: dict, skip_substr=False,
+                          skip_matched_string=False, update_existing=False, searched_strings=None,
+                          thread_num=0, token_aligned=False, insert_queue=None) -> None:
+    from script_db_handler import insert_substring_keyword_distance_batch, substring_in_db, matched_string_in_db
+
+    insert_list = get_string_distance_rows(
+        text, keywords_dict, token_aligned, searched_strings,
+        (lambda substr: substring_in_db(db_cursor, substr)) if skip_substr else None,
+        (lambda lookup_text: matched_string_in_db(db_cursor, lookup_text)) if skip_matched_string else None)
+
+    if insert_queue is not None:
+        if len(insert_list) > 0:
+            try:
+                insert_queue.put(insert_list, timeout=INSERT_QUEUE_TIMEOUT)
+            except Full:
+                raise RuntimeError("Thread {}: insert queue stayed full for {} s, the db writer is not running"
+                                   .format(thread_num, INSERT_QUEUE_TIMEOUT))
+        return
 
-        insert_substring_keyword_distance_batch(db_conn, db_cursor, insert_list, update_existing, thread_num=thread_num)
-        db_commit(db_conn)
+    insert_substring_keyword_distance_batch(db_conn, db_cursor, insert_list, update_existing, thread_num=thread_num)
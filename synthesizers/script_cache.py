@@ -0,0 +1,163 @@
+"""
+This is the public release of the code of our paper titled
+"Hermes: Unlocking Security Analysis of Cellular Network Protocols by Synthesizing Finite State Machines from Natural
+    Language Specifications" (USENIX Security '24)
+Author: Abdullah Al Ishtiaq
+Contact: abdullah.ishtiaq@psu.edu
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+      https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import hashlib
+import os
+import pickle
+import sqlite3
+from collections import OrderedDict
+
+CACHE_SNAPSHOT_VERSION = 1
+
+caches = {}
+
+
+class LRUCache:
+    def __init__(self, name: str, max_size: int, persistent=True):
+        self.name = name
+        self.max_size = max_size
+        self.persistent = persistent
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key) -> bool:
+        return key in self.data
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, key):
+        value = self.data[key]
+        self.data.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value) -> None:
+        self.data[key] = value
+        self.data.move_to_end(key)
+        while len(self.data) > self.max_size:
+            self.data.popitem(last=False)
+            self.evictions = self.evictions + 1
+
+    def get(self, key, default=None):
+        if key in self.data:
+            self.hits = self.hits + 1
+            return self[key]
+
+        self.misses = self.misses + 1
+        return default
+
+    def pop(self, key, default=None):
+        return self.data.pop(key, default)
+
+    def clear(self) -> None:
+        self.data.clear()
+
+    def items(self):
+        return self.data.items()
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups > 0 else 0.0
+        }
+
+
+def register_cache(name: str, max_size: int, persistent=True) -> LRUCache:
+    if name not in caches:
+        caches[name] = LRUCache(name, max_size, persistent)
+    return caches[name]
+
+
+def get_snapshot_key(filenames: list, extra_keys=None) -> str:
+    if extra_keys is None:
+        extra_keys = []
+
+    hasher = hashlib.sha256()
+    hasher.update(str(CACHE_SNAPSHOT_VERSION).encode())
+    for filename in filenames:
+        hasher.update(filename.encode())
+        if os.path.exists(filename):
+            with open(filename, 'rb') as snapshot_input_file:
+                hasher.update(hashlib.sha256(snapshot_input_file.read()).digest())
+    for extra_key in extra_keys:
+        hasher.update(str(extra_key).encode())
+    return hasher.hexdigest()
+
+
+def save_cache_snapshot(snapshot_filename: str, snapshot_key: str) -> None:
+    snapshot_conn = sqlite3.connect(snapshot_filename)
+    snapshot_cursor = snapshot_conn.cursor()
+    snapshot_cursor.execute("CREATE TABLE IF NOT EXISTS CacheSnapshotInfo (SnapshotKey TEXT NOT NULL)")
+    snapshot_cursor.execute("CREATE TABLE IF NOT EXISTS CacheSnapshot (CacheName TEXT NOT NULL, "
+                            "Position INTEGER NOT NULL, Key BLOB NOT NULL, Value BLOB NOT NULL)")
+    snapshot_cursor.execute("DELETE FROM CacheSnapshotInfo")
+    snapshot_cursor.execute("DELETE FROM CacheSnapshot")
+    snapshot_cursor.execute("INSERT INTO CacheSnapshotInfo (SnapshotKey) VALUES (?)", (snapshot_key,))
+
+    for name, cache in caches.items():
+        if not cache.persistent:
+            continue
+        values = [(name, position, pickle.dumps(key), pickle.dumps(value))
+                  for position, (key, value) in enumerate(cache.items())]
+        snapshot_cursor.executemany("INSERT INTO CacheSnapshot (CacheName, Position, Key, Value) "
+                                    "VALUES (?, ?, ?, ?)", values)
+
+    snapshot_conn.commit()
+    snapshot_cursor.close()
+    snapshot_conn.close()
+
+
+def load_cache_snapshot(snapshot_filename: str, snapshot_key: str) -> bool:
+    if not os.path.exists(snapshot_filename):
+        return False
+
+    snapshot_conn = sqlite3.connect(snapshot_filename)
+    snapshot_cursor = snapshot_conn.cursor()
+    try:
+        snapshot_cursor.execute("SELECT SnapshotKey FROM CacheSnapshotInfo")
+        db_result = snapshot_cursor.fetchall()
+        if len(db_result) == 0 or db_result[0][0] != snapshot_key:
+            return False
+
+        snapshot_cursor.execute("SELECT CacheName, Key, Value FROM CacheSnapshot ORDER BY CacheName, Position")
+        for name, key, value in snapshot_cursor:
+            if name in caches and caches[name].persistent:
+                caches[name][pickle.loads(key)] = pickle.loads(value)
+        return True
+    except sqlite3.DatabaseError:
+        return False
+    finally:
+        snapshot_cursor.close()
+        snapshot_conn.close()
+
+
+def print_cache_stats() -> None:
+    for name, cache in caches.items():
+        stats = cache.get_stats()
+        print("CACHE {} : size {}/{}, hits {}, misses {}, evictions {}, hit rate {:.2f}".format(
+            name, stats["size"], stats["max_size"], stats["hits"], stats["misses"], stats["evictions"],
+            stats["hit_rate"]))
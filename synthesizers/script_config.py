@@ -25,5 +25,13 @@ common_definitions = "common-defs.json"
 saved_nas_definitions = "defs-saved.json"
 nas_definitions = "defs.json"
 keyword_db_table = "SubstringKeywordDistance"
+keyword_db_best_table = "SubstringBestMatch"
+cache_snapshot_file = "cache-snapshot.sqlite"
+parse_cache_file = "parse-cache.sqlite"
+
+# one CoreNLP server is started per port from corenlp_base_port
+corenlp_host = "http://localhost"
+corenlp_base_port = 9001
+corenlp_num_servers = 1
 
 
@@ -19,9 +19,19 @@ limitations under the License.
 """
 
 import copy
+from bisect import bisect_right
 
 from script_helpers import get_text_type, isHeader
-from script_text2id import get_ids_from_text_db
+from script_text2id import get_ids_from_text_db, get_keyword_match_state, is_same_keyword_match_state, \
+    get_keyword_match_changes
+from script_build_string_keyword_distance import get_string_distance_rows
+
+INCREMENTAL_PARAGRAPH_CONTEXT = True
+VERIFY_PARAGRAPH_CONTEXT = False
+LINE_BREAK = "__LINE_BREAK__"
+CONTEXT_TYPES = ["agent", "message", "var", "event", "procedure", "timer", "msg_field", "counter", "directive"]
+
+paragraph_context_mismatches = []
 
 
 def init_context() -> None:
@@ -44,6 +54,8 @@ def init_context() -> None:
         "last_directive": "",
         "last_counter": ""
     }
+    script_context_config.header_context = []
+    reset_paragraph_context()
 
 
 def clear_context() -> None:
@@ -59,66 +71,125 @@ def clear_context() -> None:
     script_context_config.global_context["last_chanUM"] = ""
 
 
+# a copy of the global context that shares its values; sets and lists are copied when first read, as callers may
+# change them in place, while the global context only ever replaces them
+class ContextSnapshot(dict):
+    def __init__(self, context: dict):
+        super().__init__(context)
+        self.owned_keys = set()
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if key not in self.owned_keys and isinstance(value, (set, list, dict)):
+            value = copy.deepcopy(value)
+            dict.__setitem__(self, key, value)
+            self.owned_keys.add(key)
+        return value
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, value)
+        self.owned_keys.add(key)
+
+    def get(self, key, default=None):
+        if key not in self:
+            return default
+        return self[key]
+
+    # overriding __iter__ also makes dict() and ** read the values through __getitem__
+    def __iter__(self):
+        return dict.__iter__(self)
+
+    def values(self):
+        return [self[key] for key in self]
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key, *default):
+        if key not in self:
+            return dict.pop(self, key, *default)
+        value = self[key]
+        dict.__delitem__(self, key)
+        self.owned_keys.discard(key)
+        return value
+
+    def popitem(self):
+        if len(self) == 0:
+            raise KeyError("popitem(): dictionary is empty")
+        key = list(dict.keys(self))[-1]
+        return key, self.pop(key)
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        self.owned_keys.discard(key)
+
+    def copy(self):
+        snapshot = ContextSnapshot({})
+        dict.update(snapshot, dict.items(self))
+        snapshot.owned_keys = set(self.owned_keys)
+        return snapshot
+
+
 def get_context_copy() -> dict:
     import script_context_config
-    return copy.deepcopy(script_context_config.global_context)
+    return ContextSnapshot(script_context_config.global_context)
 
 
 def update_context_key_value(key: str, value) -> None:
     import script_context_config
+    if isinstance(value, (set, list, dict)):
+        value = copy.deepcopy(value)
     script_context_config.global_context[key] = value
 
 
-def update_context_with_text(global_context, para: str, text2id_dict, ignore_list=None) -> None:
+# the keywords with their context types, in text order; a keyword repeated in the text is classified once
+def get_classified_keywords(keywords_list: list, text2id_dict) -> list:
+    keyword_types = {}
+    classified_keywords = []
+    for item in keywords_list:
+        if item not in keyword_types:
+            keyword_types[item] = [key_type for key_type in get_text_type(item, text2id_dict)
+                                   if key_type in CONTEXT_TYPES]
+        classified_keywords.append((item, keyword_types[item]))
+    return classified_keywords
+
+
+# the last keyword of every context type, in text order
+def get_last_seen_types(keywords_list: list, text2id_dict) -> dict:
+    last_seen = {}
+    for item, key_types in get_classified_keywords(keywords_list, text2id_dict):
+        for key_type in key_types:
+            last_seen[key_type] = item
+    return last_seen
+
+
+def apply_last_seen_types(global_context, last_seen: dict) -> None:
+    for key_type in CONTEXT_TYPES:
+        if key_type in last_seen:
+            global_context["last_" + key_type] = last_seen[key_type]
+    if "message" in last_seen:
+        global_context["last_message_list"] = [last_seen["message"]]
+
+
+def get_text_last_seen_types(para: str, text2id_dict, ignore_list=None) -> dict:
     if ignore_list is None:
         ignore_list = []
 
     keywords_list = get_ids_from_text_db(para, text2id_dict["all2id"], 2, ignore_list)
-    keywords_list.reverse()
-    keywords_list = [item[0] for item in keywords_list]
+    return get_last_seen_types([item[0] for item in keywords_list], text2id_dict)
 
-    messages = []
-
-    for item in keywords_list:
-        if "agent" in get_text_type(item, text2id_dict):
-            global_context["last_agent"] = item
-            break
-    for item in keywords_list:
-        if "message" in get_text_type(item, text2id_dict):
-            messages.append(item)
-            global_context["last_message"] = item
-            break
-    for item in keywords_list:
-        if "var" in get_text_type(item, text2id_dict):
-            global_context["last_var"] = item
-            break
-    for item in keywords_list:
-        if "event" in get_text_type(item, text2id_dict):
-            global_context["last_event"] = item
-            break
-    for item in keywords_list:
-        if "procedure" in get_text_type(item, text2id_dict):
-            global_context["last_procedure"] = item
-            break
-    for item in keywords_list:
-        if "timer" in get_text_type(item, text2id_dict):
-            global_context["last_timer"] = item
-            break
-    for item in keywords_list:
-        if "msg_field" in get_text_type(item, text2id_dict):
-            global_context["last_msg_field"] = item
-            break
-    for item in keywords_list:
-        if "counter" in get_text_type(item, text2id_dict):
-            global_context["last_counter"] = item
-            break
-    for item in keywords_list:
-        if "directive" in get_text_type(item, text2id_dict):
-            global_context["last_directive"] = item
-            break
 
-    if len(messages) > 0:
-        global_context["last_message_list"] = messages
+def update_context_with_text(global_context, para: str, text2id_dict, ignore_list=None) -> None:
+    apply_last_seen_types(global_context, get_text_last_seen_types(para, text2id_dict, ignore_list))
 
 
 def update_global_context_with_text(para: str, text2id_dict, ignore_list=None) -> None:
@@ -126,6 +197,170 @@ def update_global_context_with_text(para: str, text2id_dict, ignore_list=None) -
     update_context_with_text(script_context_config.global_context, para, text2id_dict, ignore_list)
 
 
+# the keywords of all parts are classified as one stream, the same as updating the context with each part in turn
+def update_global_context_with_text_parts(text_parts: list, text2id_dict, ignore_list=None) -> None:
+    import script_context_config
+    if ignore_list is None:
+        ignore_list = []
+
+    keywords_list = []
+    for text_part in text_parts:
+        keywords_list.extend(item[0] for item in get_ids_from_text_db(text_part, text2id_dict["all2id"], 2,
+                                                                      ignore_list))
+    apply_last_seen_types(script_context_config.global_context, get_last_seen_types(keywords_list, text2id_dict))
+
+
+def reset_paragraph_context() -> None:
+    import script_context_config
+    script_context_config.paragraph_context = {
+        "text": "",
+        "match_state": None,
+        "chunks": [],
+        "chunk_starts": [],
+        "chunk_seen": [],
+        "followed_seen": [],
+        "last_chunk_seen": {},
+        "last_seen": {}
+    }
+
+
+# a chunk of the paragraph is never matched across the line break that follows it
+def get_followed_chunk_seen(chunk_text: str, text2id_dict, ignore_list: list) -> dict:
+    keywords_list = get_ids_from_text_db(chunk_text + LINE_BREAK, text2id_dict["all2id"], 2, ignore_list)
+    return get_last_seen_types([item[0] for item in keywords_list if item[2] < len(chunk_text)], text2id_dict)
+
+
+# a chunk is matched once as the last chunk and once more, with only the line break after it, when the next line comes
+# in; followed_seen holds what all chunks up to each one leave seen
+def add_paragraph_chunk(state: dict, chunk_text: str, text2id_dict, ignore_list: list) -> None:
+    if len(state["chunks"]) > 0:
+        state["chunk_seen"].append(get_followed_chunk_seen(state["chunks"][-1], text2id_dict, ignore_list))
+        followed_seen = dict(state["followed_seen"][-1]) if len(state["followed_seen"]) > 0 else {}
+        followed_seen.update(state["chunk_seen"][-1])
+        state["followed_seen"].append(followed_seen)
+
+    state["chunks"].append(chunk_text)
+    state["chunk_starts"].append(len(state["text"]))
+    state["text"] = state["text"] + chunk_text
+    state["last_chunk_seen"] = get_text_last_seen_types(chunk_text, text2id_dict, ignore_list)
+    state["last_seen"] = dict(state["followed_seen"][-1]) if len(state["followed_seen"]) > 0 else {}
+    state["last_seen"].update(state["last_chunk_seen"])
+
+
+# a changed match is one of a substring of the text; a new table key only matters to a match with it as the matched
+# string, which is a substring of the same length within keyword distance of it
+def is_chunk_affected(chunk_text: str, changed_substrings: set, new_keys: list) -> bool:
+    text = (chunk_text + LINE_BREAK).lower()
+    if any(substring in text for substring in changed_substrings):
+        return True
+    # the rows of a text leave its last span out, the space after it keeps it in
+    return len(new_keys) > 0 and len(get_string_distance_rows(text + " ", dict.fromkeys(new_keys, ""))) > 0
+
+
+# only the chunks a change can reach are matched again, with the line break after them, and the seen types after them
+# are rebuilt
+def rematch_paragraph_chunks(state: dict, changes: tuple, text2id_dict, ignore_list: list) -> None:
+    changed_substrings, new_keys = changes
+    first_chunk_idx = None
+    for chunk_idx, chunk_text in enumerate(state["chunks"]):
+        if not is_chunk_affected(chunk_text, changed_substrings, new_keys):
+            continue
+        if first_chunk_idx is None:
+            first_chunk_idx = chunk_idx
+
+        if chunk_idx < len(state["chunk_seen"]):
+            state["chunk_seen"][chunk_idx] = get_followed_chunk_seen(chunk_text, text2id_dict, ignore_list)
+        else:
+            state["last_chunk_seen"] = get_text_last_seen_types(chunk_text, text2id_dict, ignore_list)
+
+    if first_chunk_idx is None:
+        return
+
+    for chunk_idx in range(first_chunk_idx, len(state["chunk_seen"])):
+        followed_seen = dict(state["followed_seen"][chunk_idx - 1]) if chunk_idx > 0 else {}
+        followed_seen.update(state["chunk_seen"][chunk_idx])
+        state["followed_seen"][chunk_idx] = followed_seen
+    state["last_seen"] = dict(state["followed_seen"][-1]) if len(state["followed_seen"]) > 0 else {}
+    state["last_seen"].update(state["last_chunk_seen"])
+
+
+# only the text added since the last call is matched; when keywords came in since, only the chunks they can change
+# are matched again, and the whole paragraph when it was restarted or the index was cleared
+def sync_paragraph_context(paragraph: str, text2id_dict, ignore_list: list) -> bool:
+    import script_context_config
+    if not INCREMENTAL_PARAGRAPH_CONTEXT or "<" in paragraph or ">" in paragraph:
+        return False
+
+    state = script_context_config.paragraph_context
+    match_state = get_keyword_match_state(text2id_dict["all2id"])
+    if match_state is None:
+        return False
+    if not paragraph.startswith(state["text"]):
+        reset_paragraph_context()
+        state = script_context_config.paragraph_context
+    elif not is_same_keyword_match_state(match_state, state["match_state"]):
+        changes = get_keyword_match_changes(state["match_state"], match_state)
+        if changes is None:
+            reset_paragraph_context()
+            state = script_context_config.paragraph_context
+        else:
+            rematch_paragraph_chunks(state, changes, text2id_dict, ignore_list)
+
+    new_text = paragraph[len(state["text"]):]
+    if new_text != "" and not new_text.startswith(LINE_BREAK):
+        reset_paragraph_context()
+        return False
+
+    for line_text in new_text.split(LINE_BREAK)[1:]:
+        add_paragraph_chunk(state, LINE_BREAK + line_text, text2id_dict, ignore_list)
+    state["match_state"] = get_keyword_match_state(text2id_dict["all2id"])
+    return True
+
+
+def update_global_context_with_paragraph(paragraph: str, text2id_dict, ignore_list=None) -> bool:
+    import script_context_config
+    if ignore_list is None:
+        ignore_list = []
+    if not sync_paragraph_context(paragraph, text2id_dict, ignore_list):
+        return False
+
+    global_context = script_context_config.global_context
+    if VERIFY_PARAGRAPH_CONTEXT:
+        scanned_context = copy.deepcopy(global_context)
+        update_context_with_text(scanned_context, paragraph, text2id_dict, ignore_list)
+
+    apply_last_seen_types(global_context, script_context_config.paragraph_context["last_seen"])
+
+    if VERIFY_PARAGRAPH_CONTEXT and scanned_context != global_context:
+        print("PARAGRAPH CONTEXT MISMATCH :", paragraph)
+        paragraph_context_mismatches.append((paragraph, scanned_context, copy.deepcopy(global_context)))
+    return True
+
+
+# None when the prefix is not one of the synced paragraph
+def get_paragraph_prefix_last_seen(line_part: str, text2id_dict, ignore_list=None):
+    import script_context_config
+    state = script_context_config.paragraph_context
+    if not INCREMENTAL_PARAGRAPH_CONTEXT or len(state["chunks"]) == 0 or not state["text"].startswith(line_part):
+        return None
+    if ignore_list is None:
+        ignore_list = []
+    if not sync_paragraph_context(state["text"], text2id_dict, ignore_list):
+        return None
+    state = script_context_config.paragraph_context
+    if len(state["chunks"]) == 0:
+        return None
+
+    chunk_idx = bisect_right(state["chunk_starts"], len(line_part)) - 1
+    chunk_start = state["chunk_starts"][chunk_idx]
+    if len(line_part) - chunk_start < len(LINE_BREAK):
+        return None
+
+    last_seen = dict(state["followed_seen"][chunk_idx - 1]) if chunk_idx > 0 else {}
+    last_seen.update(get_text_last_seen_types(line_part[chunk_start:], text2id_dict, ignore_list))
+    return last_seen
+
+
 def update_header_context(text: str):
     import script_context_config
     header_context = script_context_config.header_context
@@ -183,7 +418,20 @@ def get_header_context_texts() -> list:
 def get_line_part_context(line_part: str, text2id_dict, ignore_list=None):
     new_context = get_context_copy()
 
-    update_context_with_text(new_context, line_part, text2id_dict, ignore_list)
+    last_seen = get_paragraph_prefix_last_seen(line_part, text2id_dict, ignore_list)
+    if last_seen is None:
+        update_context_with_text(new_context, line_part, text2id_dict, ignore_list)
+        return new_context
+
+    if VERIFY_PARAGRAPH_CONTEXT:
+        scanned_context = copy.deepcopy(new_context)
+        update_context_with_text(scanned_context, line_part, text2id_dict, ignore_list)
+
+    apply_last_seen_types(new_context, last_seen)
+
+    if VERIFY_PARAGRAPH_CONTEXT and scanned_context != new_context:
+        print("PARAGRAPH CONTEXT MISMATCH :", line_part)
+        paragraph_context_mismatches.append((line_part, scanned_context, copy.deepcopy(new_context)))
     return new_context
 
 
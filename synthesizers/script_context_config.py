@@ -20,3 +20,4 @@ limitations under the License.
 
 global_context = {}
 header_context = []
+paragraph_context = {}
@@ -0,0 +1,114 @@
+"""
+This is the public release of the code of our paper titled
+"Hermes: Unlocking Security Analysis of Cellular Network Protocols by Synthesizing Finite State Machines from Natural
+    Language Specifications" (USENIX Security '24)
+Author: Abdullah Al Ishtiaq
+Contact: abdullah.ishtiaq@psu.edu
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+      https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from requests import ReadTimeout, ConnectionError as RequestsConnectionError
+from stanza.server import CoreNLPClient, TimeoutException, AnnotationException
+
+import script_config
+
+
+def get_corenlp_endpoints() -> list:
+    return [script_config.corenlp_host + ":" + str(script_config.corenlp_base_port + server_idx)
+            for server_idx in range(script_config.corenlp_num_servers)]
+
+
+# timeouts and unreachable servers are worth another instance, errors about the text itself are not
+def is_retryable(exception: Exception) -> bool:
+    if isinstance(exception, (TimeoutException, ReadTimeout)):
+        return True
+    if isinstance(exception, AnnotationException):
+        return isinstance(exception.__cause__, RequestsConnectionError) or "timed out" in str(exception).lower()
+    return False
+
+
+class CoreNLPEndpoint:
+    def __init__(self, endpoint: str, client):
+        self.endpoint = endpoint
+        self.client = client
+        self.in_flight = 0
+        self.requests = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.failures = 0
+        self.timeouts = 0
+
+
+# one client per local CoreNLP server, a request goes to the least busy server and a timed out one is retried on the next
+class CoreNLPPool:
+    def __init__(self, endpoints: list, annotators: list, properties: dict, timeout: int):
+        self.endpoints = [CoreNLPEndpoint(endpoint, CoreNLPClient(annotators=annotators, properties=properties,
+                                                                  timeout=timeout, endpoint=endpoint,
+                                                                  start_server='DONT_START'))
+                          for endpoint in endpoints]
+        self.lock = threading.Lock()
+
+    def acquire_endpoint(self, tried: list) -> CoreNLPEndpoint:
+        with self.lock:
+            candidates = [endpoint for endpoint in self.endpoints if endpoint not in tried]
+            endpoint = min(candidates, key=lambda item: (item.in_flight, item.requests))
+            endpoint.in_flight = endpoint.in_flight + 1
+            return endpoint
+
+    def release_endpoint(self, endpoint: CoreNLPEndpoint, elapsed: float, exception=None):
+        with self.lock:
+            endpoint.in_flight = endpoint.in_flight - 1
+            endpoint.requests = endpoint.requests + 1
+            endpoint.total_time = endpoint.total_time + elapsed
+            endpoint.max_time = max(endpoint.max_time, elapsed)
+            if exception is not None:
+                endpoint.failures = endpoint.failures + 1
+                if is_retryable(exception):
+                    endpoint.timeouts = endpoint.timeouts + 1
+
+    def annotate(self, text: str, annotators=None, properties=None):
+        tried = []
+        while True:
+            endpoint = self.acquire_endpoint(tried)
+            tried.append(endpoint)
+            start_time = time.perf_counter()
+            try:
+                ann = endpoint.client.annotate(text, annotators=annotators, properties=properties)
+            except Exception as e:
+                self.release_endpoint(endpoint, time.perf_counter() - start_time, e)
+                if not is_retryable(e) or len(tried) == len(self.endpoints):
+                    raise
+                continue
+
+            self.release_endpoint(endpoint, time.perf_counter() - start_time)
+            return ann
+
+    # results in the order of items, one thread per server
+    def map_concurrently(self, function, items: list) -> list:
+        if len(self.endpoints) == 1 or len(items) < 2:
+            return [function(item) for item in items]
+
+        with ThreadPoolExecutor(max_workers=min(len(self.endpoints), len(items))) as executor:
+            return list(executor.map(function, items))
+
+    def print_stats(self):
+        for endpoint in self.endpoints:
+            print("CORENLP {} : {} requests, avg {:.3f}s, max {:.3f}s, {} failed, {} of them timed out or unreachable".format(
+                endpoint.endpoint, endpoint.requests,
+                endpoint.total_time / endpoint.requests if endpoint.requests > 0 else 0.0, endpoint.max_time,
+                endpoint.failures, endpoint.timeouts))
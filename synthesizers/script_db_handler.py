@@ -24,19 +24,41 @@ import sqlite3
 from sqlite3 import OperationalError, IntegrityError, DataError
 
 import script_config
+from script_cache import register_cache
 
 INF = 9999
 KEYWORD_DB_TABLE = script_config.keyword_db_table
-min_keyword_dist_cache = {}
+KEYWORD_DB_BEST_TABLE = script_config.keyword_db_best_table
+DB_BUSY_TIMEOUT = 60.0
+MAX_TEXT_LEN = 180
+MAX_SQL_VARIABLES = 900
+MIN_KEYWORD_DIST_CACHE_SIZE = 200000
+MAX_INSERT_RETRIES = 12
+min_keyword_dist_cache = register_cache("min_keyword_dist", MIN_KEYWORD_DIST_CACHE_SIZE)
 
 CONN_CLOSED = True
 
+# PRAGMA user_version of hermes.sqlite
+DB_VERSION_INDEXED = 1
+DB_VERSION_BEST_MATCH = 2
+BEST_MATCH_UPSERT_SQL = "INSERT INTO {0} (Substring, MatchedString, Keyword, Distance, MatchedStringLen) " \
+                        "SELECT Substring, MatchedString, Keyword, Distance, MatchedStringLen FROM {1} " \
+                        "WHERE Substring = ? ORDER BY Distance, MatchedStringLen DESC, MatchedString LIMIT 1 " \
+                        "ON CONFLICT (Substring) DO UPDATE SET MatchedString = excluded.MatchedString, " \
+                        "Keyword = excluded.Keyword, Distance = excluded.Distance, " \
+                        "MatchedStringLen = excluded.MatchedStringLen".format(KEYWORD_DB_BEST_TABLE, KEYWORD_DB_TABLE)
+
 
 def get_new_conn_cursor():
     global CONN_CLOSED
-    db_conn = sqlite3.connect("hermes.sqlite")
+    db_conn = sqlite3.connect("hermes.sqlite", timeout=DB_BUSY_TIMEOUT)
     db_cursor = db_conn.cursor()
 
+    db_cursor.execute("PRAGMA journal_mode = WAL;")
+    db_cursor.execute("PRAGMA synchronous = NORMAL;")
+    db_cursor.execute("PRAGMA temp_store = MEMORY;")
+    db_cursor.execute("PRAGMA cache_size = -65536;")
+
     try:
         db_cursor.execute("CREATE TABLE {} (Substring TEXT NOT NULL, MatchedString TEXT NOT NULL, "
                           "Keyword TEXT NOT NULL, Distance INTEGER NOT NULL, MatchedStringLen INTEGER NOT NULL, "
@@ -44,10 +66,60 @@ def get_new_conn_cursor():
     except OperationalError:
         pass
 
+    migrate_db(db_conn, db_cursor)
+
     CONN_CLOSED = False
     return db_conn, db_cursor
 
 
+def get_db_version(db_cursor) -> int:
+    db_cursor.execute("PRAGMA user_version;")
+    return db_cursor.fetchone()[0]
+
+
+def set_db_version(db_conn, db_cursor, version: int):
+    db_cursor.execute("PRAGMA user_version = {};".format(int(version)))
+    db_commit(db_conn)
+
+
+def migrate_db(db_conn, db_cursor):
+    version = get_db_version(db_cursor)
+
+    if version < DB_VERSION_INDEXED:
+        db_cursor.execute("CREATE INDEX IF NOT EXISTS {0}Lookup ON {0} (Substring, Distance, MatchedStringLen DESC, "
+                          "MatchedString, Keyword);".format(KEYWORD_DB_TABLE))
+        db_cursor.execute("CREATE TABLE IF NOT EXISTS {} (Substring TEXT NOT NULL PRIMARY KEY, "
+                          "MatchedString TEXT NOT NULL, Keyword TEXT NOT NULL, Distance INTEGER NOT NULL, "
+                          "MatchedStringLen INTEGER NOT NULL) WITHOUT ROWID;".format(KEYWORD_DB_BEST_TABLE))
+        db_cursor.execute("SELECT 1 FROM {} LIMIT 1;".format(KEYWORD_DB_TABLE))
+        if db_cursor.fetchone() is None:
+            version = DB_VERSION_BEST_MATCH
+        else:
+            version = DB_VERSION_INDEXED
+        set_db_version(db_conn, db_cursor, version)
+
+
+def rebuild_best_match_table(db_conn, db_cursor):
+    db_cursor.execute("DELETE FROM {};".format(KEYWORD_DB_BEST_TABLE))
+    db_cursor.execute("INSERT INTO {0} (Substring, MatchedString, Keyword, Distance, MatchedStringLen) "
+                      "SELECT Substring, MatchedString, Keyword, Distance, MatchedStringLen FROM "
+                      "(SELECT *, ROW_NUMBER() OVER (PARTITION BY Substring "
+                      "ORDER BY Distance, MatchedStringLen DESC, MatchedString) AS MatchRank FROM {1}) "
+                      "WHERE MatchRank = 1;".format(KEYWORD_DB_BEST_TABLE, KEYWORD_DB_TABLE))
+    set_db_version(db_conn, db_cursor, DB_VERSION_BEST_MATCH)
+
+
+def get_db_signature(db_cursor) -> str:
+    db_cursor.execute("SELECT max(rowid) FROM {};".format(KEYWORD_DB_TABLE))
+    max_rowid = db_cursor.fetchone()[0]
+    return "{}:{}:{}".format(KEYWORD_DB_TABLE, max_rowid, get_db_version(db_cursor))
+
+
+# read from the db every time, another connection or process may have changed it
+def check_best_match_ready(db_cursor) -> bool:
+    return get_db_version(db_cursor) >= DB_VERSION_BEST_MATCH
+
+
 def db_commit(db_conn):
     db_conn.commit()
 
@@ -66,7 +138,7 @@ def check_conn_closed():
 
 def update_substring_keyword_distance(db_conn, db_cursor, substring: str, matched_string: str, keyword: str,
                                       distance: int):
-    if len(substring) > 180 or len(matched_string) > 180 or len(keyword) > 180:
+    if len(substring) > MAX_TEXT_LEN or len(matched_string) > MAX_TEXT_LEN or len(keyword) > MAX_TEXT_LEN:
         print("Length too long for :", substring, matched_string, keyword, distance)
         return
 
@@ -74,6 +146,8 @@ def update_substring_keyword_distance(db_conn, db_cursor, substring: str, matche
     val = (keyword, distance, substring, matched_string)
     try:
         db_cursor.execute(sql, val)
+        db_cursor.execute(BEST_MATCH_UPSERT_SQL, (substring,))
+        min_keyword_dist_cache.pop(substring)
     except OperationalError:
         print("Sleeping for a bit...")
         time.sleep(5.0)
@@ -82,7 +156,7 @@ def update_substring_keyword_distance(db_conn, db_cursor, substring: str, matche
 
 def insert_substring_keyword_distance(db_conn, db_cursor, substring: str, matched_string: str, keyword: str,
                                       distance: int, force_update=False, thread_num=0):
-    if len(substring) > 180 or len(matched_string) > 180 or len(keyword) > 180:
+    if len(substring) > MAX_TEXT_LEN or len(matched_string) > MAX_TEXT_LEN or len(keyword) > MAX_TEXT_LEN:
         print("Length too long for :", substring, matched_string, keyword, distance)
         return
 
@@ -92,6 +166,8 @@ def insert_substring_keyword_distance(db_conn, db_cursor, substring: str, matche
 
     try:
         db_cursor.execute(sql, val)
+        db_cursor.execute(BEST_MATCH_UPSERT_SQL, (substring,))
+        min_keyword_dist_cache.pop(substring)
     except IntegrityError:
         if force_update:
             update_substring_keyword_distance(db_conn, db_cursor, substring, matched_string, keyword, distance)
@@ -107,10 +183,43 @@ def insert_substring_keyword_distance(db_conn, db_cursor, substring: str, matche
 
 
 def insert_substring_keyword_distance_batch(db_conn, db_cursor, insert_list, force_update=False, thread_num=0):
-    for item in insert_list:
-        insert_substring_keyword_distance(db_conn, db_cursor, item[0], item[1], item[2], item[3],
-                                          force_update, thread_num=thread_num)
-    db_commit(db_conn)
+    values = []
+    for substring, matched_string, keyword, distance in insert_list:
+        if len(substring) > MAX_TEXT_LEN or len(matched_string) > MAX_TEXT_LEN or len(keyword) > MAX_TEXT_LEN:
+            print("Length too long for :", substring, matched_string, keyword, distance)
+            continue
+        values.append((substring, matched_string, keyword, distance, len(matched_string)))
+
+    if len(values) == 0:
+        return
+    substrings = list(dict.fromkeys(value[0] for value in values))
+
+    if force_update:
+        sql = "INSERT INTO {} (Substring, MatchedString, Keyword, Distance, MatchedStringLen) " \
+              "VALUES (?, ?, ?, ?, ?) " \
+              "ON CONFLICT (Substring, MatchedString) " \
+              "DO UPDATE SET Keyword = excluded.Keyword, Distance = excluded.Distance".format(KEYWORD_DB_TABLE)
+    else:
+        sql = "INSERT OR IGNORE INTO {} (Substring, MatchedString, Keyword, Distance, MatchedStringLen) " \
+              "VALUES (?, ?, ?, ?, ?)".format(KEYWORD_DB_TABLE)
+
+    for attempt in range(MAX_INSERT_RETRIES):
+        try:
+            db_cursor.executemany(sql, values)
+            db_cursor.executemany(BEST_MATCH_UPSERT_SQL, [(substring,) for substring in substrings])
+            db_commit(db_conn)
+            # a cached miss would hide the rows just written
+            for substring in substrings:
+                min_keyword_dist_cache.pop(substring)
+            return
+        except OperationalError:
+            db_conn.rollback()
+            if attempt == MAX_INSERT_RETRIES - 1:
+                print("Thread {}: Giving up after {} attempts".format(thread_num, MAX_INSERT_RETRIES))
+                raise
+            print("Thread {}: Sleeping for a bit...".format(thread_num))
+            time.sleep(5.0)
+            print("Thread {}: Resuming...".format(thread_num))
 
 
 def lookup_substring_keyword_distance(db_cursor, substring: str, matched_string: str) -> (str, int):
@@ -126,20 +235,24 @@ def lookup_substring_keyword_distance(db_cursor, substring: str, matched_string:
 
 
 def get_min_keyword_distance(db_cursor, substring: str) -> (str, str, int):
-    if substring in min_keyword_dist_cache:
-        return min_keyword_dist_cache[substring]
+    cached_result = min_keyword_dist_cache.get(substring)
+    if cached_result is not None:
+        return cached_result
 
-    sql = "select * from {} " \
-          "where Substring = ? " \
-          "and Distance = (select min(Distance) from {} where Substring = ?) " \
-          "order by MatchedStringLen DESC " \
-          "limit 1".format(KEYWORD_DB_TABLE, KEYWORD_DB_TABLE)
-    val = (substring, substring)
+    if check_best_match_ready(db_cursor):
+        sql = "select MatchedString, Keyword, Distance from {} " \
+              "where Substring = ?".format(KEYWORD_DB_BEST_TABLE)
+    else:
+        sql = "select MatchedString, Keyword, Distance from {} " \
+              "where Substring = ? " \
+              "order by Distance, MatchedStringLen DESC, MatchedString " \
+              "limit 1".format(KEYWORD_DB_TABLE)
+    val = (substring,)
     db_cursor.execute(sql, val)
     db_result = db_cursor.fetchall()
 
     if len(db_result) > 0:
-        result = (db_result[0][1], db_result[0][2], db_result[0][3])
+        result = (db_result[0][0], db_result[0][1], db_result[0][2])
     else:
         result = ("", "", INF)
 
@@ -147,6 +260,50 @@ def get_min_keyword_distance(db_cursor, substring: str) -> (str, str, int):
     return result
 
 
+def get_min_keyword_distance_batch(db_cursor, substrings) -> dict:
+    results = {}
+    missing = []
+    for substring in dict.fromkeys(substrings):
+        cached_result = min_keyword_dist_cache.get(substring)
+        if cached_result is not None:
+            results[substring] = cached_result
+        else:
+            missing.append(substring)
+
+    best_match_ready = len(missing) > 0 and check_best_match_ready(db_cursor)
+    for chunk_start in range(0, len(missing), MAX_SQL_VARIABLES):
+        chunk = missing[chunk_start: chunk_start + MAX_SQL_VARIABLES]
+        placeholders = ", ".join(["?"] * len(chunk))
+        if best_match_ready:
+            sql = "select Substring, MatchedString, Keyword, Distance from {} " \
+                  "where Substring in ({})".format(KEYWORD_DB_BEST_TABLE, placeholders)
+        else:
+            sql = "select Substring, MatchedString, Keyword, Distance from {} " \
+                  "where Substring in ({}) " \
+                  "order by Substring, Distance, MatchedStringLen DESC, MatchedString".format(KEYWORD_DB_TABLE,
+                                                                                             placeholders)
+        db_cursor.execute(sql, chunk)
+        for substring, matched_string, keyword, distance in db_cursor:
+            if substring not in results:
+                results[substring] = (matched_string, keyword, distance)
+
+    for substring in missing:
+        if substring not in results:
+            results[substring] = ("", "", INF)
+        min_keyword_dist_cache[substring] = results[substring]
+
+    return results
+
+
+def get_substring_lengths(db_cursor) -> set:
+    if check_best_match_ready(db_cursor):
+        sql = "select distinct length(Substring) from {}".format(KEYWORD_DB_BEST_TABLE)
+    else:
+        sql = "select distinct length(Substring) from {}".format(KEYWORD_DB_TABLE)
+    db_cursor.execute(sql)
+    return set(row[0] for row in db_cursor)
+
+
 def substring_in_db(db_cursor, substring: str) -> bool:
     sql = "select * from {} " \
           "where Substring = ? " \
@@ -173,6 +330,8 @@ def delete_matched_string(db_conn, db_cursor, matched_string: str):
     val = (matched_string,)
     try:
         db_cursor.execute(sql, val)
+        if check_best_match_ready(db_cursor):
+            set_db_version(db_conn, db_cursor, DB_VERSION_INDEXED)
     except OperationalError:
         print("Sleeping for a bit...")
         time.sleep(5.0)
@@ -0,0 +1,145 @@
+"""
+This is the public release of the code of our paper titled
+"Hermes: Unlocking Security Analysis of Cellular Network Protocols by Synthesizing Finite State Machines from Natural
+    Language Specifications" (USENIX Security '24)
+Author: Abdullah Al Ishtiaq
+Contact: abdullah.ishtiaq@psu.edu
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+      https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import datetime
+import hashlib
+import json
+import os
+import pickle
+
+from script_helpers import get_str_stem
+from keywords_preprocess import preprocess_keywords
+
+DEFS_ARTIFACT_VERSION = 1
+
+
+def get_file_hash(filename: str) -> str:
+    with open(filename, 'rb') as hash_input_file:
+        return hashlib.sha256(hash_input_file.read()).hexdigest()
+
+
+def get_artifact_filename(defs_filename: str) -> str:
+    return os.path.splitext(defs_filename)[0] + "-compiled.pickle"
+
+
+def normalize_text_item(text_item: str, split_colon: bool) -> str:
+    text_item = (text_item.lower().replace("/", " / ").replace(",", " , ").replace(".", " . ").
+                 replace(";", " ; ").replace("-", " - "))
+    if split_colon:
+        text_item = text_item.replace(":", " : ")
+    return text_item
+
+
+def build_text2id(id2text: dict) -> dict:
+    text2id = {}
+    text2id["all2id"] = {}
+    for key in list(id2text.keys()):
+        key_splits = key.strip().split("2")
+        new_key = key_splits[1] + "2" + key_splits[0]
+        text2id[new_key] = {}
+
+        id2def = id2text[key]
+        for lower_key in list(id2def.keys()):
+            text_list = id2def[lower_key]
+            for text_item in text_list:
+                text_item = normalize_text_item(text_item, False)
+                if new_key == "verb2id":
+                    text2id[new_key][get_str_stem(text_item)[0]] = lower_key
+                else:
+                    text2id["all2id"][text_item] = lower_key
+                    text2id[new_key][text_item] = lower_key
+
+    return text2id
+
+
+# the keyword db builder also splits colons and puts the verb stems into all2id
+def build_keyword_all2id(id2text: dict) -> dict:
+    all2id = {}
+    for key in list(id2text.keys()):
+        key_splits = key.strip().split("2")
+        new_key = key_splits[1] + "2" + key_splits[0]
+
+        id2def = id2text[key]
+        for lower_key in list(id2def.keys()):
+            for text_item in id2def[lower_key]:
+                text_item = normalize_text_item(text_item, True)
+                if new_key == "verb2id":
+                    all2id[get_str_stem(text_item)[0]] = lower_key
+                else:
+                    all2id[text_item] = lower_key
+
+    return all2id
+
+
+def compile_defs(defs_filename: str, saved_defs_filename=None, artifact_filename=None) -> dict:
+    if artifact_filename is None:
+        artifact_filename = get_artifact_filename(defs_filename)
+
+    print(datetime.datetime.now(), ": COMPILING", defs_filename, "...")
+    if saved_defs_filename is not None:
+        preprocess_keywords(saved_defs_filename, defs_filename)
+
+    id2text_file = open(defs_filename, 'r')
+    id2text = json.load(id2text_file)
+    id2text_file.close()
+
+    if "id2field_val" not in id2text:
+        id2text["id2field_val"] = {}
+
+    artifact = {
+        "version": DEFS_ARTIFACT_VERSION,
+        "saved_defs_hash": get_file_hash(saved_defs_filename) if saved_defs_filename is not None else None,
+        "defs_hash": get_file_hash(defs_filename),
+        "id2text": id2text,
+        "text2id": build_text2id(id2text),
+        "keyword_all2id": build_keyword_all2id(id2text)
+    }
+
+    with open(artifact_filename, 'wb') as artifact_file:
+        pickle.dump(artifact, artifact_file, protocol=pickle.HIGHEST_PROTOCOL)
+    return artifact
+
+
+def read_artifact(artifact_filename: str):
+    if not os.path.exists(artifact_filename):
+        return None
+
+    try:
+        with open(artifact_filename, 'rb') as artifact_file:
+            artifact = pickle.load(artifact_file)
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+
+    if not isinstance(artifact, dict) or artifact.get("version") != DEFS_ARTIFACT_VERSION:
+        return None
+    return artifact
+
+
+# saved_defs_filename is given by the scripts that run preprocess_keywords, which is then skipped while up to date
+def load_compiled_defs(defs_filename: str, saved_defs_filename=None, artifact_filename=None) -> dict:
+    if artifact_filename is None:
+        artifact_filename = get_artifact_filename(defs_filename)
+
+    artifact = read_artifact(artifact_filename)
+    if artifact is not None and os.path.exists(defs_filename) and artifact["defs_hash"] == get_file_hash(defs_filename) \
+            and (saved_defs_filename is None or artifact["saved_defs_hash"] == get_file_hash(saved_defs_filename)):
+        return artifact
+
+    return compile_defs(defs_filename, saved_defs_filename, artifact_filename)
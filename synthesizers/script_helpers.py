@@ -24,11 +24,14 @@ from nltk.stem.porter import PorterStemmer
 import nltk
 from nltk.tokenize import sent_tokenize
 
-from typing import List
+from typing import List, Iterator, Tuple
 from Levenshtein import distance as levenshtein_distance
 import xml.etree.ElementTree as ET
 from num2words import num2words
 
+from script_cache import register_cache
+from script_keyword_types import KeywordTables, get_common_defs_types
+
 p_stemmer = PorterStemmer()
 
 
@@ -74,6 +77,38 @@ def extract_parenthesized(text: str):
     return results
 
 
+def get_candidate_spans(text: str, max_len: int, lengths=None, token_aligned=False,
+                        include_last=True) -> Iterator[Tuple[int, int]]:
+    text_len = len(text)
+    last_end = text_len if include_last else text_len - 1
+    if lengths is None:
+        lengths = range(1, max_len + 1)
+    lengths = sorted(length for length in set(lengths) if 0 < length <= max_len)
+
+    next_tag = [text_len] * text_len
+    tag_idx = text_len
+    for idx in range(text_len - 1, -1, -1):
+        if text[idx] == "<" or text[idx] == ">":
+            tag_idx = idx
+        next_tag[idx] = tag_idx
+
+    for start_idx in range(text_len):
+        if text[start_idx] == "<" or text[start_idx] == ">":
+            continue
+        elif text[start_idx - 1] == "<" or text[start_idx - 1] == ">":
+            continue
+        elif token_aligned and (text[start_idx].isspace() or
+                                (start_idx > 0 and not text[start_idx - 1].isspace() and text[start_idx - 1] != "/")):
+            continue
+
+        end_limit = min(next_tag[start_idx], last_end)
+        for length in lengths:
+            end_idx = start_idx + length
+            if end_idx > end_limit:
+                break
+            yield start_idx, end_idx
+
+
 def get_text(xml_root: ET.Element) -> str:
     text = ET.tostring(xml_root, encoding='utf8', method='text')
     text = text.decode(encoding='utf8')
@@ -328,22 +363,29 @@ def modify_section_numbers(text: str) -> str:
     return " ".join(words)
 
 
-substring_pos_cache = {}
-edit_distance_cache = {}
+SUBSTRING_POS_CACHE_SIZE = 100000
+EDIT_DISTANCE_CACHE_SIZE = 500000
+substring_pos_cache = register_cache("substring_pos", SUBSTRING_POS_CACHE_SIZE)
+edit_distance_cache = register_cache("edit_distance", EDIT_DISTANCE_CACHE_SIZE)
 
 
-def find_substring_pos(line: str, substr: str) -> int:
-    global substring_pos_cache
-    global edit_distance_cache
+def get_cached_edit_distance(text1: str, text2: str) -> int:
+    key = (text1, text2) if text1 <= text2 else (text2, text1)
+    dist = edit_distance_cache.get(key)
+    if dist is None:
+        dist = levenshtein_distance(text1, text2)
+        edit_distance_cache[key] = dist
+    return dist
 
-    if line not in substring_pos_cache:
-        substring_pos_cache[line] = {}
-    elif substr in substring_pos_cache[line]:
-        return substring_pos_cache[line][substr]
+
+def find_substring_pos(line: str, substr: str) -> int:
+    cached_pos = substring_pos_cache.get((line, substr))
+    if cached_pos is not None:
+        return cached_pos
 
     find_idx = line.find(substr)
     if find_idx >= 0:
-        substring_pos_cache[line][substr] = find_idx
+        substring_pos_cache[(line, substr)] = find_idx
         return find_idx
 
     line_len = len(line)
@@ -351,41 +393,25 @@ def find_substring_pos(line: str, substr: str) -> int:
     if substr_len > line_len:
         return -1
 
-    if substr not in edit_distance_cache:
-        edit_distance_cache[substr] = {}
-
     min_pos = -1
     min_dist = math.inf
     for start_idx in range(line_len - substr_len + 1):
         matching_substr = line[start_idx: start_idx + substr_len]
-        matching_dist = math.inf
-        if matching_substr not in edit_distance_cache:
-            edit_distance_cache[matching_substr] = {}
-
-        if substr in edit_distance_cache[matching_substr]:
-            edit_distance_cache[substr][matching_substr] = edit_distance_cache[matching_substr][substr]
-            matching_dist = edit_distance_cache[matching_substr][substr]
-        elif matching_substr in edit_distance_cache[substr]:
-            edit_distance_cache[matching_substr][substr] = edit_distance_cache[substr][matching_substr]
-            matching_dist = edit_distance_cache[substr][matching_substr]
-        else:
-            matching_dist = levenshtein_distance(matching_substr, substr)
-            edit_distance_cache[substr][matching_substr] = matching_dist
-            edit_distance_cache[matching_substr][substr] = matching_dist
+        matching_dist = get_cached_edit_distance(matching_substr, substr)
 
         if matching_dist < min_dist:
             min_pos = start_idx
             min_dist = matching_dist
 
         if min_dist == 1:
-            substring_pos_cache[line][substr] = min_pos
+            substring_pos_cache[(line, substr)] = min_pos
             return min_pos
 
     if min_dist >= substr_len / 2:
-        substring_pos_cache[line][substr] = -1
+        substring_pos_cache[(line, substr)] = -1
         return -1
     else:
-        substring_pos_cache[line][substr] = min_pos
+        substring_pos_cache[(line, substr)] = min_pos
         return min_pos
 
 def verb_in_txt(txt: str):
@@ -403,6 +429,9 @@ def verb_in_txt(txt: str):
 def get_text_type(text: str, text2id: dict, common_defs=None) -> List[str]:
     if common_defs is None:
         common_defs = {}
+    if isinstance(text2id, KeywordTables):
+        return text2id.get_types(text) + get_common_defs_types(text, common_defs)
+
     type_list = []
     for key in text2id:
         if key == "all2id":
@@ -421,6 +450,9 @@ def get_text_type(text: str, text2id: dict, common_defs=None) -> List[str]:
 
 
 def get_key_type(target_key: str, text2id: dict) -> List[str]:
+    if isinstance(text2id, KeywordTables):
+        return text2id.get_value_types(target_key)
+
     type_list = []
     for key in text2id:
         if key == "all2id":
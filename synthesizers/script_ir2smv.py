@@ -19,7 +19,6 @@ limitations under the License.
 """
 
 import logging
-import os
 import sys
 import io
 import xml.etree.ElementTree as ET
@@ -126,9 +125,7 @@ class InjectiveAdversary(object):
         self.alwayson = alwayson
 
 
-def parseXML(xmlfile):
-    tree = ET.parse(xmlfile)
-    root = tree.getroot()
+def parseXML(root):
 
     vars = []
     vars_dict = {}
@@ -218,7 +215,6 @@ def parseXML(xmlfile):
                 transition_label = str(transition.attrib['label']).strip()
                 transition_label = transition_label.split('_')[0] + '_T' + str(i)
                 transition.attrib['label'] = transition_label
-                tree.write(xmlfile)
                 start_state = str(transition.find('start').text).strip()
                 end_state = str(transition.find('end').text).strip()
                 condition = str(transition.find('condition').text)
@@ -504,10 +500,8 @@ def dump_adversarial_channel_controls(output_file, injective_adversaries):
     return
 
 
-def dump_manual(input_file, output_file, section_name):
+def dump_manual(root, output_file, section_name):
     output_file.write('\n------------------- dump_manual --------------------\n')
-    tree = ET.parse(input_file)
-    root = tree.getroot()
 
     manual_dumps = root.find('manual_dump')
     if root.find('manual_dump'):
@@ -522,13 +516,13 @@ def dump_manual(input_file, output_file, section_name):
     return
 
 
-def dump_defines(input_file, output_file, channels, injective_adversaries, fsms):
+def dump_defines(root, output_file, channels, injective_adversaries, fsms):
     output_file.write('\n------------------- dump_defines --------------------\n')
     output_file.write('\n\nDEFINE\n')
     dump_transitions(output_file, fsms)
     dump_noisy_channel_controls(output_file, channels)
     dump_adversarial_channel_controls(output_file, injective_adversaries)
-    dump_manual(input_file, output_file, 'DEFINE')
+    dump_manual(root, output_file, 'DEFINE')
     return
 
 
@@ -824,7 +818,7 @@ def dump_seq_num_state_machines(output_file, seq_nums, fsms):
     return
 
 
-def dump_assigns(input_file, output_file, vars, seq_nums, fsms, channels, injective_adversaries, msg_fields_dict):
+def dump_assigns(root, output_file, vars, seq_nums, fsms, channels, injective_adversaries, msg_fields_dict):
     output_file.write('\n\n--------------- dump_assigns ------------------\n')
     output_file.write('\n\nASSIGN\n\n')
     channel_actions_map = get_channel_actions_map(channels, fsms)
@@ -864,6 +858,8 @@ def draw_fsms(fsms):
 
 
 def ir2smv_main(inputFileName, outputFile):
+    action_channel_dict.clear()
+
     input_file = open(inputFileName, 'r')
     input_lines = input_file.readlines()
     input_file.close()
@@ -871,13 +867,9 @@ def ir2smv_main(inputFileName, outputFile):
     for i in range(len(input_lines)):
         input_lines[i] = input_lines[i].replace("<PRIMARY>", "").replace("</PRIMARY>", "")
 
-    inputFileName = "ir-temp.xml"
-    input_file = open(inputFileName, 'w')
-    input_file.writelines(input_lines)
-    input_file.close()
+    root = ET.fromstring("".join(input_lines))
 
-    vars, vars_dict, msg_fields, msg_fields_dict, seq_nums, fsms, channels, injective_adversaries = parseXML(
-        inputFileName)
+    vars, vars_dict, msg_fields, msg_fields_dict, seq_nums, fsms, channels, injective_adversaries = parseXML(root)
     f = open(outputFile, "w")
     f.write("MODULE main\n")
     dump_variables(f, vars, injective_adversaries)
@@ -887,9 +879,8 @@ def ir2smv_main(inputFileName, outputFile):
     dump_adversary_channel(f, channels, fsms)
     dump_injective_adversary(f, channels, injective_adversaries, fsms)
     dump_injective_msg_fields(f, msg_fields_dict)
-    dump_defines(inputFileName, f, channels, injective_adversaries, fsms)
-    dump_assigns(inputFileName, f, vars, seq_nums, fsms, channels, injective_adversaries, msg_fields_dict)
+    dump_defines(root, f, channels, injective_adversaries, fsms)
+    dump_assigns(root, f, vars, seq_nums, fsms, channels, injective_adversaries, msg_fields_dict)
 
     f.close()
-    os.system("rm -rf " + inputFileName)
 
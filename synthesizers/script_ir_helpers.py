@@ -0,0 +1,330 @@
+"""
+This is the public release of the code of our paper titled
+"Hermes: Unlocking Security Analysis of Cellular Network Protocols by Synthesizing Finite State Machines from Natural
+    Language Specifications" (USENIX Security '24)
+Author: Abdullah Al Ishtiaq
+Contact: abdullah.ishtiaq@psu.edu
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+      https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from bisect import bisect_left
+from typing import List
+
+from nltk.tree import Tree, ParentedTree
+
+from script_DepGraph import DepGraph
+
+INDEXED_SUBTREE_QUERIES = True
+
+
+def call_update_context_key_value(key: str, value) -> None:
+    from script_context import update_context_key_value
+    update_context_key_value(key, value)
+
+
+def call_get_last_context(key: str, cond_ctx: dict, act_ctx: dict, global_ctx: dict, order="021",
+                          message_dir="") -> list:
+    from script_context import get_last_context
+    return get_last_context(key, cond_ctx, act_ctx, global_ctx, order, message_dir)
+
+
+def get_info_from_tree(in_tree, dep_graph: DepGraph) -> (str, List[str], str, str):
+    tree_label = in_tree
+    if isinstance(in_tree, ParentedTree):
+        tree_label = in_tree.label()
+
+    tok_num = None
+    tok_types = []
+    tok_pos = None
+    tok_label = tree_label.split("->")[-1]
+    if "->" in tree_label:
+        tok_num = int(tree_label.split("->")[-2])
+
+    if tok_num is not None:
+        tok_types = dep_graph.get_types_at(tok_num)
+        tok_pos = dep_graph.get_pos_at(tok_num)
+
+    return tok_num, tok_types, tok_pos, tok_label
+
+
+def collect_tree_entries(in_tree, depth: int, index: dict) -> int:
+    entries = index["entries"]
+    node_idx = len(entries)
+    tree_label = in_tree if isinstance(in_tree, str) else in_tree.label()
+    entry = [in_tree, tree_label.split("->")[-1], node_idx + 1, depth, None]
+    entries.append(entry)
+    index["label_positions"].setdefault(entry[1], []).append(node_idx)
+
+    struct_key = in_tree
+    if not isinstance(in_tree, str):
+        index["positions"][id(in_tree)] = node_idx
+        child_ids = tuple(collect_tree_entries(child, depth + 1, index) for child in in_tree)
+        entry[2] = len(entries)
+        struct_key = (type(in_tree), tree_label, child_ids)
+
+    # equal subtrees share an id, as is_successor compares nodes by value
+    struct_id = index["struct_ids"].setdefault(struct_key, len(index["struct_ids"]))
+    entry[4] = struct_id
+    index["struct_positions"].setdefault(struct_id, []).append(node_idx)
+    return struct_id
+
+
+# every node of a parsed tree in preorder as [node, label, index past its subtree, depth, structure id], with the
+# positions of every label and structure; kept on the root, so a subtree is the interval of its root's position
+def get_tree_index(in_tree) -> (dict, int):
+    root = in_tree.root()
+    index = getattr(root, "subtree_index", None)
+    if index is None:
+        index = {"entries": [], "positions": {}, "label_positions": {}, "struct_ids": {}, "struct_positions": {},
+                 "dep_graph": None, "type_positions": {}, "queries": {}}
+        collect_tree_entries(root, 0, index)
+        for positions in index["struct_positions"].values():
+            positions.sort()
+        root.subtree_index = index
+    return index, index["positions"][id(in_tree)]
+
+
+def get_tree_type_positions(index: dict, dep_graph: DepGraph) -> dict:
+    if index["dep_graph"] is not dep_graph:
+        type_positions = {}
+        for node_idx, entry in enumerate(index["entries"]):
+            for tok_type in set(get_info_from_tree(entry[0], dep_graph)[1]):
+                type_positions.setdefault(tok_type, []).append(node_idx)
+        index["dep_graph"] = dep_graph
+        index["type_positions"] = type_positions
+        index["queries"] = {}
+    return index["type_positions"]
+
+
+def get_positions_in(positions: list, start: int, end: int) -> list:
+    return positions[bisect_left(positions, start): bisect_left(positions, end)]
+
+
+def get_struct_id(index: dict, target_node):
+    if isinstance(target_node, str):
+        return index["struct_ids"].get(target_node)
+    if not isinstance(target_node, Tree):
+        return None
+
+    node_idx = index["positions"].get(id(target_node))
+    if node_idx is not None and index["entries"][node_idx][0] is target_node:
+        return index["entries"][node_idx][4]
+    child_ids = []
+    for child in target_node:
+        child_id = get_struct_id(index, child)
+        if child_id is None:
+            return None
+        child_ids.append(child_id)
+    return index["struct_ids"].get((type(target_node), target_node.label(), tuple(child_ids)))
+
+
+# types match every descendant, a label match hides the subtree below it; ignored labels only hide children's subtrees
+def get_indexed_args(in_tree, query: str, req, dep_graph: DepGraph, ignore_subtree_labels) -> List:
+    index, node_idx = get_tree_index(in_tree)
+    type_positions = get_tree_type_positions(index, dep_graph) if query == "type" else None
+    query_key = (node_idx, query, tuple(req) if query != "label_substring" else req,
+                 tuple(ignore_subtree_labels) if ignore_subtree_labels is not None else ())
+    result = index["queries"].get(query_key)
+    if result is not None:
+        return list(result)
+
+    entries = index["entries"]
+    start, end, depth = node_idx + 1, entries[node_idx][2], entries[node_idx][3]
+    hidden_ranges = []
+    for ignore_label in set(ignore_subtree_labels if ignore_subtree_labels is not None else []):
+        for child_idx in get_positions_in(index["label_positions"].get(ignore_label, []), start, end):
+            if entries[child_idx][3] == depth + 1:
+                hidden_ranges.append((child_idx, entries[child_idx][2]))
+
+    if query == "label_substring":
+        candidates = [entry_idx for entry_idx in range(start, end) if req in entries[entry_idx][1]]
+    else:
+        positions_dict = type_positions if query == "type" else index["label_positions"]
+        candidates = set()
+        for req_key in set(req):
+            candidates.update(get_positions_in(positions_dict.get(req_key, []), start, end))
+        candidates = sorted(candidates)
+
+    result = []
+    visible_from = start
+    for entry_idx in candidates:
+        if entry_idx < visible_from or \
+                any(hidden_start <= entry_idx < hidden_end for hidden_start, hidden_end in hidden_ranges):
+            continue
+        result.append(entries[entry_idx][0])
+        if query != "type":
+            visible_from = entries[entry_idx][2]
+
+    index["queries"][query_key] = result
+    return list(result)
+
+
+def get_args_of_type(in_tree, req_types: list, dep_graph: DepGraph, ignore_subtree_labels=None) -> List:
+    if isinstance(in_tree, str):
+        return []
+    if INDEXED_SUBTREE_QUERIES:
+        return get_indexed_args(in_tree, "type", req_types, dep_graph, ignore_subtree_labels)
+    if ignore_subtree_labels is None:
+        ignore_subtree_labels = []
+
+    result = []
+    for child in in_tree:
+        child_num, child_types, child_pos, child_label = get_info_from_tree(child, dep_graph)
+        if child_label in ignore_subtree_labels:
+            continue
+        for child_type in child_types:
+            if child_type in req_types:
+                result.append(child)
+                break
+
+        result.extend(get_args_of_type(child, req_types, dep_graph))
+
+    return result
+
+
+def get_args_of_label(in_tree, req_labels: list, dep_graph: DepGraph, ignore_subtree_labels=None) -> List:
+    if isinstance(in_tree, str):
+        return []
+    if INDEXED_SUBTREE_QUERIES:
+        return get_indexed_args(in_tree, "label", req_labels, dep_graph, ignore_subtree_labels)
+    if ignore_subtree_labels is None:
+        ignore_subtree_labels = []
+
+    result = []
+    for child in in_tree:
+        child_num, child_types, child_pos, child_label = get_info_from_tree(child, dep_graph)
+        if child_label in ignore_subtree_labels:
+            continue
+        if child_label in req_labels:
+            result.append(child)
+        else:
+            result.extend(get_args_of_label(child, req_labels, dep_graph))
+
+    return result
+
+
+def get_args_of_label_substring(in_tree, req_label: str, dep_graph: DepGraph, ignore_subtree_labels=None) -> List:
+    if isinstance(in_tree, str):
+        return []
+    if INDEXED_SUBTREE_QUERIES:
+        return get_indexed_args(in_tree, "label_substring", req_label, dep_graph, ignore_subtree_labels)
+    if ignore_subtree_labels is None:
+        ignore_subtree_labels = []
+
+    result = []
+    for child in in_tree:
+        child_num, child_types, child_pos, child_label = get_info_from_tree(child, dep_graph)
+        if child_label in ignore_subtree_labels:
+            continue
+        if req_label in child_label:
+            result.append(child)
+        else:
+            result.extend(get_args_of_label_substring(child, req_label, dep_graph))
+
+    return result
+
+
+def is_successor(in_tree, target_node):
+    if INDEXED_SUBTREE_QUERIES and isinstance(in_tree, ParentedTree):
+        index, node_idx = get_tree_index(in_tree)
+        struct_id = get_struct_id(index, target_node)
+        if struct_id is None:
+            return False
+        return len(get_positions_in(index["struct_positions"][struct_id], node_idx, index["entries"][node_idx][2])) > 0
+    if in_tree == target_node:
+        return True
+    if isinstance(in_tree, str):
+        return False
+
+    for child in in_tree:
+        if child == target_node:
+            return True
+        else:
+            if is_successor(child, target_node):
+                return True
+    return False
+
+
+def check_or(or_nodes: list, target_node):
+    if len(or_nodes) == 0:
+        return False
+    for or_node in or_nodes:
+        if is_successor(or_node, target_node):
+            return True
+    return False
+
+
+def check_not(not_nodes: list, target_node):
+    if len(not_nodes) == 0:
+        return False
+    for not_node in not_nodes:
+        if is_successor(not_node, target_node):
+            return True
+    return False
+
+
+def is_successor_val(in_tree, target_val, dep_graph: DepGraph):
+    if INDEXED_SUBTREE_QUERIES and isinstance(in_tree, ParentedTree):
+        index, node_idx = get_tree_index(in_tree)
+        label_positions = index["label_positions"].get(target_val, [])
+        return len(get_positions_in(label_positions, node_idx, index["entries"][node_idx][2])) > 0
+    tok_num, tok_types, tok_pos, tok_label = get_info_from_tree(in_tree, dep_graph)
+    if tok_label == target_val:
+        return True
+    if isinstance(in_tree, str):
+        return False
+
+    for child in in_tree:
+        child_num, child_types, child_pos, child_label = get_info_from_tree(child, dep_graph)
+        if child_label == target_val:
+            return True
+        else:
+            if is_successor_val(child, target_val, dep_graph):
+                return True
+    return False
+
+
+def check_or_val(or_nodes: list, target_val, dep_graph: DepGraph):
+    if len(or_nodes) == 0:
+        return False
+    for or_node in or_nodes:
+        if is_successor_val(or_node, target_val, dep_graph):
+            return True
+    return False
+
+
+def check_not_val(not_nodes: list, target_val, dep_graph: DepGraph):
+    if len(not_nodes) == 0:
+        return False
+    for not_node in not_nodes:
+        if is_successor_val(not_node, target_val, dep_graph):
+            return True
+    return False
+
+
+NOT_TYPES = {"_NOT_", "_UNTIL_", "_UNLESS_", "_WITHOUT_", "_EXCEPT_", "_BEFORE_", "_INSTEAD_OF_", "other"}
+
+
+def connect_condition(or_nodes, not_nodes, arg, prev_condition, new_condition, check_tree=True, dep_graph=None):
+    if check_tree and check_not(not_nodes, arg) or \
+            not check_tree and dep_graph is not None and check_not_val(not_nodes, arg, dep_graph):
+        new_condition = "!(" + new_condition + ")"
+
+    if check_tree and check_or(or_nodes, arg) or \
+            not check_tree and dep_graph is not None and check_or_val(or_nodes, arg, dep_graph):
+        result = "(" + prev_condition + " | " + new_condition + ")"
+    else:
+        result = prev_condition + " & " + new_condition
+
+    return result
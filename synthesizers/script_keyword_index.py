@@ -0,0 +1,108 @@
+"""
+This is the public release of the code of our paper titled
+"Hermes: Unlocking Security Analysis of Cellular Network Protocols by Synthesizing Finite State Machines from Natural
+    Language Specifications" (USENIX Security '24)
+Author: Abdullah Al Ishtiaq
+Contact: abdullah.ishtiaq@psu.edu
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+      https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from script_db_handler import INF, get_min_keyword_distance_batch, get_substring_lengths
+from script_build_string_keyword_distance import get_string_distance_rows
+
+NO_MATCH = ("", "", INF)
+
+
+# the order the keyword db picks the best match of a substring in
+def get_match_rank(match: tuple) -> tuple:
+    return match[2], -len(match[0]), match[0]
+
+
+# best matches of the keyword db are looked up per batch of substrings, through the cache of script_db_handler. A runtime
+# keyword only matches the substrings of the texts it was added with, as the rows build_string_distance wrote for them
+# into the db did; generation changes whenever a lookup could give a different result
+class KeywordIndex:
+    def __init__(self):
+        self.use_db = False
+        self.runtime_matches = {}
+        self.lengths = set()
+        self.db_lengths = set()
+        self.generation = 0
+        # the substrings whose matches add_keywords changed, with the generation it moved to, since log_start
+        self.changed_substrings = []
+        self.log_start = 0
+
+    def load_from_db(self, db_cursor) -> None:
+        self.use_db = True
+        self.db_lengths = get_substring_lengths(db_cursor)
+        self.lengths.update(self.db_lengths)
+        self.generation = self.generation + 1
+        self.changed_substrings = []
+        self.log_start = self.generation
+
+    def clear_keywords(self) -> None:
+        self.runtime_matches = {}
+        self.generation = self.generation + 1
+        self.lengths = set(self.db_lengths)
+        self.changed_substrings = []
+        self.log_start = self.generation
+
+    def add_keywords(self, keywords_dict: dict, texts: list, token_aligned=False) -> None:
+        changed = set()
+        for text in texts:
+            for substring, matched_string, keyword, dist in get_string_distance_rows(text, keywords_dict,
+                                                                                     token_aligned):
+                # like INSERT OR IGNORE, the first row of a substring and matched string stays
+                match = (matched_string, keyword, dist)
+                previous_match = self.runtime_matches.get(substring)
+                if previous_match is not None and get_match_rank(previous_match) <= get_match_rank(match):
+                    continue
+
+                self.runtime_matches[substring] = match
+                self.lengths.add(len(substring))
+                changed.add(substring)
+
+        if len(changed) > 0:
+            self.generation = self.generation + 1
+            self.changed_substrings.append((self.generation, changed))
+
+    # None when the index was cleared or reloaded since generation
+    def get_changed_substrings(self, generation: int):
+        if generation < self.log_start:
+            return None
+
+        changed = set()
+        for changed_generation, substrings in reversed(self.changed_substrings):
+            if changed_generation <= generation:
+                break
+            changed.update(substrings)
+        return changed
+
+    def get_lengths(self) -> set:
+        return self.lengths
+
+    def get_min_keyword_distance(self, db_cursor, substring: str) -> (str, str, int):
+        return self.get_min_keyword_distance_batch(db_cursor, [substring])[substring]
+
+    def get_min_keyword_distance_batch(self, db_cursor, substrings) -> dict:
+        if self.use_db:
+            results = get_min_keyword_distance_batch(db_cursor, substrings)
+        else:
+            results = dict.fromkeys(substrings, NO_MATCH)
+
+        for substring in results:
+            match = self.runtime_matches.get(substring)
+            if match is not None and get_match_rank(match) < get_match_rank(results[substring]):
+                results[substring] = match
+        return results
@@ -0,0 +1,179 @@
+"""
+This is the public release of the code of our paper titled
+"Hermes: Unlocking Security Analysis of Cellular Network Protocols by Synthesizing Finite State Machines from Natural
+    Language Specifications" (USENIX Security '24)
+Author: Abdullah Al Ishtiaq
+Contact: abdullah.ishtiaq@psu.edu
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+      https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from collections import Counter
+
+UNTYPED_TABLES = {"all2id"}
+
+NOT_FOUND = object()
+
+common_defs_index = {"defs": None, "types": {}}
+
+
+# a text2id sub-dict that reports its writes, so the token->types index of its KeywordTables stays current
+class KeywordTable(dict):
+    def __init__(self, table_name="", items=None, owner=None):
+        super().__init__()
+        if items is not None:
+            dict.update(self, items)
+        self.table_name = table_name
+        self.owner = owner
+
+    def __reduce__(self):
+        return KeywordTable, (self.table_name, dict(self))
+
+    def __setitem__(self, key, value):
+        previous = self.get(key, NOT_FOUND)
+        dict.__setitem__(self, key, value)
+        if self.owner is not None:
+            self.owner.table_changed(self, key, previous, value)
+
+    def __delitem__(self, key):
+        previous = self[key]
+        dict.__delitem__(self, key)
+        if self.owner is not None:
+            self.owner.table_changed(self, key, previous, NOT_FOUND)
+
+    def pop(self, key, *default):
+        if key not in self:
+            return dict.pop(self, key, *default)
+        value = self[key]
+        del self[key]
+        return value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        for key in list(self.keys()):
+            del self[key]
+
+
+# text2id with a token->types index, built on the first lookup so the deep copies cached with dep graphs never pay for it;
+# version counts the changes to the typed tables
+class KeywordTables(dict):
+    def __init__(self, tables=None):
+        super().__init__()
+        self.value_counts = None
+        self.token_types = None
+        self.version = 0
+        if tables is not None:
+            for table_name, table in tables.items():
+                self[table_name] = table
+
+    def __reduce__(self):
+        return KeywordTables, ({table_name: dict(table) for table_name, table in self.items()},)
+
+    def __setitem__(self, table_name, table):
+        if table_name not in UNTYPED_TABLES:
+            table = KeywordTable(table_name, table, self)
+        dict.__setitem__(self, table_name, table)
+        self.token_types = None
+        self.version = self.version + 1
+
+    def __delitem__(self, table_name):
+        dict.__delitem__(self, table_name)
+        self.token_types = None
+        self.version = self.version + 1
+
+    def build_index(self):
+        self.value_counts = {}
+        self.token_types = {}
+        for table_name, table in self.items():
+            if table_name in UNTYPED_TABLES:
+                continue
+            counts = Counter(table.values())
+            self.value_counts[table_name] = counts
+            for token in table:
+                self.token_types.setdefault(token, set()).add(table_name)
+            for token in counts:
+                self.token_types.setdefault(token, set()).add(table_name)
+
+    def refresh_token(self, table_name: str, token):
+        types = self.token_types.get(token)
+        if token in self[table_name] or self.value_counts[table_name][token] > 0:
+            if types is None:
+                self.token_types[token] = {table_name}
+            else:
+                types.add(table_name)
+        elif types is not None:
+            types.discard(table_name)
+            if len(types) == 0:
+                del self.token_types[token]
+
+    def table_changed(self, table: KeywordTable, key, previous, value):
+        table_name = table.table_name
+        if previous == value or self.get(table_name) is not table:
+            return
+        self.version = self.version + 1
+        if self.token_types is None:
+            return
+
+        counts = self.value_counts[table_name]
+        if previous is not NOT_FOUND:
+            counts[previous] = counts[previous] - 1
+            if counts[previous] <= 0:
+                del counts[previous]
+            self.refresh_token(table_name, previous)
+        if value is not NOT_FOUND:
+            counts[value] = counts[value] + 1
+        self.refresh_token(table_name, key)
+        if value is not NOT_FOUND:
+            self.refresh_token(table_name, value)
+
+    def get_types(self, token) -> list:
+        if self.token_types is None:
+            self.build_index()
+
+        types = self.token_types.get(token)
+        if types is None:
+            return []
+        return [table_name.split("2")[0] for table_name in self if table_name in types]
+
+    def get_value_types(self, token) -> list:
+        if self.token_types is None:
+            self.build_index()
+
+        return [table_name.split("2")[0] for table_name in self
+                if table_name not in UNTYPED_TABLES and self.value_counts[table_name][token] > 0]
+
+
+def get_common_defs_types(text: str, common_defs: dict) -> list:
+    if common_defs_index["defs"] is not common_defs:
+        types = {}
+        for key in common_defs:
+            if key == "ignore_list":
+                tokens = set(common_defs[key])
+                type_name = "ignored"
+            else:
+                tokens = set(common_defs[key]) | set(common_defs[key].values())
+                type_name = key
+            for token in tokens:
+                types.setdefault(token, []).append(type_name)
+        common_defs_index["defs"] = common_defs
+        common_defs_index["types"] = types
+
+    return list(common_defs_index["types"].get(text, []))
@@ -0,0 +1,100 @@
+"""
+This is the public release of the code of our paper titled
+"Hermes: Unlocking Security Analysis of Cellular Network Protocols by Synthesizing Finite State Machines from Natural
+    Language Specifications" (USENIX Security '24)
+Author: Abdullah Al Ishtiaq
+Contact: abdullah.ishtiaq@psu.edu
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+      https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+
+PARSE_CACHE_VERSION = 1
+PARSE_CACHE_TIMEOUT = 60
+
+parse_cache_state = {"conn": None, "pid": None, "config_key": ""}
+
+
+def get_parse_cache_config_key(annotators: list, properties: dict) -> str:
+    return json.dumps([PARSE_CACHE_VERSION, annotators, properties], sort_keys=True)
+
+
+def set_parse_cache_config(annotators: list, properties: dict) -> None:
+    parse_cache_state["config_key"] = get_parse_cache_config_key(annotators, properties)
+
+
+# parses are stored under the annotators they were made with, the configured ones unless config_key says otherwise
+def get_parse_cache_key(text: str, config_key=None) -> str:
+    if config_key is None:
+        config_key = parse_cache_state["config_key"]
+    hasher = hashlib.sha256()
+    hasher.update(config_key.encode())
+    hasher.update(b"\0")
+    hasher.update(text.encode())
+    return hasher.hexdigest()
+
+
+# section workers are forked, a connection is never shared across processes
+def get_parse_cache_conn(parse_cache_filename: str):
+    if parse_cache_state["conn"] is not None and parse_cache_state["pid"] == os.getpid():
+        return parse_cache_state["conn"]
+
+    parse_cache_conn = sqlite3.connect(parse_cache_filename, timeout=PARSE_CACHE_TIMEOUT)
+    parse_cache_conn.execute("CREATE TABLE IF NOT EXISTS ParseCache (TextKey TEXT PRIMARY KEY, Value BLOB NOT NULL)")
+    parse_cache_conn.commit()
+    parse_cache_state["conn"] = parse_cache_conn
+    parse_cache_state["pid"] = os.getpid()
+    return parse_cache_conn
+
+
+def load_sentence_parses(parse_cache_filename: str, text: str, config_key=None):
+    try:
+        db_result = get_parse_cache_conn(parse_cache_filename).execute(
+            "SELECT Value FROM ParseCache WHERE TextKey = ?", (get_parse_cache_key(text, config_key),)).fetchall()
+        if len(db_result) == 0:
+            return None
+        return pickle.loads(db_result[0][0])
+    except (sqlite3.DatabaseError, pickle.UnpicklingError, EOFError):
+        return None
+
+
+def has_sentence_parses(parse_cache_filename: str, text: str, config_key=None) -> bool:
+    try:
+        db_result = get_parse_cache_conn(parse_cache_filename).execute(
+            "SELECT 1 FROM ParseCache WHERE TextKey = ?", (get_parse_cache_key(text, config_key),)).fetchall()
+        return len(db_result) > 0
+    except sqlite3.DatabaseError:
+        return False
+
+
+def save_sentence_parses(parse_cache_filename: str, text: str, sentence_parses: list, config_key=None) -> None:
+    try:
+        parse_cache_conn = get_parse_cache_conn(parse_cache_filename)
+        parse_cache_conn.execute("INSERT OR REPLACE INTO ParseCache (TextKey, Value) VALUES (?, ?)",
+                                 (get_parse_cache_key(text, config_key),
+                                  pickle.dumps(sentence_parses, protocol=pickle.HIGHEST_PROTOCOL)))
+        parse_cache_conn.commit()
+    except sqlite3.DatabaseError:
+        print("PARSE CACHE WRITE FAILED :", text)
+
+
+def close_parse_cache() -> None:
+    if parse_cache_state["conn"] is not None and parse_cache_state["pid"] == os.getpid():
+        parse_cache_state["conn"].close()
+    parse_cache_state["conn"] = None
+    parse_cache_state["pid"] = None
@@ -0,0 +1,659 @@
+"""
+This is the public release of the code of our paper titled
+"Hermes: Unlocking Security Analysis of Cellular Network Protocols by Synthesizing Finite State Machines from Natural
+    Language Specifications" (USENIX Security '24)
+Author: Abdullah Al Ishtiaq
+Contact: abdullah.ishtiaq@psu.edu
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+      https://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+import copy
+import datetime
+
+import xml.etree.ElementTree as ET
+from xml.etree.ElementTree import ParseError
+
+from stanza.server import TimeoutException
+from stanza.server import AnnotationException
+
+import script_config
+from script_cache import get_snapshot_key, load_cache_snapshot, save_cache_snapshot, print_cache_stats
+from script_defs_compiler import load_compiled_defs
+from script_parse_cache import close_parse_cache
+from script_keyword_types import KeywordTables
+from script_helpers import verb_in_txt, get_middle_texts_list, get_middle_text, find_substring_pos, \
+    replace_tokens_key, get_text, get_rrc_cond_state, modify_section_numbers, clean_gt, isNum, isHeader
+from script_text2id import get_ids_from_text_db, parse_state_text, find_start_state, get_state_from_depending_lines, \
+    call_close_db_from_text2id, parse_agent_text, get_keyword_db_signature, get_keyword_match_state, \
+    is_same_keyword_match_state
+import script_text2id
+import script_verb2ir
+import script_DepGraph
+from script_DepGraph import get_collapsed_dependency_graph, prefetch_dependency_annotations, print_annotation_stats
+import script_build_ir_xml
+from script_build_ir_xml import build_ir_xml
+from script_ir2smv import ir2smv_main
+from script_dep2ir import get_IR_transitions, call_init_context, call_clear_context, call_get_context_copy, \
+    call_update_global_context_with_text, call_update_header_context, call_get_header_context_texts, \
+    call_get_header_context
+
+
+INPUT_FILENAME = "input.txt"
+DEFS_FILENAME = script_config.nas_definitions
+COMMON_DEFS_FILENAME = script_config.common_definitions
+CACHE_SNAPSHOT_FILENAME = script_config.cache_snapshot_file
+USE_CACHE_SNAPSHOT = True
+
+L2_OUT_FILENAME = "transitions.txt"
+DEP_OUT_FILENAME = "dep-out.log"
+IR_OUT_FILENAME = "ir-out.xml"
+SMV_OUT_FILENAME = "smv-out.smv"
+
+def reset_module_state():
+    call_init_context()
+    script_verb2ir.init_registries()
+    script_DepGraph.clear_dep_graph_cache()
+    script_build_ir_xml.reset_counter()
+    script_text2id.clear_runtime_keywords()
+
+
+def get_middle_text_logic(middle_text: str):
+    logic_str = ""
+    middle_text = " " + middle_text + " "
+
+    if "until" in middle_text:
+        logic_str = "_NOT_"
+    elif " or " in middle_text:
+        logic_str = logic_str + "_OR_"
+    elif " and " in middle_text:
+        logic_str = logic_str + "_AND_"
+    elif " but " in middle_text:
+        logic_str = logic_str + "_AND_"
+
+    else:
+        logic_str = logic_str + "_AND_"
+
+    return logic_str
+
+
+def prepare_line(line: str) -> str:
+    line = line.strip()
+    if line == "":
+        return ""
+
+    line = "<root> " + line + " </root>"
+    line = line.replace("(e.g.", "that is")
+
+    line = line.replace("<", " <").replace(">", "> ").strip()
+    return modify_section_numbers(line)
+
+
+def write_line_transitions(out_file, transitions: list):
+    for tran in transitions:
+        out_file.write(str(tran["condition_text"]) + "\n")
+        out_file.write(str(tran["action_text"]) + "\n")
+        out_file.write(str(tran["text_plain"]) + "\n")
+        out_file.write(str(tran["condition_ir"]) + " / " + str(tran["action_ir"]) + "\n")
+        out_file.write(str(tran["text_ir"]) + "\n")
+
+    out_file.write("\n\n\n")
+    out_file.flush()
+
+
+class SynthesisPipeline:
+    def __init__(self, input_filename=INPUT_FILENAME, defs_filename=DEFS_FILENAME,
+                 common_defs_filename=COMMON_DEFS_FILENAME, l2_out_filename=L2_OUT_FILENAME,
+                 dep_out_filename=DEP_OUT_FILENAME, ir_out_filename=IR_OUT_FILENAME, smv_out_filename=SMV_OUT_FILENAME,
+                 use_cache_snapshot=USE_CACHE_SNAPSHOT, cache_snapshot_filename=CACHE_SNAPSHOT_FILENAME):
+        self.input_filename = input_filename
+        self.defs_filename = defs_filename
+        self.common_defs_filename = common_defs_filename
+        self.l2_out_filename = l2_out_filename
+        self.dep_out_filename = dep_out_filename
+        self.ir_out_filename = ir_out_filename
+        self.smv_out_filename = smv_out_filename
+        self.use_cache_snapshot = use_cache_snapshot
+        self.cache_snapshot_filename = cache_snapshot_filename
+
+        self.id2text = {}
+        self.text2id = {}
+        self.common_defs_dict = {}
+        self.all_tokens = set()
+        self.input_lines = []
+        self.cache_snapshot_key = None
+
+        self.dep_out_file = None
+        self.global_context_dict = {}
+        self.current_section = "0"
+        self.section_lines = {}
+        self.section_last_state = {}
+        self.all_transitions = []
+        self.paragraph = ""
+        self.last_transition_condition = []
+        self.line_idx = 0
+        self.rrc_condition = None
+        self.prefetched_dep_texts = {}
+
+    def load(self):
+        defs_artifact = load_compiled_defs(self.defs_filename)
+        self.id2text = defs_artifact["id2text"]
+        self.text2id = KeywordTables(defs_artifact["text2id"])
+
+        common_defs_file = open(self.common_defs_filename, 'r')
+        self.common_defs_dict = json.load(common_defs_file)
+        common_defs_file.close()
+
+        self.all_tokens = set()
+        self.all_tokens.update(self.text2id["all2id"].values())
+        self.all_tokens.update(self.text2id["verb2id"].values())
+
+        input_file = open(self.input_filename, 'r')
+        self.input_lines = input_file.readlines()
+        input_file.close()
+
+        self.cache_snapshot_key = get_snapshot_key([self.input_filename, self.defs_filename,
+                                                    self.common_defs_filename], [get_keyword_db_signature()])
+        if self.use_cache_snapshot and load_cache_snapshot(self.cache_snapshot_filename, self.cache_snapshot_key):
+            print(datetime.datetime.now(), ": LOADED CACHE SNAPSHOT...")
+
+    def reset(self):
+        reset_module_state()
+        self.global_context_dict = call_get_context_copy()
+
+        self.current_section = "0"
+        self.section_lines = {self.current_section: []}
+        self.section_last_state = {self.current_section: ""}
+        self.all_transitions = []
+        self.paragraph = ""
+        self.last_transition_condition = []
+        self.line_idx = 0
+        self.rrc_condition = None
+        self.prefetched_dep_texts = {}
+
+    def run(self) -> list:
+        self.reset()
+        self.dep_out_file = open(self.dep_out_filename, 'w')
+        out_file = open(self.l2_out_filename, 'w')
+
+        for line_idx, line in enumerate(self.input_lines):
+            self.process_line(line_idx, line, out_file)
+
+        call_close_db_from_text2id()
+        close_parse_cache()
+        self.dep_out_file.close()
+        out_file.close()
+        return self.all_transitions
+
+    def finish(self):
+        print_cache_stats()
+        print_annotation_stats()
+        if self.use_cache_snapshot:
+            save_cache_snapshot(self.cache_snapshot_filename, self.cache_snapshot_key)
+
+        print(datetime.datetime.now(), ": DUMPING TO IR...")
+        build_ir_xml(self.ir_out_filename, self.all_transitions, True, True)
+        print(datetime.datetime.now(), ": DUMPED TO IR...")
+
+        print(datetime.datetime.now(), ": DUMPING TO SMV...")
+        ir2smv_main(self.ir_out_filename, self.smv_out_filename)
+        print(datetime.datetime.now(), ": DUMPED TO SMV...")
+
+    # with register False nothing is written, the quoted parts are only replaced in the text
+    def get_dep_text(self, part_text: str, register=True) -> (str, list):
+        dep_text = " " + copy.deepcopy(part_text).strip() + " "
+
+        dep_text = dep_text.replace("i.e.", "that is").replace("e.g.", "for example,")
+        dep_text = dep_text.replace("/", " / ").replace(",", " , ").replace(".", " . "). \
+            replace(";", " ; ").replace("(", " ( ").replace(")", " ) ").replace("-", " - ").replace(":", " : ")
+
+        while "  " in dep_text:
+            dep_text = dep_text.replace("  ", " ")
+
+        quoted_parts = dep_text.split('"')[1::2]
+
+        new_keywords = []
+        for res in quoted_parts:
+            replaced_res = "_".join(res.replace(" - ", "_").replace(" / ", " ").replace("#", " ").split()).lower()
+            dep_text = dep_text.replace("\"" + res + "\"", replaced_res)
+            if not register:
+                continue
+
+            self.text2id["all2id"][res] = replaced_res
+            self.text2id["all2id"][replaced_res] = replaced_res
+            self.text2id["field_val2id"][res] = replaced_res
+            self.text2id["field_val2id"][replaced_res] = replaced_res
+            self.id2text["id2field_val"][replaced_res] = [res]
+            self.all_tokens.add(replaced_res)
+            new_keywords.append(replaced_res)
+
+        # the prefetch matched the same text already, which still holds while no keyword came in since
+        prefetched = self.prefetched_dep_texts.pop(part_text.strip(), None) if register else None
+        if prefetched is not None and len(new_keywords) == 0 and \
+                is_same_keyword_match_state(prefetched[2], get_keyword_match_state(self.text2id["all2id"])):
+            return prefetched[0], [list(item) for item in prefetched[1]]
+
+        keywords_in_text = get_ids_from_text_db(dep_text, self.text2id["all2id"], 1,
+                                                self.common_defs_dict["ignore_list"], new_keywords)
+
+        dep_text = replace_tokens_key(dep_text, keywords_in_text)
+        return dep_text, keywords_in_text
+
+    def parse_with_dep_tree(self, part_text: str, line_str: str):
+        text_position = find_substring_pos(line_str, part_text)
+
+        result_trees = []
+        dep_text, keywords_in_text = self.get_dep_text(part_text)
+
+        dep_trees = get_collapsed_dependency_graph(dep_text, self.common_defs_dict, self.text2id, self.all_tokens)
+
+        self.dep_out_file.write(part_text + '\n')
+        self.dep_out_file.write(str(keywords_in_text) + '\n')
+        self.dep_out_file.write(dep_text + '\n')
+
+        for ttree in dep_trees:
+            dep_parsed_str = ttree.DFS(set([item[0] for item in keywords_in_text]))
+            try:
+                self.dep_out_file.write(ttree.pretty_print() + '\n')
+            except RecursionError:
+                print("\nLine", self.line_idx + 1, ": pretty_print RecursionError :", dep_text, "\n")
+                self.dep_out_file.write("\nLine " + str(self.line_idx + 1) + " : pretty_print RecursionError : " +
+                                        dep_text + "\n")
+
+            self.dep_out_file.write(dep_parsed_str + '\n\n')
+
+            result_trees.append({
+                "tree": ttree,
+                "str": part_text,
+                "parsed_str": dep_parsed_str,
+                "line": line_str,
+                "position": text_position
+            })
+
+        return result_trees
+
+    def parse_condition_text(self, condition_text: str, line_str) -> str:
+        original_text = copy.deepcopy(condition_text).strip()
+        dep_parsed_condition = self.parse_with_dep_tree(original_text, line_str)
+
+        return dep_parsed_condition
+
+    def parse_condition(self, condition_tree, line_str: str, strict=False) -> dict:
+        child_counter = 0
+        middle_text = get_middle_text(condition_tree)
+
+        child_data = []
+        for condition_child in condition_tree:
+            child_counter = child_counter + 1
+            child_data.append(self.parse_condition(condition_child, line_str))
+
+        if child_counter == 0:
+            return {"logic": "_NONE_", "data": condition_tree.text,
+                    "parsed_data": self.parse_condition_text(condition_tree.text, line_str), "strict": strict}
+        elif len(middle_text.strip()) > 5:
+            child_data.append(
+                {"logic": "_NONE_", "data": middle_text, "parsed_data": self.parse_condition_text(middle_text, line_str),
+                 "strict": strict})
+
+        logic_str = get_middle_text_logic(get_middle_text(condition_tree))
+        return {"logic": logic_str, "data": child_data}
+
+    def parse_action_text(self, action_text: str, line_str: str) -> list:
+        original_text = copy.deepcopy(action_text).strip()
+        dep_parsed_action = self.parse_with_dep_tree(original_text, line_str)
+        return dep_parsed_action
+
+    def parse_action(self, action_tree, line_str) -> (list, list):
+        actions_list = [get_middle_text(action_tree)]
+        conditions_list = []
+        for action_child in action_tree:
+            if action_child.tag.lower() == "action":
+                child_actions_list, child_conditions_list = self.parse_action(action_child, line_str)
+                actions_list.extend(child_actions_list)
+                conditions_list.extend(child_conditions_list)
+            elif action_child.tag.lower() == "condition":
+                new_condition = self.parse_condition(action_child, line_str)
+                conditions_list.append(new_condition)
+
+        return actions_list, conditions_list
+
+    def head_condition_recur(self, head_tree, head_text: str) -> dict:
+        condition = {"logic": "_AND_", "data": []}
+        for head_condition_child in head_tree:
+            if head_condition_child.tag.lower() == "condition":
+                if "__SECTION__" in head_text:
+                    head_condition_child.text = head_condition_child.text.replace("__SECTION__", "")
+                    head_text = head_text.replace("__SECTION__", "")
+                    new_condition = self.parse_condition(head_condition_child, head_text, True)
+                    if not script_config.GEN == "5g-rrc":
+                        continue
+                else:
+                    new_condition = self.parse_condition(head_condition_child, head_text, False)
+                condition["data"].append(new_condition)
+            else:
+                condition["data"].append(self.head_condition_recur(head_condition_child, head_text))
+
+        return condition
+
+    def get_head_ctx_conditions(self, head_ctx_text: str):
+        if "<control>" not in head_ctx_text:
+            head_ctx_text = "<control> <condition> " + head_ctx_text + " </condition> </control>"
+        head_ctx_text = "<root> " + head_ctx_text + " </root>"
+        try:
+            head_tree = ET.fromstring(head_ctx_text)
+            head_condition = self.head_condition_recur(head_tree, head_ctx_text)
+            return head_condition
+        except ParseError:
+            print("ParseError head_ctx_text:", head_ctx_text)
+            return {"logic": "_AND_", "data": []}
+
+    def parse_control(self, control_xml, line_str: str, condition_up=None, start_state_up=None, end_state_up=None,
+                      last_control_condition=None, rrc_cond=None) -> (list, list):
+        if condition_up is None:
+            condition_up = {"logic": get_middle_text_logic((get_middle_text(control_xml))), "data": []}
+        else:
+            condition_up = copy.deepcopy(condition_up)
+        if start_state_up is None:
+            start_state_up = []
+        if end_state_up is None:
+            end_state_up = []
+
+        middle_texts = get_middle_texts_list(control_xml)
+        transitions = []
+
+        if last_control_condition is None:
+            last_control_condition = []
+        last_condition = copy.deepcopy(last_control_condition)
+        child_condition_counter = 0
+
+        for child in control_xml:
+            if child.tag.lower() == "condition":
+                new_condition = self.parse_condition(child, line_str)
+
+                condition_up["data"].append(new_condition)
+                if child_condition_counter == 0:
+                    last_condition = [copy.deepcopy(new_condition)]
+                else:
+                    last_condition.append(copy.deepcopy(new_condition))
+                child_condition_counter = child_condition_counter + 1
+
+            elif child.tag.lower() == "start_state":
+                start_state_up.append(get_text(child))
+
+        for child in control_xml:
+            if child.tag.lower() == "action":
+                actions_text_list, action_conditions_list = self.parse_action(child, line_str)
+                action_condition = {"logic": "_AND_", "data": [copy.deepcopy(condition_up)]}
+                action_condition["data"].extend(action_conditions_list)
+                if rrc_cond is not None and self.rrc_condition != "":
+                    extra_rrc_condition, extra_rrc_states = get_rrc_cond_state(rrc_cond)
+                    start_state_up.extend(extra_rrc_states)
+                    action_condition["data"].append(self.parse_condition(extra_rrc_condition, line_str))
+
+                for head_ctx in call_get_header_context_texts():
+                    action_condition["data"].append(self.get_head_ctx_conditions(head_ctx))
+
+                for action_text in actions_text_list:
+                    agents = parse_agent_text([action_text], self.text2id)
+                    transitions.append({
+                        "start_state": copy.deepcopy(start_state_up),
+                        "condition": action_condition,
+                        "end_state": "",
+                        "action": action_text,
+                        "is_ue": "ue" in agents
+                    })
+            elif child.tag.lower() == "end_state":
+                end_state_text = get_text(child)
+                states_in_text = parse_state_text([end_state_text], self.text2id)
+
+                agents = parse_agent_text([end_state_text], self.text2id)
+
+                if len(states_in_text) == 0:
+                    middle_texts.append("e2a:" + end_state_text)
+                else:
+                    end_state_up.append(end_state_text)
+                    action_condition = {"logic": "_AND_", "data": [copy.deepcopy(condition_up)]}
+
+                    if rrc_cond is not None and self.rrc_condition != "":
+                        extra_rrc_condition, extra_rrc_states = get_rrc_cond_state(rrc_cond)
+                        start_state_up.extend(extra_rrc_states)
+                        action_condition["data"].append(self.parse_condition(extra_rrc_condition, line_str))
+
+                    for head_ctx in call_get_header_context_texts():
+                        action_condition["data"].append(self.get_head_ctx_conditions(head_ctx))
+
+                    for child_child in child:
+                        if child_child.tag.lower() == "condition":
+                            new_condition = self.parse_condition(child_child, line_str)
+                            action_condition["data"].append(new_condition)
+                    transitions.append({
+                        "start_state": copy.deepcopy(start_state_up),
+                        "condition": copy.deepcopy(action_condition),
+                        "end_state": copy.deepcopy(end_state_up),
+                        "action": "",
+                        "is_ue": "ue" in agents
+                    })
+
+        for mid_txt in middle_texts:
+            if verb_in_txt(
+                    mid_txt) or " shall " in mid_txt or " will " in mid_txt or " may " in mid_txt or "e2a:" in mid_txt:
+                mid_txt = mid_txt.replace("e2a:", "")
+                child = ET.fromstring("<action> " + mid_txt + "</action>")
+                actions_text_list, action_conditions_list = self.parse_action(child, line_str)
+                action_condition = {"logic": "_AND_", "data": [copy.deepcopy(condition_up)]}
+                action_condition["data"].extend(action_conditions_list)
+
+                if rrc_cond is not None and self.rrc_condition != "":
+                    extra_rrc_condition, extra_rrc_states = get_rrc_cond_state(rrc_cond)
+                    start_state_up.extend(extra_rrc_states)
+                    action_condition["data"].append(self.parse_condition(extra_rrc_condition, line_str))
+
+                for head_ctx in call_get_header_context_texts():
+                    action_condition["data"].append(self.get_head_ctx_conditions(head_ctx))
+
+                for action_text in actions_text_list:
+                    transitions.append({
+                        "start_state": copy.deepcopy(start_state_up),
+                        "condition": action_condition,
+                        "end_state": "",
+                        "action": action_text
+                    })
+
+        last_control_condition = []
+        for child in control_xml:
+            if child.tag.lower() == "control":
+                child_transitions_control, last_control_condition = self.parse_control(child, line_str,
+                                                                                       copy.deepcopy(condition_up),
+                                                                                       copy.deepcopy(start_state_up),
+                                                                                       copy.deepcopy(end_state_up),
+                                                                                       last_control_condition)
+                transitions.extend(child_transitions_control)
+
+        return transitions, last_condition
+
+    def collect_condition_texts(self, condition_tree, texts: list):
+        child_counter = 0
+        for condition_child in condition_tree:
+            child_counter = child_counter + 1
+            self.collect_condition_texts(condition_child, texts)
+
+        middle_text = get_middle_text(condition_tree)
+        if child_counter == 0:
+            if condition_tree.text is not None:
+                texts.append(condition_tree.text)
+        elif len(middle_text.strip()) > 5:
+            texts.append(middle_text)
+
+    def collect_action_texts(self, action_tree, texts: list):
+        texts.append(get_middle_text(action_tree))
+        for action_child in action_tree:
+            if action_child.tag.lower() == "action":
+                self.collect_action_texts(action_child, texts)
+            elif action_child.tag.lower() == "condition":
+                self.collect_condition_texts(action_child, texts)
+
+    # the texts parse_control is expected to parse, the ones it does not reach are only annotated for nothing
+    def collect_control_texts(self, control_xml, texts: list):
+        for child in control_xml:
+            if child.tag.lower() == "condition":
+                self.collect_condition_texts(child, texts)
+            elif child.tag.lower() == "action":
+                self.collect_action_texts(child, texts)
+            elif child.tag.lower() == "end_state":
+                for child_child in child:
+                    if child_child.tag.lower() == "condition":
+                        self.collect_condition_texts(child_child, texts)
+            elif child.tag.lower() == "control":
+                self.collect_control_texts(child, texts)
+
+        for mid_txt in get_middle_texts_list(control_xml):
+            if verb_in_txt(mid_txt) or " shall " in mid_txt or " will " in mid_txt or " may " in mid_txt:
+                try:
+                    self.collect_action_texts(ET.fromstring("<action> " + mid_txt + "</action>"), texts)
+                except ParseError:
+                    continue
+
+    def prefetch_line_annotations(self, line_tree):
+        self.prefetched_dep_texts = {}
+        # until the first parse has put the ignore keys into all2id, predicting the dep texts would do it early
+        all2id = self.text2id["all2id"]
+        if not script_text2id.USE_KEYWORD_INDEX or \
+                any(all2id.get(ignore_key) != ignore_key for ignore_key in self.common_defs_dict["ignore_list"]):
+            return
+
+        texts = []
+        for child in line_tree:
+            if child.tag.lower() == "control":
+                self.collect_control_texts(child, texts)
+
+        dep_texts = []
+        for text in texts:
+            dep_text, keywords_in_text = self.get_dep_text(text.strip(), False)
+            self.prefetched_dep_texts[text.strip()] = (dep_text, keywords_in_text, get_keyword_match_state(all2id))
+            dep_texts.append(dep_text)
+        prefetch_dependency_annotations(dep_texts)
+
+    def parse_transitions_text(self, transitions_text, line_str: str):
+        transitions_id = []
+        for transition_text in transitions_text:
+            transitions_id.append({
+                "start_state": parse_state_text(transition_text["start_state"], self.text2id),
+                "condition": transition_text["condition"],
+                "is_ue": transition_text["is_ue"] if "is_ue" in transition_text else True,
+                "end_state": parse_state_text(transition_text["end_state"], self.text2id),
+                "action": self.parse_action_text(transition_text["action"], line_str)
+            })
+
+        transitions_cleaned = []
+        for transition in transitions_id:
+            if len(transition["start_state"]) == 0 and len(transition["condition"]) == 0 and len(
+                    transition["end_state"]) == 0 and len(transition["action"]) == 0:
+                continue
+            transitions_cleaned.append(transition)
+
+        return transitions_cleaned
+
+    def process_line(self, line_number: int, line: str, out_file):
+        self.line_idx = line_number
+
+        out_file.write("Line " + str(self.line_idx + 1) + " :\n")
+        try:
+            line = prepare_line(line)
+            if line == "":
+                return
+
+            print("Line", self.line_idx + 1, ":", line)
+
+            section_info = call_update_header_context(line[6:-7].strip())
+            header_context = call_get_header_context()
+
+            self.rrc_condition = None
+            if len(line) > 17 and "&gt;" in line:
+                rrc_condition = [item["text"] for item in header_context if item["type"] == "rrc_point"
+                                 and ("<condition>" in item["text"] or "<start_state>" in item["text"])]
+
+                if len(rrc_condition) > 0:
+                    rrc_condition = [clean_gt(item) for item in rrc_condition]
+                    self.rrc_condition = " ".join(rrc_condition)
+
+            if not section_info or section_info["type"] != "section_header":
+                if self.current_section not in self.section_lines:
+                    self.section_lines[self.current_section] = []
+                self.section_lines[self.current_section].insert(0, line)
+                states = find_start_state([line], self.text2id)
+                if len(states) > 0:
+                    self.section_last_state[self.current_section] = states[-1]
+            else:
+                last_state = get_state_from_depending_lines(self.section_lines[self.current_section], self.text2id)
+                self.section_last_state[self.current_section] = last_state
+
+                self.current_section = section_info["header_val"]
+                if self.current_section not in self.section_lines:
+                    self.section_lines[self.current_section] = []
+                self.section_lines[self.current_section].insert(0, line)
+                states = find_start_state([line], self.text2id)
+                if len(states) > 0:
+                    self.section_last_state[self.current_section] = states[-1]
+
+            line_tree = None
+            try:
+                line_tree = ET.fromstring(line)
+                full_text = get_text(line_tree)
+                self.paragraph = self.paragraph + "__LINE_BREAK__" + full_text
+            except ParseError:
+                print("\nLine", self.line_idx + 1, ": Parsing error\n")
+                full_text = line
+                if full_text != "" and isNum(full_text[0]):
+                    call_clear_context()
+                    self.paragraph = ""
+                self.paragraph = self.paragraph + "__LINE_BREAK__" + full_text
+                call_update_global_context_with_text(self.paragraph, self.text2id,
+                                                     self.common_defs_dict["ignore_list"])
+                return
+
+            if full_text != "" and isNum(full_text[0]):
+                call_clear_context()
+                self.paragraph = ""
+
+            if script_DepGraph.BATCH_ANNOTATION:
+                self.prefetch_line_annotations(line_tree)
+
+            line_transitions_text = []
+            for child in line_tree:
+                if child.tag.lower() == "control":
+                    child_transitions, self.last_transition_condition = \
+                        self.parse_control(child, self.paragraph, last_control_condition=self.last_transition_condition,
+                                           rrc_cond=self.rrc_condition)
+                    line_transitions_text.extend(child_transitions)
+                else:
+                    continue
+
+            line_transitions_id = self.parse_transitions_text(line_transitions_text, self.paragraph)
+            call_update_global_context_with_text(self.paragraph, self.text2id, self.common_defs_dict["ignore_list"])
+
+            IR_transitions = get_IR_transitions(line_transitions_id, self.text2id,
+                                                self.common_defs_dict["ignore_list"], self.section_last_state,
+                                                self.current_section)
+            self.global_context_dict["last_transitions"] = IR_transitions
+
+            self.all_transitions.extend(IR_transitions)
+            write_line_transitions(out_file, IR_transitions)
+            print()
+
+        except RecursionError:
+            print("\nLine", self.line_idx + 1, ": RecursionError\n")
+        except TimeoutException:
+            print("\nLine", self.line_idx + 1, ": TimeoutException\n")
+        except AnnotationException:
+            print("\nLine", self.line_idx + 1, ": AnnotationException\n")
@@ -20,19 +20,31 @@ limitations under the License.
 
 import copy
 import re
+from itertools import islice
+from bisect import bisect_left, bisect_right
 
-import pandas as pd
-from script_db_handler import get_new_conn_cursor, get_min_keyword_distance, close_connection, check_conn_closed
+from script_db_handler import get_new_conn_cursor, get_min_keyword_distance, get_min_keyword_distance_batch, \
+    close_connection, check_conn_closed, get_db_signature
 
 from script_build_string_keyword_distance import build_string_distance
+from script_cache import register_cache
+from script_helpers import get_candidate_spans
+from script_keyword_index import KeywordIndex
 
 DISTANCE_THR = 3
 SHORT_THR = 5
 max_key_len = 100
+USE_KEYWORD_INDEX = True
+TOKEN_ALIGNED_CANDIDATES = False
+VERIFY_CANDIDATES = False
+TEXT2ID_CACHE_SIZE = 50000
 
-text2id_cache = {}
+# results of get_ids_from_texts_db, only valid for the keyword state they were matched in, so never saved
+text2id_cache = register_cache("text2id", TEXT2ID_CACHE_SIZE, persistent=False)
+candidate_mismatches = []
 
 db_conn, db_cursor = get_new_conn_cursor()
+keyword_index = None
 
 def check_db():
     global db_conn, db_cursor
@@ -45,6 +57,71 @@ def call_close_db_from_text2id():
     close_connection(db_conn, db_cursor)
 
 
+def get_keyword_db_signature() -> str:
+    check_db()
+    return get_db_signature(db_cursor)
+
+
+def get_keyword_index() -> KeywordIndex:
+    global keyword_index
+    if keyword_index is None:
+        check_db()
+        keyword_index = KeywordIndex()
+        keyword_index.load_from_db(db_cursor)
+    return keyword_index
+
+
+def clear_runtime_keywords():
+    if keyword_index is not None:
+        keyword_index.clear_keywords()
+
+
+# what decides how a text is matched: the runtime keywords of the index and the keys of the table, which only ever
+# grows; None when matches go through the db
+def get_keyword_match_state(text2id_dict: dict):
+    if not USE_KEYWORD_INDEX:
+        return None
+    index = get_keyword_index()
+    return index, index.generation, text2id_dict, len(text2id_dict)
+
+
+def is_same_keyword_match_state(state, other_state) -> bool:
+    if state is None or other_state is None:
+        return False
+    return state[0] is other_state[0] and state[1] == other_state[1] and state[2] is other_state[2] and \
+        state[3] == other_state[3]
+
+
+# what came in between two match states of one index and table: the substrings whose matches changed and the keys the
+# table gained; None when the index was cleared or reloaded in between
+def get_keyword_match_changes(state, other_state):
+    if state is None or other_state is None or state[0] is not other_state[0] or state[2] is not other_state[2] or \
+            state[3] > other_state[3]:
+        return None
+
+    changed_substrings = state[0].get_changed_substrings(state[1])
+    if changed_substrings is None:
+        return None
+    new_keys = list(islice(reversed(state[2]), other_state[3] - state[3]))
+    return changed_substrings, new_keys
+
+
+def lookup_min_keyword_distance(substr: str) -> (str, str, int):
+    check_db()
+    if USE_KEYWORD_INDEX:
+        return get_keyword_index().get_min_keyword_distance(db_cursor, substr)
+
+    return get_min_keyword_distance(db_cursor, substr)
+
+
+def lookup_min_keyword_distances(substrs) -> dict:
+    check_db()
+    if USE_KEYWORD_INDEX:
+        return get_keyword_index().get_min_keyword_distance_batch(db_cursor, substrs)
+
+    return get_min_keyword_distance_batch(db_cursor, substrs)
+
+
 def get_word_end_idx(text: str, start_idx: int) -> int:
     text_len = len(text)
     for idx in range(start_idx, text_len):
@@ -55,69 +132,130 @@ def get_word_end_idx(text: str, start_idx: int) -> int:
 
 
 def get_ids_from_text_db(text: str, text2id_dict: dict, threshold=DISTANCE_THR, ignore_list=None,
-                         new_keywords=None) -> list:
+                         new_keywords=None, token_aligned=None) -> list:
+    return get_ids_from_texts_db([text], text2id_dict, threshold, ignore_list, new_keywords, token_aligned)[0]
+
+
+def get_ids_from_texts_db(texts: list, text2id_dict: dict, threshold=DISTANCE_THR, ignore_list=None,
+                          new_keywords=None, token_aligned=None) -> list:
     if ignore_list is None:
         ignore_list = []
     if new_keywords is None:
         new_keywords = []
+    if token_aligned is None:
+        token_aligned = TOKEN_ALIGNED_CANDIDATES
 
     new_keywords_dict = {}
     for key in new_keywords:
         new_keywords_dict[key] = key
 
-    check_db()
-    build_string_distance(db_conn, db_cursor, text, new_keywords_dict, False, False, False)
+    if USE_KEYWORD_INDEX:
+        get_keyword_index().add_keywords(new_keywords_dict, texts, token_aligned)
+    elif len(new_keywords_dict) > 0:
+        check_db()
+        for text in texts:
+            build_string_distance(db_conn, db_cursor, text, new_keywords_dict, False, False, False,
+                                  token_aligned=token_aligned)
 
     for ignore_key in ignore_list:
         text2id_dict[ignore_key] = ignore_key
 
-    text = copy.deepcopy(text.lower())
-    ids_found = []
-    text_len = len(text)
+    lengths = None
+    if USE_KEYWORD_INDEX:
+        lengths = get_keyword_index().get_lengths()
+
+    # matches only change with the runtime keywords of the index and the keys of the table, which only ever grows
+    cache_keys = [None] * len(texts)
+    cached_results = [None] * len(texts)
+    if USE_KEYWORD_INDEX:
+        index = get_keyword_index()
+        for text_idx, text in enumerate(texts):
+            cache_keys[text_idx] = (text, threshold, tuple(ignore_list), token_aligned, index.generation,
+                                    len(text2id_dict))
+            cached_result = text2id_cache.get(cache_keys[text_idx])
+            if cached_result is not None and cached_result[0] is text2id_dict:
+                cached_results[text_idx] = cached_result[1]
+
+    texts_spans = []
+    substrs = []
+    for text, cached_result in zip(texts, cached_results):
+        if cached_result is not None:
+            texts_spans.append(None)
+            continue
+        lower_text = text.lower()
+        spans = list(get_candidate_spans(lower_text, max_key_len + DISTANCE_THR, lengths, token_aligned))
+        texts_spans.append((lower_text, spans))
+        substrs.extend(lower_text[start_idx: end_idx] for start_idx, end_idx in spans)
+
+    matches = lookup_min_keyword_distances(substrs)
 
-    for start_idx in range(text_len):
-        if text[start_idx] == "<" or text[start_idx] == ">":
+    results = []
+    for original_text, text_spans, cache_key, cached_result in zip(texts, texts_spans, cache_keys, cached_results):
+        if cached_result is not None:
+            results.append([list(item) for item in cached_result])
             continue
 
-        for end_idx in range(start_idx, text_len + 1):
-            if text[end_idx - 1] == "<" or text[end_idx - 1] == ">":
-                break
-            if start_idx == end_idx:
-                continue
-            if end_idx - start_idx > max_key_len + DISTANCE_THR:
-                break
+        text, spans = text_spans
+        result_list = get_ids_from_matches(text, spans, matches, text2id_dict, threshold, ignore_list)
+        if cache_key is not None:
+            text2id_cache[cache_key] = (text2id_dict, [tuple(item) for item in result_list])
 
-            substr = text[start_idx: end_idx]
+        if VERIFY_CANDIDATES and token_aligned:
+            exhaustive_result = get_ids_from_text_db(original_text, text2id_dict, threshold, ignore_list,
+                                                     new_keywords, False)
+            if result_list != exhaustive_result:
+                print("TOKEN CANDIDATES MISMATCH :", original_text)
+                print("\tEXHAUSTIVE :", exhaustive_result)
+                print("\tTOKEN      :", result_list)
+                candidate_mismatches.append((original_text, exhaustive_result, result_list))
 
-            check_db()
-            lookup_text, keyword, dist = get_min_keyword_distance(db_cursor, substr)
+        results.append(result_list)
 
-            lookup_len = len(lookup_text)
+    return results
+
+
+def get_ids_from_matches(text: str, spans: list, matches: dict, text2id_dict: dict, threshold: int,
+                         ignore_list: list) -> list:
+    ids_found = []
+    for start_idx, end_idx in spans:
+        substr = text[start_idx: end_idx]
 
-            if lookup_len < SHORT_THR and dist > 0:
+        lookup_text, keyword, dist = matches[substr]
+
+        lookup_len = len(lookup_text)
+
+        if lookup_len < SHORT_THR and dist > 0:
+            continue
+        elif lookup_len < SHORT_THR:
+            temp_text = " " + text + "    "
+            temp_substr = temp_text[start_idx: start_idx + lookup_len + 2]
+            temp_lookup_text = " " + lookup_text + " "
+            if temp_lookup_text != temp_substr:
                 continue
-            elif lookup_len < SHORT_THR:
-                temp_text = " " + text + "    "
-                temp_substr = temp_text[start_idx: start_idx + lookup_len + 2]
-                temp_lookup_text = " " + lookup_text + " "
-                if temp_lookup_text != temp_substr:
-                    continue
 
-            end_idx = get_word_end_idx(text, start_idx + lookup_len - 1)
+        end_idx = get_word_end_idx(text, start_idx + lookup_len - 1)
 
-            if dist < threshold:
-                ids_found.append((keyword, dist, start_idx, lookup_len, end_idx, lookup_text, substr))
+        if dist < threshold:
+            ids_found.append((keyword, dist, start_idx, lookup_len, end_idx, lookup_text, substr))
+
+    # ids_found is ordered by position, so only matches starting within the longest match length can overlap
+    positions = [item[2] for item in ids_found]
+    max_len = max([item[3] for item in ids_found], default=0)
 
     pos_set = set(range(len(ids_found)))
     for idx1, item1 in enumerate(ids_found):
-        for idx2, item2 in enumerate(ids_found):
-            if idx1 == idx2:
-                continue
-            if idx1 not in pos_set or idx2 not in pos_set:
+        if idx1 not in pos_set:
+            continue
+
+        key1, dist1, pos1, len1, end1, txt1, substr1 = item1
+        window_start = bisect_right(positions, pos1 - max_len)
+        window_end = bisect_left(positions, pos1 + len1)
+
+        for idx2 in range(window_start, window_end):
+            if idx1 == idx2 or idx2 not in pos_set:
                 continue
 
-            key1, dist1, pos1, len1, end1, txt1, substr1 = item1
-            key2, dist2, pos2, len2, end2, txt2, substr2 = item2
+            key2, dist2, pos2, len2, end2, txt2, substr2 = ids_found[idx2]
 
             if not (pos1 <= pos2 < pos1 + len1 or pos2 <= pos1 < pos2 + len2):
                 continue
@@ -149,17 +287,15 @@ def get_ids_from_text_db(text: str, text2id_dict: dict, threshold=DISTANCE_THR,
         elif txt not in text2id_dict:
             pos_set.remove(idx)
 
-    result_list = [ids_found[idx] for idx in pos_set]
-
-    result_df = pd.DataFrame(data=result_list, columns=["key", "dist", "pos", "len", "end", "txt", "substr"])
-    result_df.sort_values(["pos", "dist", "len"], ascending=[True, False, True], inplace=True)
+    result_list = [list(ids_found[idx]) for idx in sorted(pos_set)]
+    result_list.sort(key=lambda item: (item[2], -item[1], item[3]))
 
-    result_list = result_df.values.tolist()
     return result_list
 
 
 def parse_agent_text(texts: list, text2id) -> list:
     agents = []
+    text_parts = []
 
     for txt in texts:
         txt = txt.replace("/", " / ").replace(",", " , ").replace(".", " . "). \
@@ -173,15 +309,17 @@ def parse_agent_text(texts: list, text2id) -> list:
         for part in parts:
             all_parts.extend(part.split(" or "))
 
-        for part in all_parts:
-            ids_from_text = get_ids_from_text_db(part, text2id["agent2id"], 2)
-            agents.extend([item[0] for item in ids_from_text])
+        text_parts.extend(all_parts)
+
+    for ids_from_text in get_ids_from_texts_db(text_parts, text2id["agent2id"], 2):
+        agents.extend([item[0] for item in ids_from_text])
 
     return agents
 
 
 def parse_state_text(state_texts: list, text2id) -> list:
     state_ids = []
+    text_parts = []
 
     for state_text in state_texts:
         state_text = state_text.replace("/", " / ").replace(",", " , ").replace(".", " . "). \
@@ -195,9 +333,10 @@ def parse_state_text(state_texts: list, text2id) -> list:
         for part in parts:
             all_parts.extend(part.split(" or "))
 
-        for part in all_parts:
-            state_ids_from_text = get_ids_from_text_db(part, text2id["state2id"], 2)
-            state_ids.extend([item[0] for item in state_ids_from_text])
+        text_parts.extend(all_parts)
+
+    for state_ids_from_text in get_ids_from_texts_db(text_parts, text2id["state2id"], 2):
+        state_ids.extend([item[0] for item in state_ids_from_text])
 
     return state_ids
 
@@ -22,8 +22,11 @@ from word2number import w2n
 from num2words import num2words
 
 from script_msg_helpers import get_msg_direction, get_msg_response, get_mme_wait_for, \
-    get_check_mme_wait_for, check_valid_msg
+    get_check_mme_wait_for, check_valid_msg, get_msg_sublayer
 from script_helpers import replace_start_num_keyword
+from script_DepGraph import DepGraph
+from script_ir_helpers import call_get_last_context, check_not, check_not_val, connect_condition, get_args_of_type, \
+    get_args_of_label, get_args_of_label_substring, get_info_from_tree
 import script_config
 
 
@@ -43,11 +46,24 @@ elif script_config.GEN == "5g":
 
 variables_dict = {}
 msg_field_vars = {}
-sqn_dict = set()
-ue_states = set()
-mme_states = set()
+sqn_dict = {}
+ue_states = {}
+mme_states = {}
 coin_toss_counter = 0
 
+
+# dicts stand in for sets, so the registries and the ir-out.xml sections written from them keep the order the
+# transitions registered them in instead of the hash order of a set
+def init_registries():
+    global variables_dict, msg_field_vars, sqn_dict, ue_states, mme_states, coin_toss_counter
+    variables_dict = {}
+    msg_field_vars = {}
+    sqn_dict = {}
+    ue_states = {}
+    mme_states = {}
+    coin_toss_counter = 0
+
+
 def add_variable(var_name: str, data_type: str, control_type: str, possible_values=None, initial_value=None, fsm=None,
                  mutual_exlusion=False):
     global variables_dict
@@ -59,7 +75,7 @@ def add_variable(var_name: str, data_type: str, control_type: str, possible_valu
     if var_name in variables_dict and "possiblevalues" in variables_dict[var_name]:
         previous_values = variables_dict[var_name]["possiblevalues"].split(",")
         possible_values.extend(previous_values)
-        possible_values = set(possible_values)
+        possible_values = dict.fromkeys(possible_values)
 
     for val in possible_values:
         possible_values_str = possible_values_str + "," + str(val)
@@ -91,7 +107,7 @@ def get_all_variables() -> dict:
     return variables_dict
 
 
-def get_all_sqn() -> set:
+def get_all_sqn() -> dict:
     return sqn_dict
 
 
@@ -104,22 +120,22 @@ def add_state(fsm: str, state_name: str):
     global mme_states
 
     if fsm == "ue" or fsm == "UE":
-        ue_states.add(state_name)
-        mme_states.add(state_name)
+        ue_states[state_name] = None
+        mme_states[state_name] = None
     elif fsm == "mme" or fsm == "MME":
-        mme_states.add(state_name)
-        ue_states.add(state_name)
+        mme_states[state_name] = None
+        ue_states[state_name] = None
 
 
-def get_all_states() -> (set, set):
+def get_all_states() -> (dict, dict):
     return ue_states, mme_states
 
 def add_msg_field_var(msg: str, field_var: str):
     global msg_field_vars
     if msg not in msg_field_vars:
-        msg_field_vars[msg] = set()
+        msg_field_vars[msg] = {}
 
-    msg_field_vars[msg].add(field_var)
+    msg_field_vars[msg][field_var] = None
 
 
 def get_all_msg_field_vars() -> dict:
@@ -524,7 +540,7 @@ def condition_set_msg_field_to_val(field: str, message: str, val: str) -> str:
 
 def condition_reset_var(var: str) -> str:
     global sqn_dict
-    sqn_dict.add(var + "_value")
+    sqn_dict[var + "_value"] = None
     add_variable(var + "_value", "enumerate", "state", ["NONE", "0"], "NONE")
     return "(" + var + "_value = 0)"
 
@@ -942,7 +958,7 @@ def action_increase_var_by_val(var: str, val: str, agents=None) -> list:
     if val == ";" or val == "." or val == "" or var == "":
         return []
     _, val = replace_start_num_keyword(val)
-    sqn_dict.add(var + "_value")
+    sqn_dict[var + "_value"] = None
 
     try:
         label = var + "_value" + " = " + var + "_value + " + str(1)
@@ -987,3 +1003,2153 @@ def action_enter_state(state: str, agents=None) -> list:
         label = "ue_state = " + state
         channel, chan_start, chan_end = get_channel("var", "ue_state", agents)
         return [{"label": label, "channel": channel, "chan_start": chan_start, "chan_end": chan_end}]
+
+
+# the verb branches of run_dfs_IR_condition and run_dfs_IR_action in script_dep2ir, dispatched on the verb label; a
+# handler gets the locals of the caller it may read and returns the condition, or the actions and extra conditions
+def handle_condition_initiate(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                              tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    procedure_args = get_args_of_type(in_tree, ["procedure"], dep_graph)
+    for arg in procedure_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        if tok_pos == "VBN":
+            arg_condition = condition_running_procedure(arg_label)
+        else:
+            arg_condition = condition_initiate_procedure(arg_label)
+        if not_logic:
+            arg_condition = "!(" + arg_condition + ")"
+        result_condition = connect_condition(or_nodes, not_nodes, arg, result_condition, arg_condition, True,
+                                             dep_graph)
+    return result_condition
+
+
+def handle_condition_success(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                             tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    procedure_args = get_args_of_type(in_tree, ["procedure"], dep_graph)
+    for arg in procedure_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_condition = condition_completed_procedure(arg_label)
+        if not_logic:
+            arg_condition = "!(" + arg_condition + ")"
+        result_condition = connect_condition(or_nodes, not_nodes, arg, result_condition, arg_condition, True,
+                                             dep_graph)
+    return result_condition
+
+
+def handle_condition_complete(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                              tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    procedure_args = get_args_of_type(in_tree, ["procedure"], dep_graph)
+
+    for arg in procedure_args:
+        if not_logic or check_not(not_nodes, arg):
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+            arg_condition = condition_running_procedure(arg_label)
+            result_condition = connect_condition(or_nodes, [], arg, result_condition, arg_condition,
+                                                 True, dep_graph)
+        else:
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+            arg_condition = condition_completed_procedure(arg_label)
+            result_condition = connect_condition(or_nodes, [], arg, result_condition, arg_condition,
+                                                 True, dep_graph)
+    return result_condition
+
+
+def handle_condition_fail(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                          tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    procedure_args = get_args_of_type(in_tree, ["procedure"], dep_graph)
+    for arg in procedure_args:
+        if not_logic or check_not(not_nodes, arg):
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+            arg_condition = condition_completed_procedure(arg_label)
+            result_condition = connect_condition(or_nodes, [], arg, result_condition, arg_condition,
+                                                 True, dep_graph)
+        else:
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+            arg_condition = condition_fail_procedure(arg_label)
+            result_condition = connect_condition(or_nodes, [], arg, result_condition, arg_condition,
+                                                 True,
+                                                 dep_graph)
+
+    integrity_check_args = get_args_of_label(in_tree, ["integrity_check", "integrity_protection"], dep_graph)
+    if len(integrity_check_args) > 0:
+        msg_args = get_args_of_type(in_tree, ["message"], dep_graph)
+        msg_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in msg_args]
+        if len(msg_labels) == 0:
+            msg_labels = call_get_last_context("message", cond_ctx, act_ctx, global_context_dict, "120",
+                                               message_dir)
+        for arg_label in msg_labels:
+            if not_logic or check_not_val(not_nodes, arg_label, dep_graph):
+                msg_condition = condition_receive_message(arg_label, agents)
+                msg_condition = msg_condition + " & " + condition_integrity_protected_message(arg_label)
+                result_condition = connect_condition(or_nodes, [], arg_label, result_condition,
+                                                     msg_condition,
+                                                     False, dep_graph)
+            else:
+                msg_condition = condition_receive_message(arg_label, agents)
+                msg_condition = msg_condition + " & " + condition_not_integrity_protected_message(arg_label)
+                result_condition = connect_condition(or_nodes, [], arg_label, result_condition,
+                                                     msg_condition, False, dep_graph)
+
+    event_args = get_args_of_type(in_tree, ["event"], dep_graph)
+    for arg in event_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        if arg_label == "integrity_check":
+            continue
+        arg_condition = condition_not_indicate_event(arg_label)
+        result_condition = connect_condition(or_nodes, [], arg, result_condition, arg_condition,
+                                             True, dep_graph)
+    return result_condition
+
+
+def handle_condition_pass(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                          tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    integrity_check_args = get_args_of_label(in_tree, ["integrity_check", "integrity_protection"], dep_graph)
+    if len(integrity_check_args) > 0:
+        msg_args = get_args_of_type(in_tree, ["message"], dep_graph)
+        msg_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in msg_args]
+        if len(msg_labels) == 0:
+            msg_labels = call_get_last_context("message", cond_ctx, act_ctx, global_context_dict, "120",
+                                               message_dir)
+            for arg_label in msg_labels:
+                if not_logic or check_not_val(not_nodes, arg_label, dep_graph):
+                    msg_condition = condition_receive_message(arg_label, agents)
+                    msg_condition = msg_condition + " & " + condition_not_integrity_protected_message(arg_label)
+                    result_condition = connect_condition(or_nodes, [], arg_label, result_condition,
+                                                         msg_condition,False, dep_graph)
+                else:
+                    msg_condition = condition_receive_message(arg_label, agents)
+                    msg_condition = msg_condition + " & " + condition_integrity_protected_message(arg_label)
+                    result_condition = connect_condition(or_nodes, [], arg_label, result_condition,
+                                                         msg_condition,False, dep_graph)
+    return result_condition
+
+
+def handle_condition_perform(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                             tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    if tok_pos == "VBN":
+        procedure_args = get_args_of_type(in_tree, ["procedure"], dep_graph)
+        for arg in procedure_args:
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+            arg_condition = condition_completed_procedure(arg_label)
+            if not_logic:
+                arg_condition = "!(" + arg_condition + ")"
+            result_condition = connect_condition(or_nodes, not_nodes, arg, result_condition, arg_condition,
+                                                 True, dep_graph)
+
+    elif tok_pos == "VBG":
+        procedure_args = get_args_of_type(in_tree, ["procedure"], dep_graph)
+        for arg in procedure_args:
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+            arg_condition = condition_running_procedure(arg_label)
+            if not_logic:
+                arg_condition = "!(" + arg_condition + ")"
+            result_condition = connect_condition(or_nodes, not_nodes, arg, result_condition, arg_condition,
+                                                 True, dep_graph)
+    return result_condition
+
+
+def handle_condition_check(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                           tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    var_args = get_args_of_type(in_tree, ["var"], dep_graph)
+    for arg in var_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_condition = condition_valid_var(arg_label)
+        if not_logic:
+            arg_condition = "!(" + arg_condition + ")"
+        result_condition = connect_condition(or_nodes, not_nodes, arg, result_condition, arg_condition, True,
+                                             dep_graph)
+    return result_condition
+
+
+def handle_condition_change(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                            tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    var_args = get_args_of_type(in_tree, ["var"], dep_graph)
+    field_args = get_args_of_type(in_tree, ["msg_field"], dep_graph)
+    var_args.extend(field_args)
+    msg_args = get_args_of_type(in_tree, ["message"], dep_graph)
+    var_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in var_args]
+
+    if len(msg_args) > 0:
+        msg_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in msg_args]
+
+        for var in var_labels:
+            for msg in msg_labels:
+                var_condition = condition_changed_var_in_msg(var, msg)
+                if not_logic:
+                    var_condition = "!(" + var_condition + ")"
+                result_condition = connect_condition(or_nodes, not_nodes, var, result_condition, var_condition,
+                                                     False, dep_graph)
+
+    else:
+        for arg in var_args:
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+            arg_condition = condition_changed_var(arg_label)
+            if not_logic:
+                arg_condition = "!(" + arg_condition + ")"
+            result_condition = connect_condition(or_nodes, not_nodes, arg, result_condition, arg_condition,
+                                                 True, dep_graph)
+    return result_condition
+
+
+def handle_condition_expire(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                            tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    timer_args = get_args_of_type(in_tree, ["timer"], dep_graph)
+    timer_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in timer_args]
+    if len(timer_labels) == 0:
+        timer_labels = call_get_last_context("timer", cond_ctx, act_ctx, global_context_dict, "012")
+    for arg_label in timer_labels:
+        if not_logic or check_not_val(not_nodes, arg_label, dep_graph):
+            arg_condition = condition_running_timer(arg_label)
+            result_condition = connect_condition(or_nodes, [], arg_label, result_condition,
+                                                 arg_condition, False, dep_graph)
+        else:
+            arg_condition = condition_expired_timer(arg_label)
+            result_condition = connect_condition(or_nodes, [], arg_label, result_condition, arg_condition,
+                                                 False, dep_graph)
+    return result_condition
+
+
+def handle_condition_indicate(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                              tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    field_val_args = get_args_of_type(in_tree, ["field_val"], dep_graph)
+    msg_field_args = get_args_of_type(in_tree, ["msg_field"], dep_graph)
+    msg_args = get_args_of_type(in_tree, ["message"], dep_graph)
+
+    if len(field_val_args) > 0:
+        field_val_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in field_val_args]
+        msg_field_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in msg_field_args]
+
+        msg_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in msg_args]
+        if len(msg_labels) == 0:
+            msg_labels = call_get_last_context("message", cond_ctx, act_ctx, global_context_dict, "021",
+                                               message_dir)
+
+        for val in field_val_labels:
+            for field in msg_field_labels:
+                for msg in msg_labels:
+                    val_condition = condition_field_in_msg_val(field, msg, val)
+                    field_condition = condition_receive_field_in_msg(field, msg)
+                    arg_condition = val_condition + " & " + field_condition
+                    if not_logic:
+                        arg_condition = "!(" + arg_condition + ")"
+                    result_condition = connect_condition(or_nodes, not_nodes, val, result_condition,
+                                                         arg_condition, False, dep_graph)
+
+    elif len(msg_field_args) > 0:
+        msg_field_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in msg_field_args]
+
+        msg_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in msg_args]
+        if len(msg_labels) == 0:
+            msg_labels = call_get_last_context("message", cond_ctx, act_ctx, global_context_dict, "021",
+                                               message_dir)
+
+        for field in msg_field_labels:
+            for msg in msg_labels:
+                field_condition = condition_receive_field_in_msg(field, msg)
+                if not_logic:
+                    field_condition = "!(" + field_condition + ")"
+                result_condition = connect_condition(or_nodes, not_nodes, field, result_condition,
+                                                     field_condition, False, dep_graph)
+
+    else:
+        event_args = get_args_of_type(in_tree, ["event"], dep_graph)
+        for arg in event_args:
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+            arg_condition = condition_indicate_event(arg_label)
+            if not_logic:
+                arg_condition = "!(" + arg_condition + ")"
+            result_condition = connect_condition(or_nodes, not_nodes, arg, result_condition, arg_condition,
+                                                 True, dep_graph)
+    return result_condition
+
+
+def handle_condition_save(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                          tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    var_args = get_args_of_type(in_tree, ["var"], dep_graph)
+    for arg in var_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_condition = condition_valid_var(arg_label)
+        if not_logic:
+            arg_condition = "!(" + arg_condition + ")"
+        result_condition = connect_condition(or_nodes, not_nodes, arg, result_condition, arg_condition, True,
+                                             dep_graph)
+    return result_condition
+
+
+def handle_condition_know(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                          tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    var_args = get_args_of_type(in_tree, ["var"], dep_graph)
+    for arg in var_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_condition = condition_valid_var(arg_label)
+        if not_logic:
+            arg_condition = "!(" + arg_condition + ")"
+        result_condition = connect_condition(or_nodes, not_nodes, arg, result_condition, arg_condition, True,
+                                             dep_graph)
+    return result_condition
+
+
+def handle_condition_reset(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                           tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    to_args = get_args_of_label(in_tree, ["_TO_"], dep_graph)
+    counter_args = get_args_of_type(in_tree, ["counter"], dep_graph)
+    var_args = get_args_of_type(in_tree, ["var"], dep_graph)
+    var_args.extend(counter_args)
+
+    if len(to_args) > 0:
+        for arg in var_args:
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+            arg_condition = condition_var_equals(arg_label, get_info_from_tree(to_args[0], dep_graph)[3])
+            if not_logic:
+                arg_condition = "!(" + arg_condition + ")"
+            result_condition = connect_condition(or_nodes, not_nodes, arg, result_condition, arg_condition,
+                                                 True, dep_graph)
+    else:
+        for arg in var_args:
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+            arg_condition = condition_reset_var(arg_label)
+            if not_logic:
+                arg_condition = "!(" + arg_condition + ")"
+            result_condition = connect_condition(or_nodes, not_nodes, arg, result_condition, arg_condition,
+                                                 True, dep_graph)
+    return result_condition
+
+
+def handle_condition_set(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                         tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    var_args = get_args_of_type(in_tree, ["var"], dep_graph)
+    var_args.extend(get_args_of_type(in_tree, ["counter"], dep_graph))
+    var_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in var_args]
+
+    last_counter_args = get_args_of_label(in_tree, ["last_counter"], dep_graph)
+    if len(last_counter_args) > 0:
+        var_labels.append(global_context_dict["last_counter"])
+
+    to_args = get_args_of_label(in_tree, ["_TO_"], dep_graph)
+    val_args = []
+    for to_arg in to_args:
+        val_args.extend(
+            get_info_from_tree(item, dep_graph)[3] for item in get_args_of_type(to_arg, ["var"], dep_graph))
+        val_args.extend(
+            get_info_from_tree(item, dep_graph)[3] for item in get_args_of_type(to_arg, ["mode"], dep_graph))
+        val_args.extend(
+            get_info_from_tree(item, dep_graph)[3] for item in get_args_of_type(to_arg, ["num"], dep_graph))
+        val_args.extend(
+            get_info_from_tree(item, dep_graph)[3] for item in
+            get_args_of_type(to_arg, ["field_val"], dep_graph))
+
+    for arg_label in var_labels:
+        for to_val in val_args:
+            val_num, val_types, val_pos, val_label = get_info_from_tree(to_val, dep_graph)
+            if val_label == arg_label:
+                continue
+            arg_condition = condition_set_var_to_val(arg_label, val_label)
+            if not_logic:
+                arg_condition = "!(" + arg_condition + ")"
+            result_condition = connect_condition(or_nodes, not_nodes, arg_label, result_condition,
+                                                 arg_condition, False, dep_graph)
+
+    field_args = get_args_of_type(in_tree, ["msg_field"], dep_graph)
+    field_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in field_args]
+
+    if len(get_args_of_label(in_tree, ["last_msg_field"], dep_graph)) > 0:
+        field_labels.append(global_context_dict["last_msg_field"])
+
+    to_args = get_args_of_label(in_tree, ["_TO_"], dep_graph)
+    if len(to_args) > 0:
+        val_args = get_args_of_type(to_args[0], ["field_val"], dep_graph)
+    else:
+        val_args = get_args_of_type(in_tree, ["field_val"], dep_graph)
+
+    msg_args = get_args_of_type(in_tree, ["message"], dep_graph)
+    msg_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in msg_args]
+    if len(msg_labels) == 0:
+        msg_labels = call_get_last_context("message", cond_ctx, act_ctx, global_context_dict, "021",
+                                           message_dir)
+    if len(msg_labels) != 0:
+        for field in field_labels:
+            for val in val_args:
+                val_num, val_types, val_pos, val_label = get_info_from_tree(val, dep_graph)
+                if field == val_label:
+                    continue
+                arg_condition = condition_receive_var_in_msg_val(field, msg_labels[0], val_label) + " & " + \
+                                condition_receive_field_in_msg(field, msg_labels[0])
+                if not_logic:
+                    arg_condition = "!(" + arg_condition + ")"
+                result_condition = connect_condition(or_nodes, not_nodes, field, result_condition,
+                                                     arg_condition, False, dep_graph)
+    return result_condition
+
+
+def handle_condition_stop(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                          tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    timer_args = get_args_of_type(in_tree, ["timer"], dep_graph)
+    for arg in timer_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_condition = condition_stopped_timer(arg_label)
+        if not_logic:
+            arg_condition = "!(" + arg_condition + ")"
+        result_condition = connect_condition(or_nodes, not_nodes, arg, result_condition, arg_condition, True,
+                                             dep_graph)
+
+    procedure_args = get_args_of_type(in_tree, ["procedure"], dep_graph)
+    for arg in procedure_args:
+        if not_logic or check_not(not_nodes, arg):
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+            arg_condition = condition_running_procedure(arg_label)
+            result_condition = connect_condition(or_nodes, [], arg, result_condition, arg_condition,
+                                                 True, dep_graph)
+        else:
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+            arg_condition = condition_stopped_procedure(arg_label)
+            result_condition = connect_condition(or_nodes, [], arg, result_condition, arg_condition, True,
+                                                 dep_graph)
+    return result_condition
+
+
+def handle_condition_accept(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                            tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    msg_args = get_args_of_type(in_tree, ["message"], dep_graph)
+    for arg in msg_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        if not_logic or check_not(not_nodes, arg):
+            arg_condition = condition_receive_message(arg_label, agents) + " & " + condition_reject_message(
+                arg_label)
+            result_condition = connect_condition(or_nodes, [], arg, result_condition, arg_condition, True,
+                                                 dep_graph)
+        else:
+            arg_condition = condition_receive_message(arg_label, agents) + " & " + condition_accept_message(
+                arg_label)
+            result_condition = connect_condition(or_nodes, [], arg, result_condition, arg_condition, True,
+                                                 dep_graph)
+
+    procedure_args = get_args_of_type(in_tree, ["procedure"], dep_graph)
+    for arg in procedure_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_condition = condition_completed_procedure(arg_label)
+        if not_logic:
+            arg_condition = "!(" + arg_condition + ")"
+        result_condition = connect_condition(or_nodes, not_nodes, arg, result_condition, arg_condition, True,
+                                             dep_graph)
+    return result_condition
+
+
+def handle_condition_process(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                             tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    msg_args = get_args_of_type(in_tree, ["message"], dep_graph)
+    for arg in msg_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        if not_logic or check_not(not_nodes, arg):
+            arg_condition = condition_receive_message(arg_label, agents) + " & " + condition_reject_message(
+                arg_label)
+            result_condition = connect_condition(or_nodes, [], arg, result_condition, arg_condition, True,
+                                                 dep_graph)
+        else:
+            arg_condition = condition_receive_message(arg_label, agents) + " & " + condition_accept_message(
+                arg_label)
+            result_condition = connect_condition(or_nodes, [], arg, result_condition, arg_condition, True,
+                                                 dep_graph)
+    return result_condition
+
+
+def handle_condition_reject(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                            tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    msg_args = get_args_of_type(in_tree, ["message"], dep_graph)
+    for arg in msg_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        if not_logic or check_not(not_nodes, arg):
+            arg_condition = condition_receive_message(arg_label, agents) + " & " + condition_accept_message(
+                arg_label)
+            result_condition = connect_condition(or_nodes, [], arg, result_condition, arg_condition, True,
+                                                 dep_graph)
+        else:
+            arg_condition = condition_receive_message(arg_label, agents) + " & " + condition_reject_message(
+                arg_label)
+            result_condition = connect_condition(or_nodes, [], arg, result_condition, arg_condition, True,
+                                                 dep_graph)
+    return result_condition
+
+
+def handle_condition_cipher(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                            tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    msg_args = get_args_of_type(in_tree, ["message"], dep_graph)
+    msg_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in msg_args]
+    if len(msg_labels) == 0:
+        msg_labels = call_get_last_context("message", cond_ctx, act_ctx, global_context_dict, "021",
+                                           message_dir)
+
+    for arg_label in msg_labels:
+        arg_condition = condition_ciphered_message(arg_label)
+        if not_logic:
+            arg_condition = "!(" + arg_condition + ")"
+        result_condition = connect_condition(or_nodes, not_nodes, arg_label, result_condition, arg_condition,
+                                             False, dep_graph)
+    return result_condition
+
+
+def handle_condition_protect(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                             tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    integrity_args = get_args_of_label(in_tree, ["integrity"], dep_graph)
+    if len(integrity_args) > 0:
+        msg_args = get_args_of_type(in_tree, ["message"], dep_graph)
+        msg_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in msg_args]
+
+        if len(msg_labels) == 0:
+            msg_labels = call_get_last_context("message", cond_ctx, act_ctx, global_context_dict, "021",
+                                               message_dir)
+
+        for arg_label in msg_labels:
+            if not_logic or check_not_val(not_nodes, arg_label, dep_graph):
+                msg_condition = condition_receive_message(arg_label, agents)
+                msg_condition = msg_condition + " & " + condition_not_integrity_protected_message(arg_label)
+                result_condition = connect_condition(or_nodes, [], arg_label, result_condition,
+                                                     msg_condition, False, dep_graph)
+            else:
+                msg_condition = condition_receive_message(arg_label, agents)
+                msg_condition = msg_condition + " & " + condition_integrity_protected_message(arg_label)
+                result_condition = connect_condition(or_nodes, [], arg_label, result_condition,
+                                                     msg_condition, False, dep_graph)
+    return result_condition
+
+
+def handle_condition_include(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                             tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    var_args = get_args_of_type(in_tree, ["var"], dep_graph)
+    field_args = get_args_of_type(in_tree, ["msg_field"], dep_graph)
+    msg_args = get_args_of_type(in_tree, ["message"], dep_graph)
+    field_args.extend(var_args)
+    field_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in field_args]
+
+    set_args = get_args_of_label(in_tree, ["set"], dep_graph)
+    if len(set_args) > 0:
+        for set_arg in set_args:
+            field_args = get_args_of_type(set_arg, ["msg_field"], dep_graph)
+            field_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in field_args]
+
+            to_args = get_args_of_label(set_arg, ["_TO_"], dep_graph)
+            if len(to_args) > 0:
+                val_args = get_args_of_type(to_args[0], ["field_val"], dep_graph)
+            else:
+                val_args = get_args_of_type(set_arg[0], ["field_val"], dep_graph)
+
+            msg_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in msg_args]
+            if len(msg_labels) == 0:
+                msg_labels = call_get_last_context("message", cond_ctx, act_ctx, global_context_dict, "021",
+                                                   message_dir)
+
+            if len(msg_labels) > 0:
+                for field in field_labels:
+                    for val in val_args:
+                        val_num, val_types, val_pos, val_label = get_info_from_tree(val, dep_graph)
+                        val_condition = condition_field_in_msg_val(field, msg_labels[-1], val_label)
+                        if not_logic:
+                            val_condition = "!(" + val_condition + ")"
+                        result_condition = connect_condition(or_nodes, not_nodes, val, result_condition,
+                                                             val_condition, True, dep_graph)
+
+    cause_args = get_args_of_type(in_tree, ["cause"], dep_graph)
+    if len(cause_args) > 0:
+        msg_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in msg_args]
+        if len(msg_labels) == 0:
+            msg_labels = call_get_last_context("message", cond_ctx, act_ctx, global_context_dict, "021",
+                                               message_dir)
+
+        for arg in cause_args:
+            for msg in msg_labels:
+                arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+                arg_condition = condition_message_cause(arg_label, msg)
+                msg_condition = condition_receive_message(msg, agents)
+                arg_condition = arg_condition + " & " + msg_condition
+                if not_logic:
+                    arg_condition = "!(" + arg_condition + ")"
+                result_condition = connect_condition(or_nodes, not_nodes, arg, result_condition, arg_condition,
+                                                     True, dep_graph)
+
+                if "emm_cause" in field_labels or len(get_args_of_label(in_tree, ["emm"], dep_graph)) > 0:
+                    field_condition = condition_receive_field_in_msg("emm_cause", msg)
+                    if not_logic:
+                        field_condition = "!(" + field_condition + ")"
+                    result_condition = connect_condition(or_nodes, not_nodes, "emm_cause", result_condition,
+                                                         field_condition, True, dep_graph)
+                elif "five_gmm_cause" in field_labels or len(get_args_of_label(in_tree, ["emm"], dep_graph)) > 0:
+                    field_condition = condition_receive_field_in_msg("five_gmm_cause", msg)
+                    if not_logic:
+                        field_condition = "!(" + field_condition + ")"
+                    result_condition = connect_condition(or_nodes, not_nodes, "five_gmm_cause", result_condition,
+                                                         field_condition, True, dep_graph)
+                elif "esm_cause" in field_labels or len(get_args_of_label(in_tree, ["esm"], dep_graph)) > 0:
+                    field_condition = condition_receive_field_in_msg("esm_cause", msg)
+                    if not_logic:
+                        field_condition = "!(" + field_condition + ")"
+                    result_condition = connect_condition(or_nodes, not_nodes, "esm_cause", result_condition,
+                                                         field_condition, True, dep_graph)
+
+    elif len(field_labels) > 0:
+        msg_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in msg_args]
+        if len(msg_labels) == 0:
+            msg_labels = call_get_last_context("message", cond_ctx, act_ctx, global_context_dict, "021",
+                                               message_dir)
+
+        for field in field_labels:
+            for msg in msg_labels:
+                field_condition = condition_receive_var_in_msg(field, msg)
+                msg_condition = condition_receive_message(msg, agents)
+                field_condition = field_condition + " & " + msg_condition
+                if not_logic:
+                    field_condition = "!(" + field_condition + ")"
+                result_condition = connect_condition(or_nodes, not_nodes, field, result_condition,
+                                                     field_condition, False, dep_graph)
+    return result_condition
+
+
+def handle_condition_support(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                             tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    service_args = get_args_of_type(in_tree, ["service"], dep_graph)
+    mode_args = get_args_of_type(in_tree, ["mode"], dep_graph)
+    timer_args = get_args_of_type(in_tree, ["timer"], dep_graph)
+    msg_args = get_args_of_type(in_tree, ["message"], dep_graph)
+    service_args.extend(mode_args)
+    service_args.extend(timer_args)
+    service_args.extend(msg_args)
+    for arg in service_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_condition = condition_support_service(arg_label)
+        if not_logic:
+            arg_condition = "!(" + arg_condition + ")"
+        result_condition = connect_condition(or_nodes, not_nodes, arg, result_condition, arg_condition, True,
+                                             dep_graph)
+    return result_condition
+
+
+def handle_condition_configure(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                               tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    service_args = get_args_of_type(in_tree, ["service"], dep_graph)
+    misc_args = get_args_of_type(in_tree, ["misc"], dep_graph)
+    mode_args = get_args_of_type(in_tree, ["mode"], dep_graph)
+    timer_args = get_args_of_type(in_tree, ["timer"], dep_graph)
+    service_args.extend(misc_args)
+    service_args.extend(mode_args)
+    service_args.extend(timer_args)
+    for arg in service_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_condition = condition_configure_service(arg_label)
+        if not_logic:
+            arg_condition = "!(" + arg_condition + ")"
+        result_condition = connect_condition(or_nodes, not_nodes, arg, result_condition, arg_condition, True,
+                                             dep_graph)
+    return result_condition
+
+
+def handle_condition_activate(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                              tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    service_args = get_args_of_type(in_tree, ["service"], dep_graph)
+    if len(service_args) > 0:
+        for arg in service_args:
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+            arg_condition = condition_activated_service(arg_label)
+            if not_logic:
+                arg_condition = "!(" + arg_condition + ")"
+            result_condition = connect_condition(or_nodes, not_nodes, arg, result_condition, arg_condition,
+                                                 True, dep_graph)
+    return result_condition
+
+
+def handle_condition_find(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                          tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    valid_args = get_args_of_label(in_tree, ["valid"], dep_graph)
+    invalid_args = get_args_of_label(in_tree, ["invalid", "out_of_range"], dep_graph)
+    var_args = get_args_of_type(in_tree, ["var"], dep_graph)
+    for arg in var_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        if len(valid_args) > 0:
+            arg_condition = condition_valid_var(arg_label)
+            if not_logic:
+                arg_condition = "!(" + arg_condition + ")"
+            result_condition = connect_condition(or_nodes, not_nodes, arg, result_condition, arg_condition,
+                                                 True,
+                                                 dep_graph)
+        elif len(invalid_args) > 0:
+            arg_condition = condition_invalid_var(arg_label)
+            if not_logic:
+                arg_condition = "!(" + arg_condition + ")"
+            result_condition = connect_condition(or_nodes, not_nodes, arg, result_condition, arg_condition,
+                                                 True, dep_graph)
+    return result_condition
+
+
+def handle_condition_use(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                         tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    service_args = get_args_of_type(in_tree, ["service"], dep_graph)
+    for arg in service_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_condition = condition_activated_service(arg_label)
+        if not_logic:
+            arg_condition = "!(" + arg_condition + ")"
+        result_condition = connect_condition(or_nodes, not_nodes, arg, result_condition, arg_condition,
+                                             True, dep_graph)
+
+    var_args = get_args_of_type(in_tree, ["var"], dep_graph)
+    for arg in var_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_condition = condition_valid_var(arg_label)
+        if not_logic:
+            arg_condition = "!(" + arg_condition + ")"
+        result_condition = connect_condition(or_nodes, not_nodes, arg, result_condition, arg_condition, True,
+                                             dep_graph)
+
+    field_args = get_args_of_type(in_tree, ["msg_field"], dep_graph)
+    msg_args = get_args_of_type(in_tree, ["message"], dep_graph)
+    msg_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in msg_args]
+    if len(msg_labels) == 0:
+        msg_labels = call_get_last_context("message", cond_ctx, act_ctx, global_context_dict, "021",
+                                           message_dir)
+
+    for msg_label in msg_labels:
+        for arg in field_args:
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+            arg_condition = condition_receive_var_in_msg(arg_label, msg_label)
+            msg_condition = condition_receive_message(msg_label, agents)
+            arg_condition = arg_condition + " & " + msg_condition
+            if not_logic:
+                arg_condition = "!(" + arg_condition + ")"
+            result_condition = connect_condition(or_nodes, not_nodes, arg, result_condition, arg_condition,
+                                                 True, dep_graph)
+    return result_condition
+
+
+def handle_condition_request(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                             tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    service_args = get_args_of_type(in_tree, ["service"], dep_graph)
+    if len(service_args) > 0:
+        for arg in service_args:
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+            arg_condition = condition_requested_service(arg_label)
+            if not_logic:
+                arg_condition = "!(" + arg_condition + ")"
+            result_condition = connect_condition(or_nodes, not_nodes, arg, result_condition, arg_condition,
+                                                 True, dep_graph)
+    return result_condition
+
+
+def handle_condition_enable(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                            tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    service_args = get_args_of_type(in_tree, ["service"], dep_graph)
+    if len(service_args) > 0:
+        for arg in service_args:
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+            arg_condition = condition_activated_service(arg_label)
+            if not_logic:
+                arg_condition = "!(" + arg_condition + ")"
+            result_condition = connect_condition(or_nodes, not_nodes, arg, result_condition, arg_condition,
+                                                 True, dep_graph)
+    return result_condition
+
+
+def handle_condition_establish(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                               tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    service_args = get_args_of_type(in_tree, ["service"], dep_graph)
+
+    if tok_pos == "VBG":
+        for arg in service_args:
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+            proc_name = arg_label + "_establishment"
+            arg_condition = condition_running_procedure(proc_name)
+            if not_logic:
+                arg_condition = "!(" + arg_condition + ")"
+            result_condition = connect_condition(or_nodes, not_nodes, arg, result_condition, arg_condition,
+                                                 True, dep_graph)
+
+    else:
+        for arg in service_args:
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+            arg_condition = condition_activated_service(arg_label)
+            if not_logic:
+                arg_condition = "!(" + arg_condition + ")"
+            result_condition = connect_condition(or_nodes, not_nodes, arg, result_condition, arg_condition,
+                                                 True, dep_graph)
+    return result_condition
+
+
+def handle_condition_deactivate(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                                tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    service_args = get_args_of_type(in_tree, ["service"], dep_graph)
+    if len(service_args) > 0:
+        for arg in service_args:
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+            arg_condition = condition_deactivated_service(arg_label)
+            if not_logic:
+                arg_condition = "!(" + arg_condition + ")"
+            result_condition = connect_condition(or_nodes, not_nodes, arg, result_condition, arg_condition,
+                                                 True, dep_graph)
+    return result_condition
+
+
+def handle_condition_release(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                             tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    service_args = get_args_of_type(in_tree, ["service"], dep_graph)
+    if len(service_args) > 0:
+        for arg in service_args:
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+            arg_condition = condition_deactivated_service(arg_label)
+            if not_logic:
+                arg_condition = "!(" + arg_condition + ")"
+            result_condition = connect_condition(or_nodes, not_nodes, arg, result_condition, arg_condition,
+                                                 True, dep_graph)
+    return result_condition
+
+
+def handle_condition_disable(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                             tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    service_args = get_args_of_type(in_tree, ["service"], dep_graph)
+    if len(service_args) > 0:
+        for arg in service_args:
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+            arg_condition = condition_deactivated_service(arg_label)
+            if not_logic:
+                arg_condition = "!(" + arg_condition + ")"
+            result_condition = connect_condition(or_nodes, not_nodes, arg, result_condition, arg_condition,
+                                                 True, dep_graph)
+    return result_condition
+
+
+def handle_condition_camp(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                          tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    cell_args = get_args_of_label_substring(in_tree, "cell", dep_graph)
+    for arg in cell_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_condition = condition_camp_cell(arg_label)
+        if not_logic:
+            arg_condition = "!(" + arg_condition + ")"
+        result_condition = connect_condition(or_nodes, not_nodes, arg, result_condition, arg_condition,
+                                             True, dep_graph)
+    return result_condition
+
+
+def handle_condition_exist(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                           tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    service_args = get_args_of_type(in_tree, ["service"], dep_graph)
+    if len(service_args) > 0:
+        for arg in service_args:
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+            arg_condition = condition_activated_service(arg_label)
+            if not_logic:
+                arg_condition = "!(" + arg_condition + ")"
+            result_condition = connect_condition(or_nodes, not_nodes, arg, result_condition, arg_condition,
+                                                 True, dep_graph)
+
+    var_args = get_args_of_type(in_tree, ["var"], dep_graph)
+    for arg in var_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_condition = condition_valid_var(arg_label)
+        if not_logic:
+            arg_condition = "!(" + arg_condition + ")"
+        result_condition = connect_condition(or_nodes, not_nodes, arg, result_condition, arg_condition, True,
+                                             dep_graph)
+    return result_condition
+
+
+def handle_condition_provide(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                             tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    var_args = get_args_of_type(in_tree, ["var"], dep_graph)
+    field_args = get_args_of_type(in_tree, ["msg_field"], dep_graph)
+    msg_args = get_args_of_type(in_tree, ["message"], dep_graph)
+    field_args.extend(var_args)
+
+    set_args = get_args_of_label(in_tree, ["set"], dep_graph)
+    if len(set_args) > 0:
+        for set_arg in set_args:
+            field_args = get_args_of_type(set_arg, ["msg_field"], dep_graph)
+            field_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in field_args]
+
+            to_args = get_args_of_label(set_arg, ["_TO_"], dep_graph)
+            if len(to_args) > 0:
+                val_args = get_args_of_type(to_args[0], ["field_val"], dep_graph)
+            else:
+                val_args = get_args_of_type(set_arg[0], ["field_val"], dep_graph)
+
+            msg_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in msg_args]
+            if len(msg_labels) == 0:
+                msg_labels = call_get_last_context("message", cond_ctx, act_ctx, global_context_dict, "021",
+                                                   message_dir)
+
+            if len(msg_labels) > 0:
+                for field in field_labels:
+                    for val in val_args:
+                        for msg in msg_labels:
+                            val_num, val_types, val_pos, val_label = get_info_from_tree(val, dep_graph)
+                            val_condition = condition_field_in_msg_val(field, msg, val_label)
+                            receive_condition = condition_receive_message(msg, agents)
+                            val_condition = val_condition + " & " + receive_condition
+                            if not_logic:
+                                val_condition = "!(" + val_condition + ")"
+                            result_condition = connect_condition(or_nodes, not_nodes, val, result_condition,
+                                                                 val_condition, True, dep_graph)
+
+    if len(field_args) > 0:
+        field_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in field_args]
+
+        msg_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in msg_args]
+        if len(msg_labels) == 0:
+            msg_labels = call_get_last_context("message", cond_ctx, act_ctx, global_context_dict, "021",
+                                               message_dir)
+
+        for field in field_labels:
+            for msg in msg_labels:
+                var_condition = condition_receive_var_in_msg(field, msg)
+                msg_condition = condition_receive_message(msg, agents)
+                var_condition = var_condition + " & " + msg_condition
+                if not_logic:
+                    var_condition = "!(" + var_condition + ")"
+                result_condition = connect_condition(or_nodes, not_nodes, field, result_condition,
+                                                     var_condition, False, dep_graph)
+
+    mode_args = get_args_of_type(in_tree, ["mode"], dep_graph)
+    service_args = get_args_of_type(in_tree, ["service"], dep_graph)
+    service_args.extend(mode_args)
+    for arg in service_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_condition = condition_activated_service(arg_label)
+        if not_logic:
+            arg_condition = "!(" + arg_condition + ")"
+        result_condition = connect_condition(or_nodes, not_nodes, arg, result_condition, arg_condition, True,
+                                             dep_graph)
+    return result_condition
+
+
+def handle_condition_leave(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                           tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    state_args = get_args_of_type(in_tree, ["state"], dep_graph)
+    for arg in state_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_condition = condition_leave_state(arg_label, agents)
+        if not_logic:
+            arg_condition = "!(" + arg_condition + ")"
+        result_condition = connect_condition(or_nodes, not_nodes, arg, result_condition, arg_condition, True,
+                                             dep_graph)
+    return result_condition
+
+
+def handle_condition_maintain(in_tree, dep_graph: DepGraph, cond_ctx, act_ctx, global_context_dict, agents, not_logic,
+                              tok_pos, message_dir, or_nodes, not_nodes) -> str:
+    result_condition = ""
+
+    counter_args = get_args_of_type(in_tree, ["counter"], dep_graph)
+    for arg in counter_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_condition = condition_maintain_counter(arg_label)
+        if not_logic:
+            arg_condition = "!(" + arg_condition + ")"
+        result_condition = connect_condition(or_nodes, not_nodes, arg, result_condition, arg_condition, True,
+                                             dep_graph)
+    return result_condition
+
+
+def handle_action_start(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                        probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    timer_args = get_args_of_type(in_tree, ["timer"], dep_graph)
+    for arg in timer_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_actions = action_start_timer(arg_label, agents)
+        actions.extend(arg_actions)
+
+    procedure_args = get_args_of_type(in_tree, ["procedure"], dep_graph)
+    for arg in procedure_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_actions = action_initiate_proc(arg_label, agents)
+        actions.extend(arg_actions)
+        extra_conditions = extra_conditions + " & " + condition_require_procedure(arg_label)
+    return actions, extra_conditions
+
+
+def handle_action_initiate(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                           probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    procedure_args = get_args_of_type(in_tree, ["procedure"], dep_graph)
+    procedure_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in procedure_args]
+    last_proc_args = get_args_of_label(in_tree, ["last_procedure"], dep_graph)
+    if len(procedure_labels) == 0 and len(last_proc_args) > 0:
+        procedure_labels = call_get_last_context("procedure", cond_ctx, act_ctx, global_context_dict, "120")
+
+    send_args = get_args_of_label(in_tree, ["send"], dep_graph)
+    msg_args = get_args_of_type(in_tree, ["message"], dep_graph)
+    msg_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in msg_args]
+
+    if len(send_args) > 0 and len(msg_labels) > 0 and len(procedure_labels) > 0:
+        for arg_label in msg_labels:
+            arg_actions = action_send_message(arg_label, agents)
+            actions.extend(arg_actions)
+        extra_conditions = extra_conditions + " & " + condition_initiate_procedure(procedure_labels[0])
+    else:
+        for arg_label in procedure_labels:
+            if "common_procedure" in arg_label:
+                for new_arg_label in ["sm_control", "identification_proc", "authentication"]:
+                    arg_actions = action_initiate_proc(new_arg_label, agents)
+                    actions.extend(arg_actions)
+                    extra_conditions = extra_conditions + " & " + condition_require_procedure(new_arg_label)
+                continue
+            arg_actions = action_initiate_proc(arg_label, agents)
+            actions.extend(arg_actions)
+            extra_conditions = extra_conditions + " & " + condition_require_procedure(arg_label)
+    return actions, extra_conditions
+
+
+def handle_action_perform(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                          probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    procedure_args = get_args_of_type(in_tree, ["procedure"], dep_graph)
+    for arg in procedure_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_actions = action_initiate_proc(arg_label, agents)
+        actions.extend(arg_actions)
+        extra_conditions = extra_conditions + " & " + condition_require_procedure(arg_label)
+
+    integrity_check_args = get_args_of_label(in_tree, ["integrity_check"], dep_graph)
+    if len(integrity_check_args) > 0:
+        msg_args = get_args_of_type(in_tree, ["message"], dep_graph)
+        msg_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in msg_args]
+        if len(msg_labels) == 0:
+            msg_labels = call_get_last_context("message", cond_ctx, act_ctx, global_context_dict, "120",
+                                               message_dir)
+        for arg_label in msg_labels:
+            arg_actions = action_check_integrity_protect_message(arg_label, agents)
+            actions.extend(arg_actions)
+        extra_conditions = extra_conditions + " & " + condition_activated_service("integrity_protection")
+    return actions, extra_conditions
+
+
+def handle_action_complete(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                           probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    procedure_args = get_args_of_type(in_tree, ["procedure"], dep_graph)
+    procedure_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in procedure_args]
+    if len(procedure_labels) == 0:
+        procedure_labels = call_get_last_context("procedure", cond_ctx, act_ctx, global_context_dict, "120")
+
+    send_args = get_args_of_label(in_tree, ["send"], dep_graph)
+    msg_args = get_args_of_type(in_tree, ["message"], dep_graph)
+    msg_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in msg_args]
+
+    if len(send_args) > 0 and len(msg_labels) > 0 and len(procedure_labels) > 0:
+        for arg_label in msg_labels:
+            arg_actions = action_send_message(arg_label, agents)
+            actions.extend(arg_actions)
+        extra_conditions = extra_conditions + " & " + condition_completed_procedure(procedure_labels[0])
+    else:
+        for arg_label in procedure_labels:
+            arg_actions = action_complete_procedure(arg_label, agents)
+            actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+def handle_action_fail(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                       probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    procedure_args = get_args_of_type(in_tree, ["procedure"], dep_graph)
+    for arg in procedure_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_actions = action_fail_procedure(arg_label, agents)
+        actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+def handle_action_suspend(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                          probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    procedure_args = get_args_of_type(in_tree, ["procedure"], dep_graph)
+    for arg in procedure_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_actions = action_suspend_procedure(arg_label, agents)
+        actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+def handle_action_stop(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                       probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    timer_args = get_args_of_type(in_tree, ["timer"], dep_graph)
+    timer_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in timer_args]
+    last_timer_args = get_args_of_label(in_tree, ["last_timer"], dep_graph)
+    procedure_args = get_args_of_type(in_tree, ["procedure"], dep_graph)
+
+    if len(timer_labels) == 0 and len(procedure_args) == 0 and len(last_timer_args) > 0:
+        timer_labels = call_get_last_context("timer", cond_ctx, act_ctx, global_context_dict, "120")
+
+    for arg_label in timer_labels:
+        arg_actions = action_stop_timer(arg_label, agents)
+        actions.extend(arg_actions)
+
+    procedure_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in procedure_args]
+    if len(timer_args) == 0 and len(procedure_labels) == 0:
+        procedure_labels = call_get_last_context("procedure", cond_ctx, act_ctx, global_context_dict, "120")
+
+    send_args = get_args_of_label(in_tree, ["send"], dep_graph)
+    msg_args = get_args_of_type(in_tree, ["message"], dep_graph)
+    msg_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in msg_args]
+
+    if len(send_args) > 0 and len(msg_labels) > 0 and len(procedure_labels) > 0:
+        for arg_label in msg_labels:
+            arg_actions = action_send_message(arg_label, agents)
+            actions.extend(arg_actions)
+        extra_conditions = extra_conditions + " & " + condition_stopped_procedure(procedure_labels[0])
+    else:
+        for arg_label in procedure_labels:
+            arg_actions = action_stop_procedure(arg_label, agents)
+            actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+def handle_action_exist(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                        probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    service_args = get_args_of_type(in_tree, ["service"], dep_graph)
+    if len(service_args) > 0:
+        for arg in service_args:
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+            arg_actions = action_activate_service(arg_label, agents)
+            actions.extend(arg_actions)
+
+    var_args = get_args_of_type(in_tree, ["var"], dep_graph)
+    for arg in var_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_actions = action_save_var(arg_label, agents)
+        actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+def handle_action_activate(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                           probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    service_args = get_args_of_type(in_tree, ["service"], dep_graph)
+    for arg in service_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_actions = action_activate_service(arg_label, agents)
+        actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+def handle_action_apply(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                        probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    service_args = get_args_of_type(in_tree, ["service"], dep_graph)
+    for arg in service_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        if not_logic and not probable:
+            arg_actions = action_deactivate_service(arg_label, agents)
+        else:
+            arg_actions = action_activate_service(arg_label, agents)
+        actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+def handle_action_support(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                          probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    service_args = get_args_of_type(in_tree, ["service"], dep_graph)
+    mode_args = get_args_of_type(in_tree, ["mode"], dep_graph)
+    timer_args = get_args_of_type(in_tree, ["timer"], dep_graph)
+    msg_args = get_args_of_type(in_tree, ["message"], dep_graph)
+    service_args.extend(mode_args)
+    service_args.extend(timer_args)
+    service_args.extend(msg_args)
+    for arg in service_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_actions = action_support_service(arg_label, agents)
+        actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+def handle_action_configure(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                            probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    service_args = get_args_of_type(in_tree, ["service"], dep_graph)
+    misc_args = get_args_of_type(in_tree, ["misc"], dep_graph)
+    mode_args = get_args_of_type(in_tree, ["mode"], dep_graph)
+    timer_args = get_args_of_type(in_tree, ["timer"], dep_graph)
+    service_args.extend(misc_args)
+    service_args.extend(mode_args)
+    service_args.extend(timer_args)
+    for arg in service_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_actions = action_configure_service(arg_label, agents)
+        actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+def handle_action_use(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic, probable,
+                      message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    service_args = get_args_of_type(in_tree, ["service"], dep_graph)
+    for arg in service_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_actions = action_activate_service(arg_label, agents)
+        actions.extend(arg_actions)
+
+    var_args = get_args_of_type(in_tree, ["var"], dep_graph)
+    for arg in var_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_actions = action_save_var(arg_label, agents)
+        actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+def handle_action_take(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                       probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    use_args = get_args_of_label(in_tree, ["use"], dep_graph)
+    if len(use_args) > 0:
+        var_args = get_args_of_type(in_tree, ["var"], dep_graph)
+        for arg in var_args:
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+            arg_actions = action_save_var(arg_label, agents)
+            actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+def handle_action_request(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                          probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    release_args = get_args_of_label(in_tree, ["release"], dep_graph)
+    service_args = get_args_of_type(in_tree, ["service"], dep_graph)
+    for arg in service_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        if len(release_args) == 0:
+            arg_actions = action_request_service(arg_label, agents)
+            actions.extend(arg_actions)
+        else:
+            arg_actions = action_deactivate_service(arg_label, agents)
+            actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+def handle_action_enable(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                         probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    service_args = get_args_of_type(in_tree, ["service"], dep_graph)
+    for arg in service_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_actions = action_activate_service(arg_label, agents)
+        actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+def handle_action_continue(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                           probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    service_args = get_args_of_type(in_tree, ["service"], dep_graph)
+    for arg in service_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        if check_not(not_nodes, arg):
+            arg_actions = action_deactivate_service(arg_label, agents)
+        else:
+            arg_actions = action_activate_service(arg_label, agents)
+        actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+def handle_action_establish(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                            probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    service_args = get_args_of_type(in_tree, ["service"], dep_graph, ["_FOR_"])
+    for arg in service_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_actions = action_activate_service(arg_label, agents)
+        actions.extend(arg_actions)
+
+    misc_args = get_args_of_type(in_tree, ["misc"], dep_graph, ["_FOR_"])
+    for arg in misc_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_actions = action_activate_service(arg_label, agents)
+        actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+def handle_action_deactivate(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                             probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    service_args = get_args_of_type(in_tree, ["service"], dep_graph)
+    for arg in service_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_actions = action_deactivate_service(arg_label, agents)
+        actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+def handle_action_release(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                          probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    service_args = get_args_of_type(in_tree, ["service"], dep_graph)
+    for arg in service_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_actions = action_deactivate_service(arg_label, agents)
+        actions.extend(arg_actions)
+
+    var_args = get_args_of_type(in_tree, ["var"], dep_graph)
+    for arg in var_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_actions = action_invalid_var(arg_label, agents)
+        actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+def handle_action_disable(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                          probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    service_args = get_args_of_type(in_tree, ["service"], dep_graph)
+    for arg in service_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_actions = action_deactivate_service(arg_label, agents)
+        actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+def handle_action_camp(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                       probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    cell_args = get_args_of_label_substring(in_tree, "cell", dep_graph)
+    for arg in cell_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_actions = action_camp_cell(arg_label, agents)
+        actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+def handle_action_exchange(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                           probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    var_args = get_args_of_type(in_tree, ["var"], dep_graph)
+    for arg in var_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_actions = action_send_var(arg_label, agents)
+        actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+def handle_action_send(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                       probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    integrity_nodes = get_args_of_label(in_tree, ["integrity_protected"], dep_graph)
+    ciphered_nodes = get_args_of_label(in_tree, ["ciphered"], dep_graph)
+    unciphered_nodes = get_args_of_label(in_tree, ["unciphered"], dep_graph)
+
+    msg_args = get_args_of_type(in_tree, ["message"], dep_graph)
+    msg_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in msg_args]
+
+    if len(msg_labels) == 0:
+        msg_labels = call_get_last_context("message", cond_ctx, act_ctx, global_context_dict, "120",
+                                           message_dir)
+
+    field_args = get_args_of_type(in_tree, ["msg_field"], dep_graph)
+    var_args = get_args_of_type(in_tree, ["var"], dep_graph)
+    field_args.extend(var_args)
+    field_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in field_args]
+    cause_args = get_args_of_type(in_tree, ["cause"], dep_graph)
+
+    if "nas_message" in msg_labels:
+        if len(integrity_nodes) > 0:
+            arg_actions = action_activate_service("integrity_protection")
+            actions.extend(arg_actions)
+        if len(ciphered_nodes) > 0:
+            arg_actions = action_activate_service("nas_ciphering")
+            actions.extend(arg_actions)
+        if len(unciphered_nodes) > 0:
+            arg_actions = action_deactivate_service("nas_ciphering")
+            actions.extend(arg_actions)
+        msg_labels.remove("nas_message")
+
+    if len(cause_args) > 0:
+        for arg in cause_args:
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+            for msg_label in msg_labels:
+                arg_actions = action_message_cause(arg_label, msg_label, agents)
+                actions.extend(arg_actions)
+                arg_actions = action_send_message(msg_label, agents)
+                actions.extend(arg_actions)
+                if "emm_cause" in field_labels or len(get_args_of_label(in_tree, ["emm"], dep_graph)) > 0:
+                    arg_actions = action_send_field_in_msg("emm_cause", msg_label, agents)
+                    actions.extend(arg_actions)
+                elif "five_gmm_cause" in field_labels \
+                        or len(get_args_of_label(in_tree, ["five_gmm_cause"], dep_graph)) > 0:
+                    arg_actions = action_send_field_in_msg("five_gmm_cause", msg_label, agents)
+                    actions.extend(arg_actions)
+                elif "esm_cause" in field_labels or len(get_args_of_label(in_tree, ["esm"], dep_graph)) > 0:
+                    arg_actions = action_send_field_in_msg("esm_cause", msg_label, agents)
+                    actions.extend(arg_actions)
+
+    with_args = get_args_of_label(in_tree, ["_WITH_"], dep_graph)
+    with_message_labels = []
+    for with_arg in with_args:
+        with_message_labels.extend(get_info_from_tree(with_msg_arg, dep_graph)[3]
+                                   for with_msg_arg in get_args_of_type(with_arg, ["message"], dep_graph))
+    msg_labels = [item for item in msg_labels if item not in with_message_labels]
+
+    without_args = get_args_of_label(in_tree, ["_WITHOUT_"], dep_graph)
+    without_field_labels = []
+    for without_arg in without_args:
+        without_field_labels.extend(get_args_of_type(without_arg, ["msg_field"], dep_graph))
+    without_field_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in without_field_labels]
+
+
+
+    for arg_label in msg_labels:
+        for field_label in field_labels:
+            if field_label in without_field_labels:
+                arg_actions = action_not_send_field_in_msg(field_label, arg_label, agents)
+                actions.extend(arg_actions)
+            else:
+                arg_actions = action_send_field_in_msg(field_label, arg_label, agents)
+                actions.extend(arg_actions)
+
+        if len(integrity_nodes) > 0:
+            arg_actions = action_integrity_protect_message(arg_label, agents)
+            actions.extend(arg_actions)
+            extra_conditions = extra_conditions + " & " + condition_activated_service(
+                "integrity_protection")
+        if len(ciphered_nodes) > 0:
+            arg_actions = action_cipher_message(arg_label, agents)
+            actions.extend(arg_actions)
+            extra_conditions = extra_conditions + " & " + condition_activated_service(
+                "nas_ciphering")
+        if len(unciphered_nodes) > 0:
+            arg_actions = action_not_cipher_message(arg_label, agents)
+            actions.extend(arg_actions)
+
+        msg_sublayer = get_msg_sublayer(arg_label)
+        if msg_sublayer == "emm_sublayer":
+            arg_actions = action_send_message(arg_label, agents)
+            actions.extend(arg_actions)
+            for with_arg_label in with_message_labels:
+                if get_msg_sublayer(with_arg_label) == "esm_sublayer":
+                    arg_actions = action_send_esm_msg_in_msg(with_arg_label, arg_label, agents)
+                    actions.extend(arg_actions)
+
+        elif msg_sublayer == "esm_sublayer":
+            emm_msg_labels = [item for item in msg_labels if get_msg_sublayer(item) == "emm_sublayer"]
+            if len(emm_msg_labels) == 0:
+                emm_msg_labels = cond_ctx["message"]
+                emm_msg_labels = [item for item in emm_msg_labels
+                                  if get_msg_sublayer(item) == "emm_sublayer"]
+
+            if len(emm_msg_labels) > 0:
+                arg_actions = action_send_esm_msg_in_msg(arg_label, emm_msg_labels[-1], agents)
+                actions.extend(arg_actions)
+            else:
+                arg_actions = action_send_message(arg_label, agents)
+                actions.extend(arg_actions)
+
+        else:
+            arg_actions = action_send_message(arg_label, agents)
+            actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+def handle_action_cipher(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                         probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    msg_args = get_args_of_type(in_tree, ["message"], dep_graph)
+    msg_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in msg_args]
+    if len(msg_labels) == 0:
+        msg_labels = call_get_last_context("message", cond_ctx, act_ctx, global_context_dict, "120",
+                                           message_dir)
+
+    for arg_label in msg_labels:
+        if arg_label == "nas_message":
+            if not_logic and not probable:
+                arg_actions = action_deactivate_service("nas_ciphering")
+            else:
+                arg_actions = action_activate_service("nas_ciphering")
+        else:
+            if not_logic and not probable:
+                arg_actions = action_not_cipher_message(arg_label, agents)
+            else:
+                arg_actions = action_cipher_message(arg_label, agents)
+                extra_conditions = extra_conditions + " & " + condition_activated_service("nas_ciphering")
+        actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+def handle_action_ignore(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                         probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    msg_args = get_args_of_type(in_tree, ["message"], dep_graph)
+    last_msg_args = get_args_of_label(in_tree, ["last_message"], dep_graph)
+    unciphered_args = get_args_of_label(in_tree, ["unciphered"], dep_graph)
+    msg_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in msg_args]
+    if len(msg_labels) == 0 and len(last_msg_args) > 0:
+        msg_labels = call_get_last_context("message", cond_ctx, act_ctx, global_context_dict, "120",
+                                           message_dir)
+
+    for arg_label in msg_labels:
+        if not_logic and not probable:
+            arg_actions = action_not_drop_message(arg_label, agents)
+        else:
+            arg_actions = action_drop_message(arg_label, agents)
+        actions.extend(arg_actions)
+        extra_conditions = extra_conditions + " & " + condition_receive_message(arg_label)
+        if len(unciphered_args) > 0:
+            extra_conditions = extra_conditions + " & " + condition_unciphered_message(arg_label)
+    return actions, extra_conditions
+
+
+def handle_action_protect(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                          probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    integrity_args = get_args_of_label(in_tree, ["integrity"], dep_graph)
+    if len(integrity_args) > 0:
+        msg_args = get_args_of_type(in_tree, ["message"], dep_graph)
+        msg_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in msg_args]
+        if len(msg_labels) == 0:
+            msg_labels = call_get_last_context("message", cond_ctx, act_ctx, global_context_dict, "120",
+                                               message_dir)
+
+        for arg_label in msg_labels:
+            if arg_label == "nas_message":
+                if not_logic and not probable:
+                    arg_actions = action_deactivate_service("integrity_protection")
+                else:
+                    arg_actions = action_activate_service("integrity_protection")
+            else:
+                if not_logic and not probable:
+                    arg_actions = action_not_integrity_protect_message(arg_label, agents)
+                else:
+                    arg_actions = action_integrity_protect_message(arg_label, agents)
+                    extra_conditions = extra_conditions + " & " + condition_activated_service(
+                        "integrity_protection")
+            actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+def handle_action_accept(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                         probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    msg_args = get_args_of_type(in_tree, ["message"], dep_graph)
+    last_msg_args = get_args_of_label(in_tree, ["last_message"], dep_graph)
+    msg_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in msg_args]
+    if len(msg_labels) == 0 and len(last_msg_args) > 0:
+        msg_labels = call_get_last_context("message", cond_ctx, act_ctx, global_context_dict, "021",
+                                           message_dir)
+
+    for arg_label in msg_labels:
+        if not_logic and not probable:
+            arg_actions = action_reject_message(arg_label, agents)
+        else:
+            arg_actions = action_accept_message(arg_label, agents)
+        actions.extend(arg_actions)
+
+    procedure_args = get_args_of_type(in_tree, ["procedure"], dep_graph)
+    for arg in procedure_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        if not_logic and not probable:
+            arg_actions = action_stop_procedure(arg_label, agents)
+        else:
+            arg_actions = action_complete_procedure(arg_label, agents)
+        actions.extend(arg_actions)
+
+    agent_args = get_args_of_type(in_tree, ["agent"], dep_graph)
+    for arg in agent_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        if not_logic and not probable:
+            arg_actions = action_invalid_var(arg_label, agents)
+        else:
+            arg_actions = action_valid_var(arg_label, agents)
+        actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+def handle_action_process(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                          probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    msg_args = get_args_of_type(in_tree, ["message"], dep_graph)
+    if not_logic and not probable:
+        for arg in msg_args:
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+            arg_actions = action_reject_message(arg_label, agents)
+            actions.extend(arg_actions)
+            extra_conditions = extra_conditions + " & !" + condition_receive_message(arg_label, agents)
+
+    else:
+        for arg in msg_args:
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+            arg_actions = action_accept_message(arg_label, agents)
+            actions.extend(arg_actions)
+            extra_conditions = extra_conditions + " & " + condition_receive_message(arg_label, agents)
+    return actions, extra_conditions
+
+
+def handle_action_reject(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                         probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    msg_args = get_args_of_type(in_tree, ["message"], dep_graph)
+    for arg in msg_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_actions = action_reject_message(arg_label, agents)
+        actions.extend(arg_actions)
+
+    procedure_args = get_args_of_type(in_tree, ["procedure"], dep_graph)
+    for arg in procedure_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        if not_logic and not probable:
+            arg_actions = []
+        else:
+            arg_actions = action_reject_procedure(arg_label, agents)
+        actions.extend(arg_actions)
+
+    agent_args = get_args_of_type(in_tree, ["agent"], dep_graph)
+    for arg in agent_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        if not_logic and not probable:
+            arg_actions = []
+        else:
+            arg_actions = action_invalid_var(arg_label, agents)
+        actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+def handle_action_enter(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                        probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    state_args = get_args_of_type(in_tree, ["state"], dep_graph)
+    for arg in state_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_actions = action_enter_state(arg_label, agents)
+        actions.extend(arg_actions)
+
+    mode_args = get_args_of_type(in_tree, ["mode"], dep_graph)
+    for arg in mode_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        if arg_label == "ue" or arg_label == "mme":
+            continue
+        arg_actions = action_activate_mode(arg_label, agents)
+        actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+def handle_action_include(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                          probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    var_args = get_args_of_type(in_tree, ["var"], dep_graph)
+    field_args = get_args_of_type(in_tree, ["msg_field"], dep_graph)
+    msg_args = get_args_of_type(in_tree, ["message"], dep_graph)
+    val_args = get_args_of_type(in_tree, ["field_val"], dep_graph)
+    cause_args = get_args_of_type(in_tree, ["cause"], dep_graph)
+    field_args.extend(var_args)
+
+    last_msg_field_args = get_args_of_label(in_tree, ["last_msg_field"], dep_graph)
+    if len(last_msg_field_args) > 0:
+        field_args.append(global_context_dict["last_msg_field"])
+
+    field_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in field_args]
+    field_labels = set(field_labels)
+
+    msg_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in msg_args]
+    if len(msg_labels) == 0:
+        msg_labels = call_get_last_context("message", cond_ctx, act_ctx, global_context_dict, "120",
+                                           message_dir)
+
+    for field in field_labels:
+        for msg in msg_labels:
+            arg_actions = action_send_field_in_msg(field, msg, agents)
+            actions.extend(arg_actions)
+            if field == "emm_cause" or field == "esm_cause":
+                for cause_arg in cause_args:
+                    arg_actions = action_send_field_in_msg_val(
+                        field, msg, get_info_from_tree(cause_arg, dep_graph)[3], agents)
+                    actions.extend(arg_actions)
+            elif len(val_args) > 0:
+                for val_arg in val_args:
+                    arg_actions = action_send_field_in_msg_val(
+                        field, msg, get_info_from_tree(val_arg, dep_graph)[3], agents)
+                    actions.extend(arg_actions)
+
+    for arg in msg_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        msg_sublayer = get_msg_sublayer(arg_label)
+        if msg_sublayer == "esm_sublayer":
+            emm_msg_labels = [get_info_from_tree(item, dep_graph)[3] for item in msg_args]
+            emm_msg_labels = [item for item in emm_msg_labels if get_msg_sublayer(item) == "emm_sublayer"]
+            if len(emm_msg_labels) == 0:
+                emm_msg_labels = cond_ctx["message"]
+                emm_msg_labels = [item for item in emm_msg_labels if get_msg_sublayer(item) == "emm_sublayer"]
+            if len(emm_msg_labels) == 0:
+                emm_msg_labels = act_ctx["message"]
+                emm_msg_labels = [item for item in emm_msg_labels if get_msg_sublayer(item) == "emm_sublayer"]
+            if len(emm_msg_labels) == 0:
+                emm_msg_labels = [global_context_dict["last_message"]]
+                emm_msg_labels = [item for item in emm_msg_labels if get_msg_sublayer(item) == "emm_sublayer"]
+
+            if len(emm_msg_labels) > 0:
+                arg_actions = action_send_esm_msg_in_msg(arg_label, emm_msg_labels[-1], agents)
+                if check_not(not_nodes, arg):
+                    for idx, action in enumerate(arg_actions):
+                        if "TRUE" in action["label"]:
+                            arg_actions[idx]["label"] = action["label"].replace("TRUE", "FALSE")
+                actions.extend(arg_actions)
+
+            if not_logic and not probable:
+                for idx, action in enumerate(actions):
+                    if "TRUE" in action["label"]:
+                        actions[idx]["label"] = action["label"].replace("TRUE", "FALSE")
+
+    if not_logic and not probable:
+        for idx, action in enumerate(actions):
+            if "TRUE" in action["label"]:
+                actions[idx]["label"] = action["label"].replace("TRUE", "FALSE")
+    return actions, extra_conditions
+
+
+def handle_action_provide(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                          probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    var_args = get_args_of_type(in_tree, ["var"], dep_graph)
+    field_args = get_args_of_type(in_tree, ["msg_field"], dep_graph)
+    msg_args = get_args_of_type(in_tree, ["message"], dep_graph)
+    field_args.extend(var_args)
+    field_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in field_args]
+    field_labels = set(field_labels)
+
+    msg_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in msg_args]
+    if len(msg_labels) == 0:
+        msg_labels = call_get_last_context("message", cond_ctx, act_ctx, global_context_dict, "120",
+                                           message_dir)
+
+    for field in field_labels:
+        for msg in msg_labels:
+            arg_actions = action_send_field_in_msg(field, msg, agents)
+            actions.extend(arg_actions)
+
+    mode_args = get_args_of_type(in_tree, ["mode"], dep_graph)
+    service_args = get_args_of_type(in_tree, ["service"], dep_graph)
+    service_args.extend(mode_args)
+    for arg in service_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_actions = action_activate_service(arg_label, agents)
+        actions.extend(arg_actions)
+
+    if not_logic and not probable:
+        for idx, action in enumerate(actions):
+            if "TRUE" in action["label"]:
+                actions[idx]["label"] = action["label"].replace("TRUE", "FALSE")
+    return actions, extra_conditions
+
+
+def handle_action_authenticate(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                               probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    arg_actions = action_initiate_proc("authentication", agents)
+    actions.extend(arg_actions)
+    extra_conditions = extra_conditions + " & " + condition_require_procedure("authentication")
+    return actions, extra_conditions
+
+
+def handle_action_respond(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                          probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    to_args = get_args_of_label(in_tree, ["_TO_"], dep_graph)
+    with_args = get_args_of_label(in_tree, ["_WITH_"], dep_graph)
+    if len(with_args) > 0:
+        for with_arg in with_args:
+            msg_args = get_args_of_type(with_arg, ["message"], dep_graph)
+            for arg in msg_args:
+                arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+                arg_actions = action_send_message(arg_label, agents)
+                actions.extend(arg_actions)
+    elif len(to_args) > 0:
+        for to_arg in to_args:
+            msg_args = get_args_of_type(to_arg, ["message"], dep_graph)
+            for arg in msg_args:
+                arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+                arg_actions = action_respond_to_message(arg_label, agents)
+                actions.extend(arg_actions)
+                extra_conditions = extra_conditions + " & " + condition_receive_message(arg_label, agents)
+    else:
+        msg_args = get_args_of_type(in_tree, ["message"], dep_graph)
+        for arg in msg_args:
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+            arg_actions = action_respond_to_message(arg_label, agents)
+            actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+def handle_action_save(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                       probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    var_args = get_args_of_type(in_tree, ["var"], dep_graph)
+    for arg in var_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_actions = action_save_var(arg_label, agents)
+        actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+def handle_action_delete(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                         probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    var_args = get_args_of_type(in_tree, ["var"], dep_graph)
+    for arg in var_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_actions = action_delete_var(arg_label, agents)
+        actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+def handle_action_check(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                        probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    accept_args = get_args_of_label(in_tree, ["accept"], dep_graph)
+    msg_args = get_args_of_type(in_tree, ["message"], dep_graph)
+    if len(accept_args) > 0:
+        for arg in msg_args:
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+            arg_actions = action_check_accept_message(arg_label, agents)
+            actions.extend(arg_actions)
+
+    var_args = get_args_of_type(in_tree, ["var"], dep_graph)
+    for arg in var_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_actions = action_check_valid_var(arg_label, agents)
+        actions.extend(arg_actions)
+
+    return actions, extra_conditions
+
+
+def handle_action_require(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                          probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    return [], extra_conditions
+
+
+def handle_action_set(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic, probable,
+                      message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    send_args = get_args_of_label(in_tree, ["send"], dep_graph)
+
+    var_args = get_args_of_type(in_tree, ["var"], dep_graph)
+    var_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in var_args]
+
+    counter_args = get_args_of_type(in_tree, ["counter"], dep_graph)
+    counter_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in counter_args]
+    last_counter_args = get_args_of_label(in_tree, ["last_counter"], dep_graph)
+
+    if len(counter_labels) == 0 and len(last_counter_args) > 0:
+        counter_labels = call_get_last_context("counter", cond_ctx, act_ctx, global_context_dict, "102")
+
+    var_labels.extend(counter_labels)
+
+    to_args = get_args_of_label(in_tree, ["_TO_"], dep_graph)
+    val_args = []
+    for to_arg in to_args:
+        val_args.extend(
+            get_info_from_tree(item, dep_graph)[3] for item in get_args_of_type(to_arg, ["var"], dep_graph))
+        val_args.extend(
+            get_info_from_tree(item, dep_graph)[3] for item in get_args_of_type(to_arg, ["mode"], dep_graph))
+        val_args.extend(
+            get_info_from_tree(item, dep_graph)[3] for item in get_args_of_type(to_arg, ["num"], dep_graph))
+        val_args.extend(get_info_from_tree(
+            item, dep_graph)[3] for item in get_args_of_type(to_arg, ["field_val"], dep_graph))
+
+    for arg_label in var_labels:
+        for to_val in val_args:
+            val_num, val_types, val_pos, val_label = get_info_from_tree(to_val, dep_graph)
+            if val_label == arg_label:
+                continue
+            arg_actions = action_set_var_to_val(arg_label, val_label, agents)
+            actions.extend(arg_actions)
+
+    field_args = get_args_of_type(in_tree, ["msg_field"], dep_graph)
+    field_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in field_args]
+
+    if len(get_args_of_label(in_tree, ["last_msg_field"], dep_graph)) > 0:
+        field_labels.append(global_context_dict["last_msg_field"])
+
+    to_args = get_args_of_label(in_tree, ["_TO_"], dep_graph)
+    if len(to_args) > 0:
+        val_args = get_args_of_type(to_args[0], ["field_val"], dep_graph)
+    else:
+        val_args = get_args_of_type(in_tree, ["field_val"], dep_graph)
+
+    msg_args = get_args_of_type(in_tree, ["message"], dep_graph)
+    msg_labels = [get_info_from_tree(arg, dep_graph)[3] for arg in msg_args]
+    if len(msg_labels) == 0:
+        msg_labels = call_get_last_context("message", cond_ctx, act_ctx, global_context_dict, "120",
+                                           message_dir)
+    if len(msg_labels) != 0:
+        for field in field_labels:
+            for val in val_args:
+                val_num, val_types, val_pos, val_label = get_info_from_tree(val, dep_graph)
+                if field == val_label:
+                    continue
+                arg_actions = action_set_msg_field_to_val(field, msg_labels[0], val_label, agents)
+                actions.extend(arg_actions)
+                arg_actions = action_send_field_in_msg(field, msg_labels[0], agents)
+                actions.extend(arg_actions)
+                arg_actions = action_send_message(msg_labels[0], agents)
+                actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+def handle_action_reset(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                        probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    to_args = get_args_of_label(in_tree, ["_TO_"], dep_graph)
+    counter_args = get_args_of_type(in_tree, ["counter"], dep_graph)
+    var_args = get_args_of_type(in_tree, ["var"], dep_graph)
+    var_args.extend(counter_args)
+    if len(to_args) > 0:
+        for arg in var_args:
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+            arg_actions = action_set_var_to_val(arg_label, get_info_from_tree(to_args[0], dep_graph)[3], agents)
+            actions.extend(arg_actions)
+    else:
+        for arg in var_args:
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+            arg_actions = action_reset_var(arg_label, agents)
+            actions.extend(arg_actions)
+
+    timer_args = get_args_of_type(in_tree, ["timer"], dep_graph)
+    for arg in timer_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_actions = action_start_timer(arg_label, agents)
+        actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+def handle_action_update(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                         probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    counter_args = get_args_of_type(in_tree, ["counter"], dep_graph)
+    var_args = get_args_of_type(in_tree, ["var"], dep_graph)
+    var_args.extend(counter_args)
+    for arg in var_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_actions = action_update_var(arg_label, agents)
+        actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+def handle_action_increase(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                           probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    by_args = get_args_of_label(in_tree, ["_BY_"], dep_graph)
+    counter_args = get_args_of_type(in_tree, ["counter"], dep_graph)
+    var_args = get_args_of_type(in_tree, ["var"], dep_graph)
+    var_args.extend(counter_args)
+    if len(by_args) > 0:
+        for arg in var_args:
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+            arg_actions = action_increase_var_by_val(arg_label, get_info_from_tree(by_args[0], dep_graph)[3],
+                                                     agents)
+            actions.extend(arg_actions)
+    else:
+        for arg in var_args:
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+            arg_actions = action_increase_var_by_val(arg_label, "1", agents)
+            actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+def handle_action_decrease(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                           probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    by_args = get_args_of_label(in_tree, ["_BY_"], dep_graph)
+    counter_args = get_args_of_type(in_tree, ["counter"], dep_graph)
+    var_args = get_args_of_type(in_tree, ["var"], dep_graph)
+    var_args.extend(counter_args)
+    if len(by_args) > 0:
+        for arg in var_args:
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+            arg_actions = action_decrease_var_by_val(arg_label, get_info_from_tree(by_args[0], dep_graph)[3],
+                                                     agents)
+            actions.extend(arg_actions)
+    else:
+        for arg in var_args:
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+            arg_actions = action_decrease_var_by_val(arg_label, "1", agents)
+            actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+def handle_action_maintain(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                           probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    counter_args = get_args_of_type(in_tree, ["counter"], dep_graph)
+    for arg in counter_args:
+        arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(arg, dep_graph)
+        arg_actions = action_maintain_counter(arg_label, agents)
+        actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+def handle_action_consider(in_tree, dep_graph: DepGraph, agents, cond_ctx, act_ctx, global_context_dict, not_logic,
+                           probable, message_dir, not_nodes, extra_conditions) -> (list, str):
+    actions = []
+
+    new_args = get_args_of_label(in_tree, ["new"], dep_graph)
+    old_args = get_args_of_label(in_tree, ["old"], dep_graph)
+    if len(new_args) > 0:
+        for new_arg in new_args:
+            new_var_args = get_args_of_type(new_arg, ["var"], dep_graph)
+            for new_var in new_var_args:
+                arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(new_var, dep_graph)
+
+                adj_args = get_args_of_type(new_arg, ["adj"], dep_graph)
+                adj_labels = [get_info_from_tree(adj, dep_graph)[3] for adj in adj_args]
+                if "valid" in adj_labels:
+                    arg_actions = action_valid_var(arg_label, agents)
+                    actions.extend(arg_actions)
+                    arg_actions = action_update_var(arg_label, agents)
+                    actions.extend(arg_actions)
+    elif len(new_args) == 0 and len(old_args) > 0:
+        for old_arg in old_args:
+            old_var_args = get_args_of_type(old_arg, ["var"], dep_graph)
+            for old_var in old_var_args:
+                arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(old_var, dep_graph)
+
+                adj_args = get_args_of_type(old_arg, ["adj"], dep_graph)
+                adj_labels = [get_info_from_tree(adj, dep_graph)[3] for adj in adj_args]
+                if "valid" in adj_labels:
+                    arg_actions = action_valid_var(arg_label, agents)
+                    actions.extend(arg_actions)
+                    arg_actions = action_not_update_var(arg_label, agents)
+                    actions.extend(arg_actions)
+    else:
+        new_var_args = get_args_of_type(in_tree, ["var"], dep_graph)
+        for new_var in new_var_args:
+            arg_num, arg_types, arg_pos, arg_label = get_info_from_tree(new_var, dep_graph)
+
+            adj_args = get_args_of_type(in_tree, ["adj"], dep_graph)
+            adj_labels = [get_info_from_tree(adj, dep_graph)[3] for adj in adj_args]
+            if "valid" in adj_labels:
+                arg_actions = action_valid_var(arg_label, agents)
+                actions.extend(arg_actions)
+            elif "invalid" in adj_labels:
+                arg_actions = action_invalid_var(arg_label, agents)
+                actions.extend(arg_actions)
+    return actions, extra_conditions
+
+
+# a message sent to the ue comes from the mme, and the other way around
+def get_send_agents(in_tree, dep_graph: DepGraph, agents):
+    to_args = get_args_of_label(in_tree, ["_TO_"], dep_graph)
+    for to_arg in to_args:
+        ue_args = get_args_of_label(to_arg, ["ue"], dep_graph)
+        mme_args = get_args_of_label(to_arg, ["mme"], dep_graph)
+        if len(ue_args) > 0:
+            agents = {"mme"}
+        elif len(mme_args) > 0:
+            agents = {"ue"}
+    return agents